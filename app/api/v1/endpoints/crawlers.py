@@ -6,7 +6,9 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 
 from app.schemas.requests import CrawlerTaskRequest
+from app.api.v1.endpoints.sources import find_source
 from app.core.logging import get_logger
+from app.crawlers.registry import find_configured_source
 from app.celery_app import celery_app
 from app.tasks.crawler_tasks import start_crawler_task as celery_start_crawler_task
 
@@ -84,11 +86,23 @@ async def list_crawler_tasks(
 async def start_crawler_task(request: CrawlerTaskRequest):
     """启动爬虫任务"""
     try:
+        # API创建的新闻源只在本进程内，随任务传给worker；配置文件中的新闻源由worker按ID查找
+        source = find_source(request.source_id)
+        if source is None and find_configured_source(request.source_id) is None:
+            raise HTTPException(status_code=404, detail="新闻源不存在")
+        
+        task_kwargs = {
+            "force_crawl": request.force_crawl,
+            "max_pages": request.max_pages
+        }
+        if source is not None:
+            task_kwargs["source"] = source.model_dump(mode="json")
+        
         # 触发 Celery 任务（发送到 crawler 队列）
         # 使用 apply_async 以便显式选择队列
         celery_result = celery_start_crawler_task.apply_async(
             args=[request.source_id],
-            kwargs={},
+            kwargs=task_kwargs,
             queue="crawler"
         )
         real_task_id = celery_result.id
@@ -124,6 +138,8 @@ async def start_crawler_task(request: CrawlerTaskRequest):
             "timestamp": datetime.utcnow()
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Start crawler task failed", error=str(e))
         raise HTTPException(status_code=500, detail="启动爬虫任务失败")
@@ -13,6 +13,15 @@ router = APIRouter()
 logger = get_logger(__name__)
 
 
+def find_source(source_id: str) -> Optional[NewsSource]:
+    """按ID查找已创建的新闻源"""
+    # TODO: 改为从数据库获取
+    for source in getattr(router, '_created_sources', []):
+        if source.id == source_id:
+            return source
+    return None
+
+
 @router.get("/", response_model=List[NewsSource])
 async def list_news_sources(
     active_only: bool = Query(True, description="是否只显示激活的源"),
@@ -71,7 +80,10 @@ async def create_news_source(source: NewsSourceCreateRequest):
             url=source.url,
             type=source.type,
             parser=source.parser,
+            parser_backend=source.parser_backend,
             crawl_interval=source.crawl_interval,
+            rate_limit=source.rate_limit,
+            rate_burst=source.rate_burst,
             created_at=datetime.utcnow(),
             updated_at=datetime.utcnow()
         )
@@ -1,8 +1,14 @@
 """
 Celery应用配置
 """
+import sys
+
 from celery import Celery
+from celery.signals import worker_init, worker_process_shutdown
 from app.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
 
 # 创建Celery实例
 celery_app = Celery(
@@ -29,9 +35,10 @@ celery_app.conf.update(
     
     # 任务路由
     task_routes={
-        "app.tasks.crawler_tasks.*": {"queue": "crawler"},
-        "app.tasks.processor_tasks.*": {"queue": "processor"},
-        "app.tasks.index_tasks.*": {"queue": "index"},
+        "crawler.fetch_details_task": {"queue": "detail"},
+        "crawler.*": {"queue": "crawler"},
+        "processor.*": {"queue": "processor"},
+        "index.*": {"queue": "index"},
     },
     
     # 队列配置
@@ -39,6 +46,7 @@ celery_app.conf.update(
     task_queues={
         "default": {"exchange": "default", "routing_key": "default"},
         "crawler": {"exchange": "crawler", "routing_key": "crawler"},
+        "detail": {"exchange": "detail", "routing_key": "detail"},
         "processor": {"exchange": "processor", "routing_key": "processor"},
         "index": {"exchange": "index", "routing_key": "index"},
     },
@@ -60,10 +68,11 @@ celery_app.conf.update(
     worker_log_format="[%(asctime)s: %(levelname)s/%(processName)s] %(message)s",
     worker_task_log_format="[%(asctime)s: %(levelname)s/%(processName)s] [%(task_name)s(%(task_id)s)] %(message)s",
 
-    # Windows兼容性配置
+    # 池配置: scripts/start_celery_worker.py 按队列选择（见 app/core/worker_profiles.py），
+    # 这里只是直接运行 celery worker 时的默认值；Windows不支持fork，使用solo池
     worker_pool_restarts=True,
-    worker_pool='solo',  # Windows上使用solo池
-    worker_concurrency=1,
+    worker_pool='solo' if sys.platform == 'win32' else 'prefork',
+    worker_concurrency=1 if sys.platform == 'win32' else None,
     
     # 禁用fork (Windows不支持)
     worker_disable_rate_limits=True,
@@ -86,7 +95,37 @@ celery_app.conf.beat_schedule = {
         "schedule": 900.0,  # 每15分钟执行一次
         "args": (),
     },
+    "probe-circuits-every-minute": {
+        "task": "crawler.probe_circuits_task",
+        "schedule": 60.0,  # 每分钟探测一次熔断中的主机
+        "args": (),
+    },
 }
 
+# 爬虫任务结果中的载荷引用要保留到下一次定时处理任务（及其重试）读取之后
+PAYLOAD_CONSUMER_SCHEDULE = "process-news-every-30min"
+if settings.BLOB_STORE_TTL < 2 * celery_app.conf.beat_schedule[PAYLOAD_CONSUMER_SCHEDULE]["schedule"]:
+    logger.warning(
+        "BLOB_STORE_TTL is shorter than two processing intervals, crawl payloads may expire before they are processed",
+        ttl=settings.BLOB_STORE_TTL
+    )
+
+
+@worker_init.connect
+def warm_crawler_registry(**kwargs):
+    """worker启动时预先导入爬虫并编译选择器（prefork子进程fork后继承，第一个任务不承担导入开销）"""
+    if not settings.CRAWLER_WARMUP_ENABLED:
+        return
+    from app.crawlers.registry import get_crawler_registry
+    get_crawler_registry().warm()
+
+
+@worker_process_shutdown.connect
+def close_shared_clients(**kwargs):
+    """worker进程退出时关闭共享连接池"""
+    from app.crawlers.http_client import close_http_client
+    close_http_client()
+
+
 if __name__ == "__main__":
     celery_app.start()
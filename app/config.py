@@ -2,7 +2,7 @@
 项目配置文件
 """
 import os
-from typing import Optional, List
+from typing import Optional, List, Dict
 from pydantic_settings import BaseSettings
 
 
@@ -40,12 +40,94 @@ class Settings(BaseSettings):
     # Celery配置
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
+    CELERY_WORKER_PROFILE: Optional[str] = None  # 强制所有队列使用的池配置: io / cpu / small / solo（Windows可设为solo）
+    CELERY_IO_POOL: str = "threads"  # crawler/detail队列的池: threads / gevent
+    CELERY_IO_CONCURRENCY: int = 32  # crawler/detail队列的并发数
+    CELERY_CPU_CONCURRENCY: int = 0  # processor队列的进程数，0表示CPU核数
+    CELERY_SMALL_CONCURRENCY: int = 2  # index/default队列的进程数
+    CELERY_MAX_TASKS_PER_CHILD: int = 500  # prefork子进程处理多少个任务后重启（回收内存）
     
     # 爬虫配置
     CRAWLER_DELAY: float = 1.0  # 请求间隔(秒)
     CRAWLER_TIMEOUT: int = 30   # 请求超时(秒)
     CRAWLER_MAX_RETRIES: int = 3  # 最大重试次数
+    CRAWLER_MAX_PAGES: int = 10  # 每次爬取最多翻页数
+    CRAWLER_RETRY_BASE_DELAY: float = 1.0  # 重试退避基数(秒)，第n次重试最多等待 base * 2^n
+    CRAWLER_RETRY_MAX_DELAY: float = 60.0  # 单次退避等待上限(秒)
+    CRAWLER_RETRY_MAX_AFTER: float = 300.0  # 服务器Retry-After超过该值(秒)时放弃重试
+    CRAWLER_CIRCUIT_BACKEND: str = "redis"  # 主机熔断状态后端: redis / memory / none
+    CRAWLER_CIRCUIT_FAILURE_THRESHOLD: int = 5  # 连续失败多少次后熔断
+    CRAWLER_CIRCUIT_OPEN_SECONDS: float = 300.0  # 熔断后多久允许探测(秒)
+    
+    # robots.txt配置
+    CRAWLER_ROBOTS_BACKEND: str = "redis"  # 缓存后端: redis / memory / none(不检查robots.txt)
+    CRAWLER_ROBOTS_AGENT: str = "NewsEngine"  # 匹配robots.txt中User-agent分组的爬虫标识
+    CRAWLER_ROBOTS_TTL: int = 24 * 3600  # robots.txt缓存时间(秒)
+    CRAWLER_ROBOTS_NEGATIVE_TTL: int = 600  # robots.txt无法访问时的负缓存时间(秒)
+    CRAWLER_ROBOTS_TIMEOUT: float = 10.0  # 请求robots.txt的超时(秒)
+    
+    # 站点地图爬虫配置
+    CRAWLER_SITEMAP_STATE_BACKEND: str = "redis"  # lastmod水位线存储: redis / memory
+    CRAWLER_SITEMAP_BATCH_SIZE: int = 200  # 每批去重并产出的站点地图条目数
     CRAWLER_USER_AGENT: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    CRAWLER_FETCH_MODE: str = "sync"  # 抓取模式: sync / async
+    CRAWLER_ASYNC_MAX_CONCURRENCY: int = 64  # 异步模式全局最大并发请求数
+    CRAWLER_ASYNC_PER_HOST_LIMIT: int = 8  # 异步模式单主机最大并发请求数
+    CRAWLER_HOST_RATE: float = 1.0  # 单主机默认请求速率(次/秒)，<=0表示不限速
+    CRAWLER_HOST_BURST: int = 2  # 单主机令牌桶容量(允许的突发请求数)
+    CRAWLER_PARSER_BACKEND: str = "bs4"  # HTML解析后端: bs4 / lxml / selectolax
+    CRAWLER_ENCODING_SNIFF_BYTES: int = 4096  # 在响应开头多少字节内查找meta charset
+    CRAWLER_TIMEZONE: str = "Asia/Shanghai"  # 解析相对发布时间(如"3小时前")使用的时区
+    CRAWLER_SOURCES_FILE: str = "news_sources.json"  # 新闻源配置文件（含各站点URL规范化规则）
+    CRAWLER_URL_CANON_CACHE_SIZE: int = 65536  # URL规范化结果LRU缓存大小
+    
+    # 连接池配置（worker进程内跨任务共享）
+    CRAWLER_POOL_CONNECTIONS: int = 32  # 缓存的主机连接池数量
+    CRAWLER_POOL_MAXSIZE: int = 10  # 每个主机默认保持的keep-alive连接数
+    CRAWLER_HOST_POOL_SIZES: Dict[str, int] = {}  # 按主机覆盖连接池大小, 如 {"news.sina.com.cn": 20}
+    
+    # 条件请求缓存配置 (ETag / Last-Modified)
+    CRAWLER_HTTP_CACHE_BACKEND: str = "redis"  # 后端: redis / file / memory / none
+    CRAWLER_HTTP_CACHE_PATH: str = "data/http_validators.json"  # file后端的缓存文件
+    CRAWLER_HTTP_CACHE_MAX_ENTRIES: int = 10000  # 本地缓存最大条目数(LRU淘汰)
+    CRAWLER_HTTP_CACHE_TTL: int = 7 * 24 * 3600  # 验证器有效期(秒)
+    CRAWLER_HTTP_CACHE_FLUSH_EVERY: int = 50  # file后端每写入多少条落盘一次
+    
+    # 已见URL过滤器配置（跨爬取去重）
+    CRAWLER_FRONTIER_BACKEND: str = "redis"  # 后端: redis / mmap / memory / none
+    CRAWLER_FRONTIER_PATH: str = "data/frontier"  # mmap后端的分片目录
+    CRAWLER_FRONTIER_CAPACITY: int = 100000  # 每代首个分片的容量，写满后按倍数扩容
+    CRAWLER_FRONTIER_ERROR_RATE: float = 0.001  # 所有存活代合计的误判率上界
+    CRAWLER_FRONTIER_ROTATE_SECONDS: int = 24 * 3600  # 每代覆盖的时长(秒)
+    CRAWLER_FRONTIER_GENERATIONS: int = 7  # 保留的代数（超过后最旧的一代整体丢弃）
+    
+    # 爬取断点配置（任务被重新投递时从断点继续）
+    CRAWLER_CHECKPOINT_BACKEND: str = "redis"  # 后端: redis / memory / none
+    CRAWLER_CHECKPOINT_EVERY: int = 5  # 每爬取多少页保存一次断点（启用验证器缓存或已见URL过滤器时每页保存）
+    CRAWLER_CHECKPOINT_TTL: int = 6 * 3600  # 断点有效期(秒)
+    
+    # 详情页抓取配置（列表页产出的文章补全正文）
+    CRAWLER_DETAIL_ENABLED: bool = True  # 是否抓取详情页正文
+    CRAWLER_DETAIL_WORKERS: int = 16  # 并发抓取详情页的协程数
+    CRAWLER_DETAIL_QUEUE_SIZE: int = 100  # 待抓取队列上限，满时列表页爬取等待（背压）
+    CRAWLER_DETAIL_BATCH_SIZE: int = 50  # 每个详情抓取任务 / 每次写回存储的文章数
+    
+    # 爬虫注册表配置（worker进程内按新闻源缓存爬虫实例）
+    CRAWLER_REGISTRY_MAX_IDLE: int = 64  # 每个进程最多缓存的空闲爬虫实例数
+    CRAWLER_WARMUP_ENABLED: bool = True  # worker启动时预先导入爬虫并编译选择器
+    
+    # 文章处理配置
+    PROCESSOR_BATCH_SIZE: int = 200  # 每批从存储读取、处理并写回的文章数
+    
+    # 文章存储配置
+    ARTICLE_STORE_BACKEND: str = "redis"  # 后端: redis / memory（memory只用于测试或单进程部署）
+    ARTICLE_STORE_TTL: int = 7 * 24 * 3600  # 文章在缓存存储中的保留时间(秒)
+    
+    # 任务载荷存储配置（任务之间只传递引用，文章批次存放在这里）
+    BLOB_STORE_BACKEND: str = "redis"  # 后端: redis / file / memory
+    BLOB_STORE_PATH: str = "data/blobs"  # file后端的分段目录（需所有worker共享）
+    BLOB_STORE_TTL: int = 24 * 3600  # 载荷保留时间(秒)，下游任务需在此之前消费（至少为定时处理间隔的2倍）
+    BLOB_STORE_RETRY_DELAY: int = 30  # 载荷存储或文章存储不可用时任务重试的间隔(秒)
     
     # 代理配置
     PROXY_ENABLED: bool = False
@@ -0,0 +1,57 @@
+"""
+共享Redis连接
+"""
+import threading
+import time
+from typing import Optional
+
+import redis
+
+from app.config import REDIS_URL, settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 连接失败后的重试间隔(秒)，避免每次调用都等待连接超时
+_RETRY_INTERVAL = 30.0
+
+_client: Optional[redis.Redis] = None
+_unavailable_until = 0.0
+_lock = threading.Lock()
+
+
+def get_redis_client() -> Optional[redis.Redis]:
+    """获取进程级共享Redis客户端，Redis不可用时返回None"""
+    global _client, _unavailable_until
+
+    if _client is not None:
+        return _client
+    if time.monotonic() < _unavailable_until:
+        return None
+
+    with _lock:
+        if _client is not None:
+            return _client
+        try:
+            client = redis.Redis.from_url(
+                REDIS_URL,
+                password=settings.REDIS_PASSWORD,
+                socket_connect_timeout=1,
+                socket_timeout=2,
+            )
+            client.ping()
+            _client = client
+        except redis.RedisError as e:
+            logger.warning(f"Redis unavailable, falling back to local state: {str(e)}")
+            _unavailable_until = time.monotonic() + _RETRY_INTERVAL
+            return None
+
+    return _client
+
+
+def reset_redis_client():
+    """丢弃缓存的客户端（连接出错后调用，下次重新连接）"""
+    global _client, _unavailable_until
+    with _lock:
+        _client = None
+        _unavailable_until = time.monotonic() + _RETRY_INTERVAL
@@ -0,0 +1,94 @@
+"""
+Celery worker池配置
+
+按队列选择池类型和并发数: I/O密集的crawler/detail队列用线程池（或gevent）高并发，
+CPU密集的processor队列用按核数启动的prefork，index/default用小规模prefork。
+Windows不支持prefork，自动退化为solo池；也可以通过 CELERY_WORKER_PROFILE=solo 强制所有队列使用solo。
+"""
+import importlib.util
+import os
+import sys
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 队列 -> 池配置名
+QUEUE_PROFILES: Dict[str, str] = {
+    'crawler': 'io',
+    'detail': 'io',
+    'processor': 'cpu',
+    'index': 'small',
+    'default': 'small',
+}
+
+# 一个worker同时消费多个配置不同的队列时，按这个顺序选用（prefork优先，避免CPU任务跑在线程池里）
+_PROFILE_PRIORITY = ('cpu', 'small', 'io', 'solo')
+
+
+class WorkerProfile:
+    """worker池配置"""
+
+    def __init__(self, name: str, pool: str, concurrency: int, max_tasks_per_child: Optional[int] = None):
+        self.name = name
+        self.pool = pool
+        self.concurrency = concurrency
+        self.max_tasks_per_child = max_tasks_per_child
+
+    def worker_args(self) -> List[str]:
+        """celery worker 命令行参数"""
+        args = [f'--pool={self.pool}', f'--concurrency={self.concurrency}']
+        if self.max_tasks_per_child and self.pool == 'prefork':
+            args.append(f'--max-tasks-per-child={self.max_tasks_per_child}')
+        return args
+
+    def __repr__(self) -> str:
+        return f"WorkerProfile({self.name}: {self.pool} x{self.concurrency})"
+
+
+def build_profile(name: str, platform: Optional[str] = None) -> WorkerProfile:
+    """按名称和平台构造池配置"""
+    platform = platform or sys.platform
+    if name == 'solo':
+        return WorkerProfile('solo', 'solo', 1)
+
+    if name == 'io':
+        pool = settings.CELERY_IO_POOL
+        if pool == 'gevent' and importlib.util.find_spec('gevent') is None:
+            logger.warning("gevent is not installed, falling back to threads pool")
+            pool = 'threads'
+        return WorkerProfile('io', pool, settings.CELERY_IO_CONCURRENCY)
+
+    if name == 'cpu':
+        concurrency = settings.CELERY_CPU_CONCURRENCY or os.cpu_count() or 1
+    elif name == 'small':
+        concurrency = settings.CELERY_SMALL_CONCURRENCY
+    else:
+        raise ValueError(f"Unknown worker profile: {name}")
+
+    if platform == 'win32':
+        # Windows不支持fork
+        return WorkerProfile('solo', 'solo', 1)
+    return WorkerProfile(name, 'prefork', concurrency, settings.CELERY_MAX_TASKS_PER_CHILD)
+
+
+def resolve_profile(queues: List[str], override: Optional[str] = None, platform: Optional[str] = None) -> WorkerProfile:
+    """为消费这些队列的worker选择池配置"""
+    name = override or settings.CELERY_WORKER_PROFILE
+    if not name:
+        names = {QUEUE_PROFILES.get(queue, 'small') for queue in queues}
+        name = next(p for p in _PROFILE_PRIORITY if p in names)
+    return build_profile(name, platform)
+
+
+def group_queues(queues: List[str], override: Optional[str] = None,
+                 platform: Optional[str] = None) -> 'OrderedDict[str, List[str]]':
+    """按最终使用的池配置把队列分组（每组启动一个worker）"""
+    groups: 'OrderedDict[str, List[str]]' = OrderedDict()
+    for queue in queues:
+        profile = resolve_profile([queue], override, platform)
+        groups.setdefault(profile.name, []).append(queue)
+    return groups
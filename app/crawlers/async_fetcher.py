@@ -0,0 +1,119 @@
+"""
+异步抓取引擎
+"""
+import asyncio
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from app.core.logging import LoggerMixin
+from app.config import settings
+
+
+class AsyncFetcher(LoggerMixin):
+    """基于单事件循环的异步抓取器，支持全局并发上限和单主机并发上限"""
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        per_host_limit: Optional[int] = None,
+        timeout: Optional[float] = None,
+        headers: Optional[Dict[str, str]] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        super().__init__()
+        self.max_concurrency = max_concurrency or settings.CRAWLER_ASYNC_MAX_CONCURRENCY
+        self.per_host_limit = per_host_limit or settings.CRAWLER_ASYNC_PER_HOST_LIMIT
+        self.timeout = timeout or settings.CRAWLER_TIMEOUT
+        self.headers = headers or {}
+        self.transport = transport
+
+        # 信号量与事件循环绑定，延迟到首次使用时创建
+        self._client: Optional[httpx.AsyncClient] = None
+        self._global_semaphore: Optional[asyncio.Semaphore] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+        # 运行统计
+        self.requests_sent = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        """创建共享的异步客户端"""
+        if self._client is None:
+            proxy = settings.PROXY_URL if settings.PROXY_ENABLED and settings.PROXY_URL else None
+            limits = httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency
+            )
+            client_kwargs = {
+                'timeout': self.timeout,
+                'headers': self.headers,
+                'follow_redirects': True,
+                'limits': limits,
+            }
+            if self.transport is not None:
+                client_kwargs['transport'] = self.transport
+            elif proxy:
+                client_kwargs['proxy'] = proxy
+            self._client = httpx.AsyncClient(**client_kwargs)
+            self._global_semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """获取主机级并发信号量"""
+        host = urlparse(url).hostname or ''
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """抓取单个URL（受全局和主机并发上限约束）"""
+        client = self._ensure_client()
+
+        async with self._global_semaphore:
+            async with self._host_semaphore(url):
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                try:
+                    self.requests_sent += 1
+                    return await client.get(url, headers=headers)
+                finally:
+                    self.in_flight -= 1
+
+    async def fetch_many(self, urls: List[str]) -> List[Optional[httpx.Response]]:
+        """并发抓取多个URL，失败的请求返回None"""
+        async def _safe_fetch(url: str) -> Optional[httpx.Response]:
+            try:
+                response = await self.fetch(url)
+                response.raise_for_status()
+                return response
+            except httpx.HTTPError as e:
+                self.log_error(f"Failed to fetch page {url}: {str(e)}")
+                return None
+
+        return await asyncio.gather(*(_safe_fetch(url) for url in urls))
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取抓取统计"""
+        return {
+            'requests_sent': self.requests_sent,
+            'in_flight': self.in_flight,
+            'peak_in_flight': self.peak_in_flight,
+            'hosts': len(self._host_semaphores),
+        }
+
+    async def aclose(self):
+        """关闭客户端"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
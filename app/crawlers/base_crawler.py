@@ -2,16 +2,36 @@
 基础爬虫类
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator, AsyncIterator, Union
+import asyncio
+import calendar
+import inspect
 import time
 import random
 import requests
-from urllib.parse import urljoin, urlparse
+import httpx
+from datetime import datetime
+from urllib.parse import urljoin, urlsplit
 from bs4 import BeautifulSoup
 import structlog
 
 from app.core.logging import LoggerMixin
 from app.config import settings
+from app.crawlers.async_fetcher import AsyncFetcher
+from app.crawlers.politeness import HostRateLimiter, get_rate_limiter
+from app.crawlers.http_cache import ValidatorCache, get_validator_cache
+from app.crawlers.http_client import PooledHttpClient, get_http_client
+from app.crawlers.frontier import SeenUrlFilter, get_url_frontier
+from app.crawlers.url_canon import canonicalize_url
+from app.crawlers.checkpoint import CheckpointStore, get_checkpoint_store
+from app.crawlers.retry import RetryPolicy
+from app.crawlers.circuit_breaker import CircuitBreaker, get_circuit_breaker
+from app.crawlers.robots import RobotsCache, get_robots_cache
+from app.crawlers.encoding import EncodingDetector, get_encoding_detector
+from app.crawlers.parsers import ParserBackend, get_parser_backend
+from app.crawlers.extraction import ExtractionPlan, get_extraction_plan
+from app.crawlers.content_extractor import ContentExtractor, get_content_extractor
+from app.crawlers import normalization
 
 
 class BaseCrawler(ABC, LoggerMixin):
@@ -21,23 +41,81 @@ class BaseCrawler(ABC, LoggerMixin):
         super().__init__()
         self.source_id = source_id
         self.source_url = source_url
-        self.session = requests.Session()
+        # 共享连接池（同一worker进程内的所有爬虫复用keep-alive连接）
+        self.http_client: PooledHttpClient = kwargs.get('http_client') or get_http_client()
         self.setup_session()
         
         # 爬虫配置
         self.delay = kwargs.get('delay', settings.CRAWLER_DELAY)
         self.timeout = kwargs.get('timeout', settings.CRAWLER_TIMEOUT)
         self.max_retries = kwargs.get('max_retries', settings.CRAWLER_MAX_RETRIES)
-        self.max_pages = kwargs.get('max_pages', 10)
+        self.max_pages = kwargs.get('max_pages', settings.CRAWLER_MAX_PAGES)
+        self.fetch_mode = kwargs.get('fetch_mode', settings.CRAWLER_FETCH_MODE)
+        self.retry_policy: RetryPolicy = kwargs.get('retry_policy') or RetryPolicy(max_retries=self.max_retries)
+        
+        # 主机级熔断（主机持续失败时快速失败，把worker让给正常的新闻源）
+        self.circuit_breaker: Optional[CircuitBreaker] = kwargs.get('circuit_breaker')
+        if self.circuit_breaker is None and settings.CRAWLER_CIRCUIT_BACKEND != 'none':
+            self.circuit_breaker = get_circuit_breaker()
+        
+        # robots.txt（所有worker共享缓存，Crawl-delay写入主机限速器）
+        self.robots: Optional[RobotsCache] = kwargs.get('robots')
+        if self.robots is None and settings.CRAWLER_ROBOTS_BACKEND != 'none':
+            self.robots = get_robots_cache()
+        self.source_netloc = urlsplit(source_url).netloc.lower()
+        
+        # HTML解析后端（bs4 / lxml / selectolax），可按新闻源选择
+        self.parser_backend: ParserBackend = get_parser_backend(kwargs.get('parser_backend'))
+        
+        # 响应编码识别（头 -> meta -> 主机缓存，不对整个响应体猜测字符集）
+        self.encoding_detector: EncodingDetector = kwargs.get('encoding_detector') or get_encoding_detector()
+        
+        # 主机级限速（同一主机的所有爬虫共享一个令牌桶）
+        self.rate_limiter = kwargs.get('rate_limiter') or get_rate_limiter()
+        rate_limit = kwargs.get('rate_limit')
+        if rate_limit is None and 'delay' in kwargs:
+            # 兼容旧的delay配置：delay秒一次 → 1/delay 次每秒
+            rate_limit = 1.0 / self.delay if self.delay > 0 else 0
+        if rate_limit is not None or kwargs.get('rate_burst') is not None:
+            self.rate_limiter.configure_host(
+                HostRateLimiter.host_of(source_url),
+                rate_limit,
+                kwargs.get('rate_burst')
+            )
+        
+        # 条件请求缓存（force_crawl时忽略验证器，总是重新解析）
+        self.force_crawl = kwargs.get('force_crawl', False)
+        self.http_cache: Optional[ValidatorCache] = kwargs.get('http_cache')
+        if self.http_cache is None and settings.CRAWLER_HTTP_CACHE_BACKEND != 'none':
+            self.http_cache = get_validator_cache()
+        
+        # 已见URL过滤器（以前的爬取中已产出过的文章不再交给下游）
+        self.frontier: Optional[SeenUrlFilter] = kwargs.get('frontier')
+        if self.frontier is None and settings.CRAWLER_FRONTIER_BACKEND != 'none':
+            self.frontier = get_url_frontier()
+        
+        # 爬取断点（同一任务被重新投递时从最后一个断点继续翻页）
+        self.crawl_id = kwargs.get('crawl_id')
+        self.checkpoint_every = kwargs.get('checkpoint_every', settings.CRAWLER_CHECKPOINT_EVERY)
+        self.checkpoints: Optional[CheckpointStore] = kwargs.get('checkpoints')
+        if self.checkpoints is None and settings.CRAWLER_CHECKPOINT_BACKEND != 'none':
+            self.checkpoints = get_checkpoint_store()
+        self.seen_keys = set()
+        
+        # 当前爬取的sink（页面级提交前调用其flush，见flush_sink）
+        self.sink: Optional[Callable[[Dict[str, Any]], Any]] = None
         
         # 状态跟踪
+        self.pages_crawled = 0
+        self.pages_not_modified = 0
         self.articles_found = 0
+        self.articles_skipped = 0
         self.articles_processed = 0
         self.errors = []
         self.start_time = None
         
     def setup_session(self):
-        """设置请求会话"""
+        """设置请求头（每次请求时传入，不修改共享会话）"""
         # 设置User-Agent
         user_agents = [
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -45,75 +123,193 @@ class BaseCrawler(ABC, LoggerMixin):
             "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         ]
         
-        self.session.headers.update({
+        self.headers = {
             'User-Agent': random.choice(user_agents),
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
             'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
-        })
+        }
         
-        # 设置代理（如果启用）
-        if settings.PROXY_ENABLED and settings.PROXY_URL:
-            self.session.proxies = {
-                'http': settings.PROXY_URL,
-                'https': settings.PROXY_URL
-            }
+        # 代理由共享客户端统一配置
     
-    def get_page(self, url: str, retries: int = 0) -> Optional[requests.Response]:
-        """获取页面内容"""
-        try:
-            self.log_info(f"Fetching page: {url}")
-            
-            response = self.session.get(
-                url,
-                timeout=self.timeout,
-                allow_redirects=True
-            )
-            response.raise_for_status()
-            
-            # 添加延迟
-            time.sleep(self.delay)
-            
-            return response
-            
-        except requests.RequestException as e:
-            self.log_error(f"Failed to fetch page {url}: {str(e)}")
-            
-            if retries < self.max_retries:
-                self.log_info(f"Retrying {url} (attempt {retries + 1}/{self.max_retries})")
-                time.sleep(self.delay * (retries + 1))  # 指数退避
-                return self.get_page(url, retries + 1)
-            else:
-                self.errors.append({
-                    'url': url,
-                    'error': str(e),
-                    'retries': retries
-                })
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """构建条件请求头（If-None-Match / If-Modified-Since）"""
+        if self.http_cache is None or self.force_crawl:
+            return {}
+        return self.http_cache.conditional_headers(url)
+    
+    def mark_not_modified(self, url: str, response: Any, stream: bool = False) -> Any:
+        """标记响应内容是否与上次抓取相同（流式响应只看304，不读取响应体）"""
+        response.not_modified = (
+            self.http_cache is not None
+            and not self.force_crawl
+            and self.http_cache.is_not_modified(url, response, check_body=not stream)
+        )
+        return response
+    
+    def detect_encoding(self, url: str, response: Any) -> Any:
+        """确定响应编码并写回response.encoding（304和流式响应不读取响应体）"""
+        if response.status_code != 304:
+            self.encoding_detector.apply(url, response)
+        return response
+    
+    def get_page(self, url: str, retries: int = 0, stream: bool = False) -> Optional[requests.Response]:
+        """获取页面内容（可重试错误按重试策略退避后重试，stream=True时不预先读取响应体）"""
+        if not self.robots_allowed(url, fetch=True):
+            self.record_robots_blocked(url)
+            return None
+        
+        attempt = retries
+        while True:
+            if not self.circuit_allows(url, attempt):
                 return None
+            try:
+                self.log_info(f"Fetching page: {url}")
+                
+                # 按主机速率等待（只在超出主机预算时才等待）
+                self.rate_limiter.acquire(url)
+                
+                response = self.http_client.get(
+                    url,
+                    headers={**self.headers, **self.conditional_headers(url)},
+                    timeout=self.timeout,
+                    allow_redirects=True,
+                    stream=stream
+                )
+                if response.status_code != 304:
+                    response.raise_for_status()
+                
+                self.record_fetch_success(url, attempt)
+                if not stream:
+                    self.detect_encoding(url, response)
+                return self.mark_not_modified(url, response, stream=stream)
+                
+            except requests.RequestException as e:
+                delay = self.handle_fetch_error(url, attempt, e)
+                if delay is None:
+                    return None
+                time.sleep(delay)
+                attempt += 1
     
-    def parse_html(self, html_content: str) -> BeautifulSoup:
-        """解析HTML内容"""
-        return BeautifulSoup(html_content, 'lxml')
+    async def get_page_async(self, url: str, fetcher: AsyncFetcher, retries: int = 0) -> Optional[Any]:
+        """异步获取页面内容（退避等待在事件循环上挂起，不阻塞其他请求）"""
+        if not await self.robots_allowed_async(url):
+            self.record_robots_blocked(url)
+            return None
+        
+        attempt = retries
+        while True:
+            if not self.circuit_allows(url, attempt):
+                return None
+            try:
+                self.log_info(f"Fetching page: {url}")
+                
+                # 按主机速率等待（只挂起当前爬虫，不影响同一事件循环上的其他请求）
+                await self.rate_limiter.acquire_async(url)
+                
+                response = await fetcher.fetch(url, headers={**self.headers, **self.conditional_headers(url)})
+                if response.status_code != 304:
+                    response.raise_for_status()
+                
+                self.record_fetch_success(url, attempt)
+                self.detect_encoding(url, response)
+                return self.mark_not_modified(url, response)
+                
+            except httpx.HTTPError as e:
+                delay = self.handle_fetch_error(url, attempt, e)
+                if delay is None:
+                    return None
+                await asyncio.sleep(delay)
+                attempt += 1
+    
+    def robots_allowed(self, url: str, fetch: Optional[bool] = None) -> bool:
+        """robots.txt是否允许抓取（默认只主动请求本新闻源站点的robots.txt，其他站点只查缓存）"""
+        if self.robots is None:
+            return True
+        if fetch is None:
+            fetch = urlsplit(url).netloc.lower() == self.source_netloc
+        return self.robots.allowed(url, fetch=fetch)
+    
+    async def robots_allowed_async(self, url: str) -> bool:
+        """异步检查robots.txt（首次请求robots.txt放到线程中，不阻塞事件循环）"""
+        if self.robots is None or self.robots.get_rules(url, fetch=False) is not None:
+            return self.robots_allowed(url, fetch=False)
+        return await asyncio.to_thread(self.robots_allowed, url, True)
+    
+    def record_robots_blocked(self, url: str):
+        """记录被robots.txt禁止的页面"""
+        self.log_warning(f"Disallowed by robots.txt, skipping page: {url}")
+        self.errors.append({
+            'url': url,
+            'error': 'disallowed by robots.txt',
+            'retries': 0
+        })
+    
+    def circuit_allows(self, url: str, attempt: int) -> bool:
+        """主机熔断时直接放弃本次抓取"""
+        if self.circuit_breaker is None or self.circuit_breaker.allow(url):
+            return True
+        self.log_warning(f"Circuit open, skipping page: {url}")
+        self.errors.append({
+            'url': url,
+            'error': 'circuit open',
+            'retries': attempt
+        })
+        return False
+    
+    def record_fetch_success(self, url: str, attempt: int):
+        """记录抓取成功"""
+        self.retry_policy.record_success(url, attempt)
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_success(url)
+    
+    def handle_fetch_error(self, url: str, attempt: int, e: Exception) -> Optional[float]:
+        """记录抓取失败，返回重试前的等待时间，不再重试时返回None"""
+        self.log_error(f"Failed to fetch page {url}: {str(e)}")
+        
+        if self.circuit_breaker is not None:
+            # 只有超时、连接错误、5xx等主机故障计入熔断，404等说明主机正常
+            if self.retry_policy.classify(e) is not None:
+                self.circuit_breaker.record_failure(url)
+            else:
+                self.circuit_breaker.record_success(url)
+        
+        delay = self.retry_policy.next_delay(url, attempt, e)
+        if delay is None:
+            self.errors.append({
+                'url': url,
+                'error': str(e),
+                'retries': attempt
+            })
+            return None
+        
+        self.log_info(f"Retrying {url} in {delay:.2f}s (attempt {attempt + 1}/{self.retry_policy.max_retries})")
+        return delay
+    
+    def parse_html(self, html_content: Union[str, bytes], encoding: Optional[str] = None) -> BeautifulSoup:
+        """解析HTML内容（bytes需给出编码，由解析后端直接解码；返回节点支持 select / select_one / get_text 等接口）"""
+        return self.parser_backend.parse(html_content, encoding)
     
     def extract_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
-        """提取页面中的链接"""
-        links = []
-        for link in soup.find_all('a', href=True):
+        """提取页面中的链接（按规范化URL去重，保留页面上的原始绝对URL和页面顺序）"""
+        links = {}
+        for link in soup.select('a[href]'):
             href = link['href']
             absolute_url = urljoin(base_url, href)
+            key = canonicalize_url(absolute_url)
             
             # 过滤链接
-            if self.is_valid_link(absolute_url):
-                links.append(absolute_url)
+            if key not in links and self.is_valid_link(absolute_url):
+                links[key] = absolute_url
         
-        return list(set(links))  # 去重
+        return list(links.values())
     
     def is_valid_link(self, url: str) -> bool:
         """检查链接是否有效"""
         try:
-            parsed = urlparse(url)
+            parsed = urlsplit(canonicalize_url(url))
             
             # 检查协议
             if parsed.scheme not in ['http', 'https']:
@@ -124,11 +320,12 @@ class BaseCrawler(ABC, LoggerMixin):
                 return False
             
             # 过滤特定文件类型
-            excluded_extensions = ['.pdf', '.doc', '.docx', '.xls', '.xlsx', '.zip', '.rar']
-            if any(url.lower().endswith(ext) for ext in excluded_extensions):
+            excluded_extensions = ('.pdf', '.doc', '.docx', '.xls', '.xlsx', '.zip', '.rar')
+            if parsed.path.lower().endswith(excluded_extensions):
                 return False
             
-            return True
+            # robots.txt禁止的链接在请求之前过滤掉
+            return self.robots_allowed(url)
             
         except Exception:
             return False
@@ -143,75 +340,311 @@ class BaseCrawler(ABC, LoggerMixin):
         """获取下一页URL（子类必须实现）"""
         pass
     
-    def crawl(self) -> Dict[str, Any]:
-        """执行爬虫任务"""
+    def process_page(self, response: Any, current_url: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """解析单个页面，返回文章列表和下一页URL"""
+        # 原始字节和已识别的编码直接交给解析后端，只解码一次
+        soup = self.parse_html(response.content, response.encoding)
+        
+        # 提取文章
+        articles = self.extract_articles(soup, current_url)
+        
+        # 获取下一页
+        next_url = self.get_next_page_url(soup, current_url)
+        
+        return articles, next_url
+    
+    def begin_crawl(self) -> str:
+        """重置本次爬取的状态（实例可被多次爬取复用），返回起始URL（有同一任务的断点时从断点继续）"""
         self.start_time = time.time()
+        self.pages_crawled = 0
+        self.pages_not_modified = 0
+        self.articles_found = 0
+        self.articles_processed = 0
+        self.articles_skipped = 0
+        self.errors = []
+        self.seen_keys = set()
         self.log_info(f"Starting crawler for source: {self.source_id}")
         
-        all_articles = []
-        current_url = self.source_url
-        page_count = 0
+        checkpoint = self.load_checkpoint()
+        if checkpoint is None:
+            return self.source_url
+        
+        self.pages_crawled = checkpoint['page_count']
+        self.seen_keys = set(checkpoint['seen'])
+        self.log_info(
+            f"Resuming from checkpoint: {checkpoint['current_url']}",
+            pages_crawled=self.pages_crawled
+        )
+        return checkpoint['current_url']
+    
+    @property
+    def checkpointing(self) -> bool:
+        """只有带crawl_id（如任务ID）的爬取才保存和恢复断点，临时爬取总是从第一页开始"""
+        return self.checkpoints is not None and self.checkpoint_every > 0 and self.crawl_id is not None
+    
+    def load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """读取本任务的断点（其他任务留下的断点不使用）"""
+        if not self.checkpointing:
+            return None
+        checkpoint = self.checkpoints.load(self.source_id, self.crawl_id)
+        if not checkpoint or not checkpoint.get('current_url'):
+            return None
+        return checkpoint
+    
+    def save_checkpoint(self, next_url: Optional[str]):
+        """保存翻页游标和已产出文章集合
+        
+        页面的验证器或已见URL已经提交时每页都保存，断点总是指向第一个未提交的页面；
+        否则重新投递后从已提交的页面继续，会因为304或整页已见而提前停止。
+        没有页面级提交时每隔checkpoint_every页保存一次。
+        """
+        if not self.checkpointing or not next_url:
+            return
+        committed = self.http_cache is not None or self.frontier is not None
+        if not committed and self.pages_crawled % self.checkpoint_every:
+            return
+        self.checkpoints.save(self.source_id, self.crawl_id, {
+            'crawl_id': self.crawl_id,
+            'current_url': next_url,
+            'page_count': self.pages_crawled,
+            'seen': list(self.seen_keys),
+        })
+    
+    def end_crawl(self):
+        """翻页正常结束，删除断点"""
+        if self.checkpointing:
+            self.checkpoints.delete(self.source_id, self.crawl_id)
+    
+    def handle_response(self, response: Any, page_url: str) -> Optional[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """处理已抓取的页面，返回 (文章列表, 下一页URL)，返回None表示停止翻页"""
+        # 页面未变化（304或内容哈希一致）时跳过解析，列表页按时间倒序，后续页也无新内容
+        if response.not_modified:
+            self.pages_not_modified += 1
+            self.log_info(f"Page not modified, skipping: {page_url}")
+            return None
+        
+        articles, next_url = self.process_page(response, page_url)
+        self.articles_found += len(articles)
+        self.pages_crawled += 1
+        
+        fresh = self.filter_seen(articles)
+        self.log_info(
+            f"Page {self.pages_crawled} completed, found {len(articles)} articles",
+            new_articles=len(fresh)
+        )
+        if articles and not fresh:
+            # 整页都是已见过的文章，后续页只会更旧
+            self.log_info(f"All articles already seen, stopping: {page_url}")
+            next_url = None
+        return fresh, next_url
+    
+    def article_key(self, article: Dict[str, Any]) -> Optional[str]:
+        """文章去重键（规范化后的URL）"""
+        url = article.get('url')
+        return canonicalize_url(url) if url else None
+    
+    def filter_seen(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """过滤以前爬取中、本次爬取中（含断点前）已产出过的文章"""
+        if not articles:
+            return articles
+        
+        keys = [self.article_key(article) for article in articles]
+        seen_keys = self.seen_keys
+        unique_keys = [key for key in dict.fromkeys(keys) if key and key not in seen_keys]
+        if self.frontier is not None and not self.force_crawl:
+            known = dict(zip(unique_keys, self.frontier.contains_many(unique_keys)))
+        else:
+            known = dict.fromkeys(unique_keys, False)
+        
+        fresh = []
+        for article, key in zip(articles, keys):
+            if key is not None:
+                if key in seen_keys or known[key]:
+                    self.articles_skipped += 1
+                    continue
+                seen_keys.add(key)
+            fresh.append(article)
+        return fresh
+    
+    def flush_sink(self):
+        """让攒批的sink（有flush方法，如ArticleBatchWriter）写出缓冲的文章"""
+        flush = getattr(self.sink, 'flush', None)
+        if flush is not None:
+            flush()
+    
+    async def aflush_sink(self):
+        """flush_sink的异步版本（flush可以是协程函数）"""
+        flush = getattr(self.sink, 'flush', None)
+        if flush is not None:
+            outcome = flush()
+            if inspect.isawaitable(outcome):
+                await outcome
+    
+    def finish_page(self, response: Any, page_url: str, articles: List[Dict[str, Any]], next_url: Optional[str] = None):
+        """页面中的文章全部写出后，再记录验证器、已见URL和断点（调用前先flush sink）"""
+        if self.http_cache is not None:
+            self.http_cache.store(page_url, response)
+        if self.frontier is not None and articles:
+            self.frontier.add_many([key for key in map(self.article_key, articles) if key])
+        self.save_checkpoint(next_url)
+    
+    def record_crawl_error(self, e: Exception):
+        """记录爬取异常"""
+        self.log_error(f"Crawler error: {str(e)}")
+        self.errors.append({
+            'type': 'crawler_error',
+            'error': str(e),
+            'page': self.pages_crawled
+        })
+    
+    def iter_crawl(self) -> Iterator[Dict[str, Any]]:
+        """逐页产出文章，不在内存中累积"""
+        current_url = self.begin_crawl()
         
         try:
-            while current_url and page_count < self.max_pages:
-                self.log_info(f"Crawling page {page_count + 1}: {current_url}")
+            while current_url and self.pages_crawled < self.max_pages:
+                self.log_info(f"Crawling page {self.pages_crawled + 1}: {current_url}")
                 
                 # 获取页面
                 response = self.get_page(current_url)
                 if not response:
+                    # 抓取失败，保留断点供重试
+                    return
+                
+                page_url = current_url
+                handled = self.handle_response(response, page_url)
+                if handled is None:
                     break
+                articles, current_url = handled
                 
-                # 解析HTML
-                soup = self.parse_html(response.text)
+                yield from articles
+                # 先写出sink中缓冲的文章：worker在提交后被杀掉时，重新投递的任务不会再产出这些文章
+                self.flush_sink()
+                self.finish_page(response, page_url, articles, current_url)
+            
+            self.end_crawl()
+        
+        except Exception as e:
+            self.record_crawl_error(e)
+    
+    async def aiter_crawl(self, fetcher: AsyncFetcher) -> AsyncIterator[Dict[str, Any]]:
+        """异步逐页产出文章"""
+        current_url = self.begin_crawl()
+        
+        try:
+            while current_url and self.pages_crawled < self.max_pages:
+                self.log_info(f"Crawling page {self.pages_crawled + 1}: {current_url}")
                 
-                # 提取文章
-                articles = self.extract_articles(soup, current_url)
-                all_articles.extend(articles)
-                self.articles_found += len(articles)
+                response = await self.get_page_async(current_url, fetcher)
+                if not response:
+                    # 抓取失败，保留断点供重试
+                    return
                 
-                # 获取下一页
-                current_url = self.get_next_page_url(soup, current_url)
-                page_count += 1
+                page_url = current_url
+                handled = self.handle_response(response, page_url)
+                if handled is None:
+                    break
+                articles, current_url = handled
                 
-                self.log_info(f"Page {page_count} completed, found {len(articles)} articles")
+                for article in articles:
+                    yield article
+                await self.aflush_sink()
+                self.finish_page(response, page_url, articles, current_url)
+            
+            self.end_crawl()
         
         except Exception as e:
-            self.log_error(f"Crawler error: {str(e)}")
-            self.errors.append({
-                'type': 'crawler_error',
-                'error': str(e),
-                'page': page_count
-            })
+            self.record_crawl_error(e)
+    
+    def crawl(self, sink: Optional[Callable[[Dict[str, Any]], Any]] = None) -> Dict[str, Any]:
+        """执行爬虫任务，文章逐条交给sink（如数据库写入器、队列生产者），只返回统计信息"""
+        if self.fetch_mode == 'async':
+            return asyncio.run(self.crawl_async(sink=sink))
         
+        self.sink = sink
+        try:
+            for article in self.iter_crawl():
+                if sink is not None:
+                    sink(article)
+                self.articles_processed += 1
+        except Exception as e:
+            self.record_sink_error(e)
         finally:
-            # 统计结果
-            crawl_time = time.time() - self.start_time
-            self.articles_processed = len(all_articles)
-            
-            result = {
-                'source_id': self.source_id,
-                'source_url': self.source_url,
-                'articles_found': self.articles_found,
-                'articles_processed': self.articles_processed,
-                'pages_crawled': page_count,
-                'crawl_time': crawl_time,
-                'errors': self.errors,
-                'articles': all_articles
-            }
-            
-            self.log_info(
-                f"Crawler completed",
-                articles_found=self.articles_found,
-                pages_crawled=page_count,
-                crawl_time=crawl_time
-            )
-            
-            return result
+            self.sink = None
+        
+        return self.build_result()
+    
+    async def crawl_async(
+        self,
+        fetcher: Optional[AsyncFetcher] = None,
+        sink: Optional[Callable[[Dict[str, Any]], Any]] = None
+    ) -> Dict[str, Any]:
+        """异步执行爬虫任务（可与其他爬虫共享同一个抓取器），sink可以是普通函数或协程函数"""
+        own_fetcher = fetcher is None
+        if own_fetcher:
+            fetcher = AsyncFetcher(timeout=self.timeout, headers=self.headers)
+        
+        self.sink = sink
+        try:
+            async for article in self.aiter_crawl(fetcher):
+                if sink is not None:
+                    outcome = sink(article)
+                    if inspect.isawaitable(outcome):
+                        await outcome
+                self.articles_processed += 1
+        except Exception as e:
+            self.record_sink_error(e)
+        finally:
+            self.sink = None
+            if own_fetcher:
+                await fetcher.aclose()
+        
+        return self.build_result()
+    
+    def record_sink_error(self, e: Exception):
+        """记录下游写入异常（停止爬取，避免丢失数据）"""
+        self.log_error(f"Article sink error: {str(e)}")
+        self.errors.append({
+            'type': 'sink_error',
+            'error': str(e),
+            'page': self.pages_crawled
+        })
+    
+    def build_result(self) -> Dict[str, Any]:
+        """统计爬取结果（不包含文章本身）"""
+        crawl_time = time.time() - self.start_time
+        
+        result = {
+            'source_id': self.source_id,
+            'source_url': self.source_url,
+            'articles_found': self.articles_found,
+            'articles_processed': self.articles_processed,
+            'articles_skipped': self.articles_skipped,
+            'pages_crawled': self.pages_crawled,
+            'pages_not_modified': self.pages_not_modified,
+            'crawl_time': crawl_time,
+            'errors': self.errors,
+            'http_pool': self.http_client.get_stats(),
+            'http_cache': self.http_cache.get_stats() if self.http_cache is not None else None,
+            'retries': self.retry_policy.metrics.get_stats(urlsplit(self.source_url).hostname or ''),
+            'frontier': self.frontier.get_stats() if self.frontier is not None else None
+        }
+        
+        self.log_info(
+            f"Crawler completed",
+            articles_found=self.articles_found,
+            articles_skipped=self.articles_skipped,
+            pages_crawled=self.pages_crawled,
+            pages_not_modified=self.pages_not_modified,
+            bytes_saved=result['http_cache']['bytes_saved'] if result['http_cache'] else 0,
+            crawl_time=crawl_time
+        )
+        
+        return result
     
     def cleanup(self):
-        """清理资源"""
-        if hasattr(self, 'session'):
-            self.session.close()
+        """清理资源（共享连接池由进程管理，这里不关闭）"""
+        pass
     
     def __enter__(self):
         return self
@@ -220,27 +653,56 @@ class BaseCrawler(ABC, LoggerMixin):
         self.cleanup()
 
 
+def crawl_many(
+    crawlers: List[BaseCrawler],
+    max_concurrency: Optional[int] = None,
+    per_host_limit: Optional[int] = None,
+    sink: Optional[Callable[[Dict[str, Any]], Any]] = None
+) -> List[Dict[str, Any]]:
+    """在同一个事件循环上并发执行多个爬虫"""
+    async def _run() -> List[Dict[str, Any]]:
+        async with AsyncFetcher(max_concurrency=max_concurrency, per_host_limit=per_host_limit) as fetcher:
+            return await asyncio.gather(*(crawler.crawl_async(fetcher, sink=sink) for crawler in crawlers))
+    
+    return asyncio.run(_run())
+
+
 class RSSFeedCrawler(BaseCrawler):
-    """RSS订阅爬虫"""
+    """RSS订阅爬虫（通过共享客户端请求一次，支持条件请求）"""
     
     def __init__(self, source_id: str, source_url: str, **kwargs):
         super().__init__(source_id, source_url, **kwargs)
         import feedparser
         self.feedparser = feedparser
+        self.headers['Accept'] = 'application/rss+xml,application/atom+xml,application/xml;q=0.9,*/*;q=0.8'
     
-    def extract_articles(self, soup: BeautifulSoup, page_url: str) -> List[Dict[str, Any]]:
+    def process_page(self, response: Any, current_url: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """把已下载的原始字节交给feedparser，不构建HTML解析树"""
+        feed = self.parse_feed(response, current_url)
+        return self.extract_articles(feed, current_url), None
+    
+    def parse_feed(self, response: Any, page_url: str) -> Any:
+        """解析RSS/Atom（feedparser不再自己发请求）"""
+        return self.feedparser.parse(
+            response.content,
+            response_headers={
+                'content-location': page_url,
+                'content-type': response.headers.get('Content-Type', 'application/xml'),
+            }
+        )
+    
+    def extract_articles(self, feed: Any, page_url: str) -> List[Dict[str, Any]]:
         """从RSS源提取文章"""
         articles = []
         
         try:
-            feed = self.feedparser.parse(page_url)
-            
             for entry in feed.entries:
+                link = entry.get('link', '')
                 article = {
                     'title': entry.get('title', ''),
                     'content': entry.get('summary', ''),
-                    'url': entry.get('link', ''),
-                    'publish_time': entry.get('published', ''),
+                    'url': urljoin(page_url, link) if link else '',
+                    'publish_time': self.parse_entry_time(entry),
                     'author': entry.get('author', ''),
                     'source_id': self.source_id,
                     'source_url': self.source_url
@@ -252,6 +714,13 @@ class RSSFeedCrawler(BaseCrawler):
         
         return articles
     
+    def parse_entry_time(self, entry: Any) -> str:
+        """发布时间转换为带时区的ISO时间（无法解析时返回原文）"""
+        parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+        if parsed:
+            return datetime.fromtimestamp(calendar.timegm(parsed), tz=normalization.TIMEZONE).isoformat()
+        return entry.get('published', '')
+    
     def get_next_page_url(self, soup: BeautifulSoup, current_url: str) -> Optional[str]:
         """RSS通常只有一页"""
         return None
@@ -267,6 +736,58 @@ class WebsiteCrawler(BaseCrawler):
         self.article_selectors = kwargs.get('article_selectors', {})
         self.pagination_selectors = kwargs.get('pagination_selectors', {})
         self.content_selectors = kwargs.get('content_selectors', {})
+        self._extraction_plan: Optional[ExtractionPlan] = None
+        self.content_extractor: ContentExtractor = kwargs.get('content_extractor') or get_content_extractor()
+        self._hints_seeded = False
+    
+    @property
+    def extraction_plan(self) -> ExtractionPlan:
+        """条目字段的提取计划（子类在__init__中设置选择器，首次使用时编译）"""
+        if self._extraction_plan is None:
+            fields = {k: v for k, v in self.article_selectors.items() if k != 'news_list'}
+            fields.setdefault('link', 'a[href]')
+            self._extraction_plan = get_extraction_plan(fields)
+        return self._extraction_plan
+    
+    def extract_fields(self, item: BeautifulSoup, page_url: str) -> Dict[str, Any]:
+        """一次遍历提取条目的所有字段文本和链接"""
+        nodes = self.extraction_plan.extract(item)
+        
+        fields = {}
+        for field, node in nodes.items():
+            if field != 'link':
+                fields[field] = node.get_text(' ', strip=True) if node is not None else ''
+        
+        link = item if item.name == 'a' and item.get('href') else nodes['link']
+        fields['link'] = self.resolve_link(link, page_url)
+        return fields
+    
+    def extract_main_content(self, soup: BeautifulSoup, page_url: str) -> Dict[str, Any]:
+        """按文本密度提取页面正文（content_selectors作为本站点的模板提示）"""
+        if not self._hints_seeded:
+            selectors = self.content_selectors.get('content')
+            if selectors:
+                self.content_extractor.hints.seed(HostRateLimiter.host_of(page_url), selectors)
+            self._hints_seeded = True
+        return self.content_extractor.extract(soup, page_url)
+    
+    def extract_text(self, item: BeautifulSoup, selector: str) -> str:
+        """提取条目中第一个匹配选择器的元素文本"""
+        elem = item.select_one(selector)
+        return elem.get_text(' ', strip=True) if elem else ''
+    
+    def extract_link(self, item: BeautifulSoup, page_url: str) -> Optional[str]:
+        """提取条目中的文章链接"""
+        link = item if item.name == 'a' and item.get('href') else item.select_one('a[href]')
+        return self.resolve_link(link, page_url)
+    
+    def resolve_link(self, link: Any, page_url: str) -> Optional[str]:
+        """把链接节点转换为有效的绝对URL（抓取和保存用原始URL，规范化形式只用作去重键）"""
+        if not link:
+            return None
+        
+        absolute_url = urljoin(page_url, link['href'])
+        return absolute_url if self.is_valid_link(absolute_url) else None
     
     def extract_articles(self, soup: BeautifulSoup, page_url: str) -> List[Dict[str, Any]]:
         """从网页提取文章（需要子类实现具体逻辑）"""
@@ -0,0 +1,108 @@
+"""
+爬取断点（翻页游标 + 已产出文章集合）
+
+worker在crawl()中途被杀掉时，重新投递的同一任务从最后一个断点继续翻页，
+而不是从第一页重新抓取。断点按 新闻源+crawl_id 保存，同一新闻源重叠运行的任务互不覆盖、互不删除。
+"""
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import redis
+
+from app.config import settings
+from app.core.logging import LoggerMixin
+from app.core.redis_client import get_redis_client, reset_redis_client
+
+
+class CheckpointStore(LoggerMixin):
+    """按新闻源和爬取ID保存爬取断点，支持 redis / memory 两种后端"""
+
+    REDIS_PREFIX = "news_engine:crawl_checkpoint:"
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        ttl: Optional[int] = None,
+        redis_client: Optional[redis.Redis] = None,
+    ):
+        super().__init__()
+        self.backend = backend or settings.CRAWLER_CHECKPOINT_BACKEND
+        self.ttl = ttl or settings.CRAWLER_CHECKPOINT_TTL
+        self._redis = redis_client
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _redis_client(self) -> Optional[redis.Redis]:
+        """获取Redis客户端（不可用时退化为本地内存）"""
+        if self.backend != 'redis':
+            return None
+        return self._redis or get_redis_client()
+
+    @staticmethod
+    def _key(source_id: str, crawl_id: str) -> str:
+        return f"{source_id}:{crawl_id}"
+
+    def save(self, source_id: str, crawl_id: str, state: Dict[str, Any]):
+        """保存断点"""
+        key = self._key(source_id, crawl_id)
+        state = dict(state, saved_at=time.time())
+        client = self._redis_client()
+        if client is not None:
+            try:
+                client.set(self.REDIS_PREFIX + key, json.dumps(state), ex=self.ttl)
+                return
+            except redis.RedisError as e:
+                self.log_warning(f"Checkpoint write failed: {str(e)}")
+                reset_redis_client()
+
+        with self._lock:
+            self._entries[key] = state
+
+    def load(self, source_id: str, crawl_id: str) -> Optional[Dict[str, Any]]:
+        """读取断点（过期返回None）"""
+        key = self._key(source_id, crawl_id)
+        client = self._redis_client()
+        if client is not None:
+            try:
+                raw = client.get(self.REDIS_PREFIX + key)
+                return json.loads(raw) if raw else None
+            except redis.RedisError as e:
+                self.log_warning(f"Checkpoint read failed: {str(e)}")
+                reset_redis_client()
+
+        with self._lock:
+            state = self._entries.get(key)
+            if state is not None and time.time() - state['saved_at'] > self.ttl:
+                del self._entries[key]
+                return None
+            return state
+
+    def delete(self, source_id: str, crawl_id: str):
+        """爬取正常结束后删除断点"""
+        key = self._key(source_id, crawl_id)
+        client = self._redis_client()
+        if client is not None:
+            try:
+                client.delete(self.REDIS_PREFIX + key)
+            except redis.RedisError as e:
+                self.log_warning(f"Checkpoint delete failed: {str(e)}")
+                reset_redis_client()
+
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+_checkpoint_store: Optional[CheckpointStore] = None
+_checkpoint_store_lock = threading.Lock()
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """获取进程级共享断点存储"""
+    global _checkpoint_store
+    if _checkpoint_store is None:
+        with _checkpoint_store_lock:
+            if _checkpoint_store is None:
+                _checkpoint_store = CheckpointStore()
+    return _checkpoint_store
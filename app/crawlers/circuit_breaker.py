@@ -0,0 +1,274 @@
+"""
+主机级熔断器
+
+closed: 正常请求，连续失败达到阈值后打开
+open: 直接拒绝请求（快速失败），冷却时间过后允许一个探测请求
+half_open: 探测请求成功则关闭，失败则重新打开
+状态存放在Redis中，所有worker共享；Redis不可用时退化为进程内状态。
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import redis
+
+from app.config import settings
+from app.core.logging import LoggerMixin
+from app.core.redis_client import get_redis_client, reset_redis_client
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# 失败计数 + closed/half_open -> open 在一个脚本内完成，多个worker同时失败时计数不丢失
+# KEYS: 状态hash, 熔断主机集合, 探测锁  ARGV: 主机, 失败URL, 阈值, 当前时间, 状态过期秒数
+_RECORD_FAILURE_LUA = """
+local failures = redis.call('HINCRBY', KEYS[1], 'failures', 1)
+redis.call('HSET', KEYS[1], 'probe_url', ARGV[2])
+local state = redis.call('HGET', KEYS[1], 'state')
+if not state then
+    state = 'closed'
+    redis.call('HSET', KEYS[1], 'state', state, 'opened_at', '0')
+end
+local opened = 0
+if state == 'half_open' or (state == 'closed' and failures >= tonumber(ARGV[3])) then
+    redis.call('HSET', KEYS[1], 'state', 'open', 'opened_at', ARGV[4])
+    redis.call('SADD', KEYS[2], ARGV[1])
+    redis.call('DEL', KEYS[3])
+    opened = 1
+end
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return {failures, opened}
+"""
+
+
+class CircuitBreaker(LoggerMixin):
+    """按主机记录连续失败次数和熔断状态，支持 redis / memory 两种后端"""
+
+    REDIS_PREFIX = "news_engine:circuit:"
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        failure_threshold: Optional[int] = None,
+        open_seconds: Optional[float] = None,
+        redis_client: Optional[redis.Redis] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        super().__init__()
+        self.backend = backend or settings.CRAWLER_CIRCUIT_BACKEND
+        self.failure_threshold = failure_threshold or settings.CRAWLER_CIRCUIT_FAILURE_THRESHOLD
+        self.open_seconds = open_seconds or settings.CRAWLER_CIRCUIT_OPEN_SECONDS
+        self._redis = redis_client
+        self.clock = clock
+
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        # (Redis客户端, 已注册的失败计数脚本)
+        self._failure_script: Optional[Any] = None
+
+        # 统计
+        self.rejected = 0
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return (urlsplit(url).hostname or '').lower()
+
+    def _redis_client(self) -> Optional[redis.Redis]:
+        """获取Redis客户端（不可用时退化为本地内存）"""
+        if self.backend != 'redis':
+            return None
+        return self._redis or get_redis_client()
+
+    # ---------- 状态读写 ----------
+
+    def _load(self, host: str) -> Dict[str, Any]:
+        client = self._redis_client()
+        if client is not None:
+            try:
+                raw = client.hgetall(self.REDIS_PREFIX + host)
+                return {
+                    'state': raw.get(b'state', CLOSED.encode()).decode(),
+                    'failures': int(raw.get(b'failures', 0)),
+                    'opened_at': float(raw.get(b'opened_at', 0)),
+                    'probe_url': raw.get(b'probe_url', b'').decode(),
+                }
+            except redis.RedisError as e:
+                self.log_warning(f"Circuit state read failed: {str(e)}")
+                reset_redis_client()
+
+        with self._lock:
+            return dict(self._states.get(host) or {'state': CLOSED, 'failures': 0, 'opened_at': 0.0, 'probe_url': ''})
+
+    def _store(self, host: str, state: Dict[str, Any]):
+        client = self._redis_client()
+        if client is not None:
+            try:
+                key = self.REDIS_PREFIX + host
+                pipe = client.pipeline()
+                if state['state'] == CLOSED and not state['failures']:
+                    pipe.delete(key)
+                    pipe.srem(self.REDIS_PREFIX + 'open', host)
+                else:
+                    pipe.hset(key, mapping={k: str(v) for k, v in state.items()})
+                    # 长时间没有请求的主机自动遗忘
+                    pipe.expire(key, int(self.open_seconds * 10))
+                    if state['state'] == CLOSED:
+                        pipe.srem(self.REDIS_PREFIX + 'open', host)
+                    else:
+                        pipe.sadd(self.REDIS_PREFIX + 'open', host)
+                pipe.execute()
+                return
+            except redis.RedisError as e:
+                self.log_warning(f"Circuit state write failed: {str(e)}")
+                reset_redis_client()
+
+        with self._lock:
+            if state['state'] == CLOSED and not state['failures']:
+                self._states.pop(host, None)
+            else:
+                self._states[host] = state
+
+    def _claim_probe(self, host: str) -> bool:
+        """冷却结束后只允许一个请求去探测（跨worker互斥）"""
+        client = self._redis_client()
+        if client is not None:
+            try:
+                return bool(client.set(self.REDIS_PREFIX + host + ':probe', 1, nx=True, ex=int(self.open_seconds)))
+            except redis.RedisError as e:
+                self.log_warning(f"Circuit probe claim failed: {str(e)}")
+                reset_redis_client()
+
+        with self._lock:
+            state = self._states.get(host)
+            if state is None:
+                return True
+            if state['state'] == CLOSED or self.clock() - state['opened_at'] < self.open_seconds:
+                return False
+            state['state'] = HALF_OPEN
+            state['opened_at'] = self.clock()
+            return True
+
+    # ---------- 对外接口 ----------
+
+    def allow(self, url: str) -> bool:
+        """是否允许请求该主机（open状态快速失败）"""
+        host = self.host_of(url)
+        state = self._load(host)
+
+        if state['state'] == CLOSED:
+            return True
+        if self.clock() - state['opened_at'] < self.open_seconds:
+            self.rejected += 1
+            return False
+        # 冷却结束（或上一个探测请求超时未返回），抢占探测名额
+        if self._claim_probe(host):
+            state.update(state=HALF_OPEN, opened_at=self.clock())
+            self._store(host, state)
+            self.log_info(f"Circuit half-open, probing host: {host}")
+            return True
+
+        self.rejected += 1
+        return False
+
+    def is_open(self, url: str) -> bool:
+        """主机是否处于熔断状态（调度时跳过）"""
+        state = self._load(self.host_of(url))
+        return state['state'] != CLOSED and self.clock() - state['opened_at'] < self.open_seconds
+
+    def record_success(self, url: str):
+        """请求成功（包括404等说明主机正常的响应），关闭熔断"""
+        host = self.host_of(url)
+        state = self._load(host)
+        if state['state'] == CLOSED and not state['failures']:
+            return
+        if state['state'] != CLOSED:
+            self.log_info(f"Circuit closed for host: {host}")
+        self._store(host, {'state': CLOSED, 'failures': 0, 'opened_at': 0.0, 'probe_url': ''})
+
+    def record_failure(self, url: str):
+        """请求失败（超时、连接错误、5xx），连续失败达到阈值或探测失败时打开熔断（计数和状态转换是原子的）"""
+        host = self.host_of(url)
+        client = self._redis_client()
+        if client is not None:
+            try:
+                if self._failure_script is None or self._failure_script[0] is not client:
+                    self._failure_script = (client, client.register_script(_RECORD_FAILURE_LUA))
+                key = self.REDIS_PREFIX + host
+                failures, opened = self._failure_script[1](
+                    keys=[key, self.REDIS_PREFIX + 'open', key + ':probe'],
+                    args=[host, url, self.failure_threshold, self.clock(), int(self.open_seconds * 10)],
+                )
+                if opened:
+                    self.log_warning(f"Circuit opened for host: {host}", failures=failures)
+                return
+            except redis.RedisError as e:
+                self.log_warning(f"Circuit failure record failed: {str(e)}")
+                reset_redis_client()
+
+        with self._lock:
+            state = self._states.setdefault(host, {'state': CLOSED, 'failures': 0, 'opened_at': 0.0, 'probe_url': ''})
+            state['failures'] += 1
+            state['probe_url'] = url
+            if state['state'] == HALF_OPEN or (state['state'] == CLOSED and state['failures'] >= self.failure_threshold):
+                self.log_warning(f"Circuit opened for host: {host}", failures=state['failures'])
+                state.update(state=OPEN, opened_at=self.clock())
+
+    def open_hosts(self) -> List[str]:
+        """当前处于熔断状态的主机"""
+        client = self._redis_client()
+        if client is not None:
+            try:
+                return sorted(h.decode() for h in client.smembers(self.REDIS_PREFIX + 'open'))
+            except redis.RedisError as e:
+                self.log_warning(f"Circuit host list failed: {str(e)}")
+                reset_redis_client()
+        with self._lock:
+            return sorted(h for h, s in self._states.items() if s['state'] != CLOSED)
+
+    def probe_open_hosts(self, fetch: Callable[[str], Any]) -> Dict[str, str]:
+        """对冷却结束的熔断主机发送探测请求，返回 {主机: 探测后状态}"""
+        results = {}
+        for host in self.open_hosts():
+            state = self._load(host)
+            if state['state'] == CLOSED:
+                continue
+            probe_url = state['probe_url'] or f"https://{host}/"
+            if not self.allow(probe_url):
+                results[host] = state['state']
+                continue
+            try:
+                response = fetch(probe_url)
+                healthy = response.status_code < 500 and response.status_code != 429
+            except Exception as e:
+                self.log_warning(f"Circuit probe failed for host {host}: {str(e)}")
+                healthy = False
+            if healthy:
+                self.record_success(probe_url)
+            else:
+                self.record_failure(probe_url)
+            results[host] = self._load(host)['state']
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取熔断统计"""
+        return {
+            'backend': self.backend,
+            'open_hosts': self.open_hosts(),
+            'rejected': self.rejected,
+        }
+
+
+_circuit_breaker: Optional[CircuitBreaker] = None
+_circuit_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """获取进程级共享熔断器"""
+    global _circuit_breaker
+    if _circuit_breaker is None:
+        with _circuit_breaker_lock:
+            if _circuit_breaker is None:
+                _circuit_breaker = CircuitBreaker()
+    return _circuit_breaker
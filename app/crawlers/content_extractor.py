@@ -0,0 +1,236 @@
+"""
+正文提取
+
+在lxml树上按段落文本密度和链接密度给容器打分，选出正文所在的块（readability思路），
+不依赖newspaper3k，也不发起任何网络请求。
+每个站点先尝试模板提示（新闻源配置的content_selectors + 以前提取成功的容器），
+提示命中且通过密度校验时跳过全树打分。
+"""
+import copy
+import re
+import threading
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import lxml.html
+
+from app.crawlers import normalization
+from app.crawlers.parsers import LxmlNode, compile_css
+
+# 不参与打分和正文输出的元素
+NOISE_TAGS = ('script', 'style', 'noscript', 'iframe', 'form', 'nav', 'header', 'footer', 'aside',
+              'select', 'button', 'textarea', 'svg')
+
+PARAGRAPH_TAGS = ('p', 'pre', 'blockquote')
+
+# 段落少于该字数不计分（短句、图注、版权行）
+MIN_PARAGRAPH_LENGTH = 10
+
+# 正文少于该字数视为提取失败
+MIN_CONTENT_LENGTH = 20
+
+# 链接文字占比超过该值的段落/容器视为导航、推荐列表
+MAX_LINK_DENSITY = 0.5
+
+_PUNCTUATION_RE = re.compile(r'[，。！？；、,.!?;]')
+_SIMPLE_NAME_RE = re.compile(r'^[A-Za-z][\w-]*$')
+
+# 每个站点最多记住的模板提示数
+MAX_HINTS_PER_HOST = 4
+
+
+def _text_length(element: Any) -> int:
+    return len(''.join(element.text_content().split()))
+
+
+def link_density(element: Any, text_length: Optional[int] = None) -> float:
+    """链接文字占元素文字的比例"""
+    total = _text_length(element) if text_length is None else text_length
+    if not total:
+        return 1.0
+    linked = sum(_text_length(a) for a in element.iter('a'))
+    return min(1.0, linked / total)
+
+
+def container_signature(element: Any) -> Optional[str]:
+    """容器的可复用选择器（tag#id 或 tag.class），无法稳定定位时返回None"""
+    tag = element.tag
+    if not isinstance(tag, str) or tag in ('html', 'body'):
+        return None
+    element_id = element.get('id', '')
+    if _SIMPLE_NAME_RE.match(element_id):
+        return f"{tag}#{element_id}"
+    for cls in element.get('class', '').split():
+        if _SIMPLE_NAME_RE.match(cls):
+            return f"{tag}.{cls}"
+    return None
+
+
+class TemplateHints:
+    """按站点保存正文容器选择器：配置的在后，最近提取成功的在前"""
+
+    def __init__(self, max_per_host: int = MAX_HINTS_PER_HOST):
+        self.max_per_host = max_per_host
+        self._learned: Dict[str, List[str]] = {}
+        self._configured: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url: Optional[str]) -> str:
+        return (urlsplit(url).hostname or '').lower() if url else ''
+
+    def seed(self, host: str, selectors: str):
+        """登记新闻源配置的正文选择器（逗号分隔）"""
+        parts = [s.strip() for s in selectors.split(',') if s.strip()]
+        with self._lock:
+            self._configured[host] = parts
+
+    def learn(self, host: str, selector: str):
+        """记录本次提取成功的容器"""
+        with self._lock:
+            learned = self._learned.setdefault(host, [])
+            if selector in learned:
+                learned.remove(selector)
+            learned.insert(0, selector)
+            del learned[self.max_per_host:]
+
+    def selectors_for(self, host: str) -> List[str]:
+        with self._lock:
+            learned = self._learned.get(host, [])
+            configured = [s for s in self._configured.get(host, []) if s not in learned]
+            return learned + configured
+
+
+class ContentExtractor:
+    """基于文本密度的正文提取器"""
+
+    def __init__(self, hints: Optional[TemplateHints] = None):
+        self.hints = hints or TemplateHints()
+
+        # 统计
+        self.hint_hits = 0
+        self.density_runs = 0
+        self.failures = 0
+
+    def to_tree(self, page: Any) -> Any:
+        """得到可修改的lxml树（传入的解析树会被复制，不影响调用方后续使用）"""
+        if isinstance(page, (str, bytes)):
+            if isinstance(page, str) and page.lstrip().startswith('<?xml'):
+                page = page.encode('utf-8')
+            return lxml.html.document_fromstring(page)
+        if isinstance(page, LxmlNode):
+            return copy.deepcopy(page.element)
+        # 其他解析后端的节点序列化后重新解析
+        return lxml.html.document_fromstring(str(page))
+
+    def extract(self, page: Any, url: Optional[str] = None) -> Dict[str, Any]:
+        """提取标题和正文，返回 {'title', 'content', 'selector', 'method'}"""
+        tree = self.to_tree(page)
+        title = self.extract_title(tree)
+        for noise in list(tree.iter(*NOISE_TAGS)):
+            noise.drop_tree()
+        host = self.hints.host_of(url)
+
+        for selector in self.hints.selectors_for(host):
+            matches = compile_css(selector)(tree)
+            if not matches:
+                continue
+            content = self.container_text(matches[0])
+            if len(content) >= MIN_CONTENT_LENGTH and link_density(matches[0]) < MAX_LINK_DENSITY:
+                self.hint_hits += 1
+                return {'title': title, 'content': content, 'selector': selector, 'method': 'hint'}
+
+        self.density_runs += 1
+        best = self.best_container(tree)
+        content = self.container_text(best) if best is not None else ''
+        if len(content) < MIN_CONTENT_LENGTH:
+            self.failures += 1
+            return {'title': title, 'content': '', 'selector': None, 'method': 'density'}
+
+        selector = container_signature(best)
+        if selector and host:
+            self.hints.learn(host, selector)
+        return {'title': title, 'content': content, 'selector': selector, 'method': 'density'}
+
+    @staticmethod
+    def extract_title(tree: Any) -> str:
+        for tag in ('h1', 'title'):
+            for element in tree.iter(tag):
+                text = normalization.collapse_whitespace(element.text_content())
+                if text:
+                    return text
+        return ''
+
+    def best_container(self, tree: Any) -> Optional[Any]:
+        """段落得分累加到父容器（祖父容器计一半），再按容器链接密度折算，取最高分"""
+        scores: Dict[Any, float] = {}
+        for paragraph in tree.iter(*PARAGRAPH_TAGS):
+            text = paragraph.text_content()
+            length = len(''.join(text.split()))
+            if length < MIN_PARAGRAPH_LENGTH or link_density(paragraph, length) > MAX_LINK_DENSITY:
+                continue
+            score = 1 + len(_PUNCTUATION_RE.findall(text)) + min(length // 50, 3)
+            parent = paragraph.getparent()
+            if parent is None:
+                continue
+            scores[parent] = scores.get(parent, 0.0) + score
+            grandparent = parent.getparent()
+            if grandparent is not None:
+                scores[grandparent] = scores.get(grandparent, 0.0) + score / 2
+
+        if not scores:
+            return self.densest_block(tree)
+
+        best, best_score = None, 0.0
+        for element, score in scores.items():
+            score *= 1 - link_density(element)
+            if score > best_score:
+                best, best_score = element, score
+        return best
+
+    @staticmethod
+    def densest_block(tree: Any) -> Optional[Any]:
+        """页面没有段落标签时，取按链接密度折算后文字最多的块"""
+        best, best_length = None, 0
+        for element in tree.iter('div', 'td', 'article', 'section'):
+            length = _text_length(element)
+            if length <= best_length:
+                continue
+            density = link_density(element, length)
+            if density < MAX_LINK_DENSITY and length * (1 - density) > best_length:
+                best, best_length = element, int(length * (1 - density))
+        return best
+
+    @staticmethod
+    def container_text(container: Any) -> str:
+        """容器中的段落文本（逐段换行），没有段落时取容器全文"""
+        paragraphs = []
+        for paragraph in container.iter(*PARAGRAPH_TAGS):
+            text = normalization.collapse_whitespace(paragraph.text_content())
+            if text and link_density(paragraph) <= MAX_LINK_DENSITY:
+                paragraphs.append(text)
+        if paragraphs:
+            return '\n'.join(paragraphs)
+        return normalization.collapse_whitespace(container.text_content())
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取统计"""
+        return {
+            'hint_hits': self.hint_hits,
+            'density_runs': self.density_runs,
+            'failures': self.failures,
+        }
+
+
+_content_extractor: Optional[ContentExtractor] = None
+_content_extractor_lock = threading.Lock()
+
+
+def get_content_extractor() -> ContentExtractor:
+    """获取进程级共享正文提取器（模板提示在同一进程的所有爬虫之间共享）"""
+    global _content_extractor
+    if _content_extractor is None:
+        with _content_extractor_lock:
+            if _content_extractor is None:
+                _content_extractor = ContentExtractor()
+    return _content_extractor
@@ -0,0 +1,244 @@
+"""
+详情页抓取阶段
+
+列表页爬虫产出的文章只有摘要。本模块把文章URL放入有界队列，由固定数量的协程并发
+抓取详情页（受全局/单主机并发上限和主机限速约束），提取正文后批量写回文章存储。
+队列满时提交方等待，列表页翻页不会无限领先于详情抓取，也不会被详情抓取串行阻塞。
+"""
+import asyncio
+import inspect
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from bs4 import BeautifulSoup
+
+from app.config import settings
+from app.core.logging import LoggerMixin
+from app.crawlers.async_fetcher import AsyncFetcher
+from app.crawlers.base_crawler import BaseCrawler
+from app.crawlers.content_extractor import ContentExtractor, TemplateHints, get_content_extractor
+from app.crawlers.registry import find_configured_source, get_crawler_registry
+from app.storage.article_store import ArticleStore, ArticleStoreError, get_article_store
+
+_DONE = object()
+
+
+class DetailPageCrawler(BaseCrawler):
+    """详情页抓取器（复用robots、熔断、重试和主机限速，不翻页、不做条件请求和去重）"""
+
+    def __init__(self, **kwargs):
+        super().__init__('detail', kwargs.pop('source_url', ''), **kwargs)
+        self.http_cache = None
+        self.frontier = None
+        self.checkpoints = None
+
+    def extract_articles(self, soup: BeautifulSoup, page_url: str) -> List[Dict[str, Any]]:
+        """详情页不提取文章列表"""
+        return []
+
+    def get_next_page_url(self, soup: BeautifulSoup, current_url: str) -> Optional[str]:
+        """详情页没有翻页"""
+        return None
+
+
+class DetailFetcher(LoggerMixin):
+    """详情页抓取阶段: 有界队列 + 固定数量的抓取协程 + 批量写回"""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        extractor: Optional[ContentExtractor] = None,
+        store: Optional[ArticleStore] = None,
+        sink: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+        **crawler_kwargs
+    ):
+        super().__init__()
+        self.workers = workers or settings.CRAWLER_DETAIL_WORKERS
+        self.queue_size = queue_size or settings.CRAWLER_DETAIL_QUEUE_SIZE
+        self.batch_size = batch_size or settings.CRAWLER_DETAIL_BATCH_SIZE
+        self.extractor = extractor or get_content_extractor()
+        # 默认写回文章存储，sink可以替换为其他批量写入器（普通函数或协程函数）
+        self.sink = sink or (store or get_article_store()).update_many
+        self.crawler = DetailPageCrawler(**crawler_kwargs)
+
+        # 运行状态（事件循环内创建）
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._pending: List[Dict[str, Any]] = []
+        # 文章存储不可用时的异常（没有写回的批次由任务整体重试）
+        self.store_error: Optional[ArticleStoreError] = None
+        # 新闻源ID -> 正文选择器，已登记模板提示的主机
+        self._source_selectors: Dict[str, Optional[str]] = {}
+        self._seeded_hosts: Set[str] = set()
+
+        # 统计
+        self.submitted = 0
+        self.fetched = 0
+        self.failed = 0
+        self.empty = 0
+        self.written = 0
+
+    def start(self, fetcher: AsyncFetcher):
+        """启动抓取协程"""
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._work(fetcher)) for _ in range(self.workers)]
+
+    async def submit(self, article: Dict[str, Any]):
+        """提交一篇文章（队列满时等待），可直接作为crawl_async的sink"""
+        if self._queue is None:
+            raise RuntimeError("DetailFetcher.start() must be called before submit()")
+        await self._queue.put(article)
+        self.submitted += 1
+
+    async def join(self):
+        """等待队列中的文章全部处理完，写回剩余批次"""
+        try:
+            for _ in self._tasks:
+                await self._queue.put(_DONE)
+            await asyncio.gather(*self._tasks)
+            await self._flush()
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            self._tasks = []
+            self._queue = None
+
+    async def run(self, articles: Iterable[Dict[str, Any]], fetcher: Optional[AsyncFetcher] = None) -> Dict[str, Any]:
+        """抓取一批文章的详情页"""
+        own_fetcher = fetcher is None
+        if own_fetcher:
+            fetcher = AsyncFetcher(timeout=self.crawler.timeout, headers=self.crawler.headers)
+
+        try:
+            self.start(fetcher)
+            try:
+                for article in articles:
+                    await self.submit(article)
+            finally:
+                await self.join()
+        finally:
+            if own_fetcher:
+                await fetcher.aclose()
+
+        return self.get_stats()
+
+    async def _work(self, fetcher: AsyncFetcher):
+        while True:
+            article = await self._queue.get()
+            if article is _DONE:
+                return
+            try:
+                # 先等待结果再取批次列表，其他协程可能在等待期间已经写回并替换了批次
+                detail = await self.fetch_detail(article, fetcher)
+                self._pending.append(detail)
+            except Exception as e:
+                # 单篇文章解析异常不能让抓取协程退出，否则提交方会一直等待队列；
+                # 仍然写回并标记为失败，之后可以按detail_status找出来重试
+                self.failed += 1
+                self.log_error(f"Failed to process detail page {article.get('url')}: {str(e)}")
+                self._pending.append(dict(article, detail_status='failed'))
+            if len(self._pending) >= self.batch_size:
+                await self._flush()
+
+    async def _flush(self):
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            outcome = self.sink(batch)
+            if inspect.isawaitable(outcome):
+                await outcome
+            self.written += len(batch)
+        except Exception as e:
+            if isinstance(e, ArticleStoreError) and self.store_error is None:
+                self.store_error = e
+            self.log_error(f"Detail sink error: {str(e)}", batch_size=len(batch))
+            self.crawler.errors.append({
+                'type': 'sink_error',
+                'error': str(e),
+                'articles': len(batch)
+            })
+
+    async def fetch_detail(self, article: Dict[str, Any], fetcher: AsyncFetcher) -> Dict[str, Any]:
+        """抓取单篇文章的详情页并补全正文（失败时保留列表页摘要）"""
+        article = dict(article)
+        url = article.get('url')
+        response = await self.crawler.get_page_async(url, fetcher) if url else None
+        if response is None:
+            self.failed += 1
+            article['detail_status'] = 'failed'
+            return article
+
+        # 原始字节按EncodingDetector识别的编码（BOM → 响应头 → meta → 主机缓存）解码，
+        # 不使用httpx自己的猜测；正文提取直接在lxml树上进行，不经过爬虫的解析后端
+        encoding = response.encoding or self.crawler.encoding_detector.apply(url, response)
+        self.seed_hints(article)
+        body = self.extractor.extract(response.content.decode(encoding, errors='replace'), url)['content']
+        self.fetched += 1
+        if body:
+            article.setdefault('summary', article.get('content', ''))
+            article['content'] = body
+            article['detail_status'] = 'ok'
+        else:
+            self.empty += 1
+            article['detail_status'] = 'empty'
+        article['detail_fetched_at'] = datetime.utcnow().isoformat()
+        return article
+
+    def seed_hints(self, article: Dict[str, Any]):
+        """用文章所属新闻源的content_selectors登记该主机的模板提示（每个主机一次）"""
+        host = TemplateHints.host_of(article.get('url'))
+        if not host or host in self._seeded_hosts:
+            return
+        self._seeded_hosts.add(host)
+        selectors = self.source_selectors(article.get('source_id'))
+        if selectors:
+            self.extractor.hints.seed(host, selectors)
+
+    def source_selectors(self, source_id: Optional[str]) -> Optional[str]:
+        """按新闻源ID从新闻源配置和爬虫注册表解析正文选择器（结果按新闻源缓存）"""
+        if not source_id:
+            return None
+        if source_id not in self._source_selectors:
+            source = find_configured_source(source_id)
+            self._source_selectors[source_id] = (
+                get_crawler_registry().content_selectors(source) if source else None
+            )
+        return self._source_selectors[source_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计"""
+        return {
+            'submitted': self.submitted,
+            'fetched': self.fetched,
+            'failed': self.failed,
+            'empty': self.empty,
+            'written': self.written,
+            'errors': self.crawler.errors,
+        }
+
+
+async def crawl_with_details(
+    crawler: BaseCrawler,
+    detail_fetcher: DetailFetcher,
+    fetcher: Optional[AsyncFetcher] = None
+) -> Dict[str, Any]:
+    """列表页爬取与详情页抓取流水线并行（共享同一个抓取器的并发上限）"""
+    own_fetcher = fetcher is None
+    if own_fetcher:
+        fetcher = AsyncFetcher(timeout=crawler.timeout, headers=crawler.headers)
+
+    try:
+        detail_fetcher.start(fetcher)
+        try:
+            result = await crawler.crawl_async(fetcher, sink=detail_fetcher.submit)
+        finally:
+            await detail_fetcher.join()
+    finally:
+        if own_fetcher:
+            await fetcher.aclose()
+
+    result['details'] = detail_fetcher.get_stats()
+    return result
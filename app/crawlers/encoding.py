@@ -0,0 +1,167 @@
+"""
+响应编码识别
+
+按 BOM -> Content-Type头 -> 开头若干字节中的meta charset -> 同一主机上次识别结果 的顺序
+确定编码，不对整个响应体做字符集猜测；识别出的编码直接交给解析后端，只解码一次。
+GBK / GB2312 统一按其超集 GB18030 解码，避免生僻字变成乱码。
+"""
+import codecs
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from app.config import settings
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+
+_HEADER_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+
+# <meta charset="gbk"> / <meta http-equiv="Content-Type" content="text/html; charset=gb2312">
+# / <?xml version="1.0" encoding="gbk"?>
+_META_CHARSET_RE = re.compile(
+    rb'<meta[^>]+?charset\s*=\s*["\']?\s*([\w.:-]+)'
+    rb'|<\?xml[^>]+?encoding\s*=\s*["\']([\w.:-]+)',
+    re.I
+)
+
+# 这些编码都是GB18030的子集
+_GB_FAMILY = {'gbk', 'gb2312', 'gb18030', 'euc_cn', 'hz'}
+
+# Content-Type头中不可信的charset
+_UNRELIABLE_HEADER_CHARSETS = {'iso8859-1', 'cp1252'}
+
+# 没有声明且不是合法UTF-8时使用的编码（中文门户最常见）
+FALLBACK_ENCODING = 'gb18030'
+
+# 主机编码缓存的最大条目数
+MAX_CACHED_HOSTS = 4096
+
+
+def normalize_encoding(name: Optional[str]) -> Optional[str]:
+    """规范化编码名（未知编码返回None）"""
+    if not name:
+        return None
+    try:
+        canonical = codecs.lookup(name.strip().strip('"\'')).name
+    except LookupError:
+        return None
+    if canonical in _GB_FAMILY:
+        return 'gb18030'
+    if canonical == 'ascii':
+        # ASCII是UTF-8的子集
+        return 'utf-8'
+    return canonical
+
+
+def charset_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    """从Content-Type头中取charset"""
+    if not content_type:
+        return None
+    match = _HEADER_CHARSET_RE.search(content_type)
+    return normalize_encoding(match.group(1)) if match else None
+
+
+def sniff_meta_charset(head: bytes) -> Optional[str]:
+    """在文档开头查找meta charset或XML声明"""
+    match = _META_CHARSET_RE.search(head)
+    if not match:
+        return None
+    return normalize_encoding((match.group(1) or match.group(2)).decode('ascii', errors='ignore'))
+
+
+def looks_like_utf8(head: bytes) -> bool:
+    """开头部分是否是合法UTF-8（末尾被截断的多字节字符不算错误）"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        decoder.decode(head, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+class EncodingDetector:
+    """编码识别器，按主机缓存识别结果"""
+
+    def __init__(self, sniff_bytes: Optional[int] = None, max_hosts: int = MAX_CACHED_HOSTS):
+        self.sniff_bytes = sniff_bytes or settings.CRAWLER_ENCODING_SNIFF_BYTES
+        self.max_hosts = max_hosts
+        self._hosts: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.sources = Counter()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return (urlsplit(url).hostname or '').lower()
+
+    def detect(self, url: str, content: bytes, content_type: Optional[str] = None) -> Tuple[str, str]:
+        """返回 (编码, 来源)，来源为 bom / header / meta / host / utf8 / fallback"""
+        head = content[:self.sniff_bytes]
+        host = self.host_of(url)
+
+        for bom, encoding in _BOMS:
+            if head.startswith(bom):
+                return self._record(host, encoding, 'bom')
+
+        encoding = charset_from_content_type(content_type)
+        # 服务器默认配置常把中文页面声明为ISO-8859-1，这种声明不可信，继续看meta
+        if encoding is not None and encoding not in _UNRELIABLE_HEADER_CHARSETS:
+            return self._record(host, encoding, 'header')
+
+        encoding = sniff_meta_charset(head)
+        if encoding is not None:
+            return self._record(host, encoding, 'meta')
+
+        is_utf8 = looks_like_utf8(head)
+        with self._lock:
+            encoding = self._hosts.get(host)
+        if encoding is not None and (encoding != 'utf-8' or is_utf8):
+            self.sources['host'] += 1
+            return encoding, 'host'
+
+        # 校验/兜底得到的编码不写入主机缓存，只缓存站点明确声明过的编码
+        return self._record(host, 'utf-8' if is_utf8 else FALLBACK_ENCODING, 'utf8' if is_utf8 else 'fallback',
+                            remember=False)
+
+    def _record(self, host: str, encoding: str, source: str, remember: bool = True) -> Tuple[str, str]:
+        self.sources[source] += 1
+        if host and remember:
+            with self._lock:
+                if self._hosts.get(host) != encoding:
+                    if host not in self._hosts and len(self._hosts) >= self.max_hosts:
+                        # 淘汰最早记录的主机
+                        del self._hosts[next(iter(self._hosts))]
+                    self._hosts[host] = encoding
+        return encoding, source
+
+    def apply(self, url: str, response: Any) -> str:
+        """识别响应编码并写回 response.encoding（之后的 .text 只按该编码解码一次）"""
+        encoding, _ = self.detect(url, response.content, response.headers.get('Content-Type'))
+        response.encoding = encoding
+        return encoding
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计"""
+        return {
+            'hosts': len(self._hosts),
+            'sources': dict(self.sources),
+        }
+
+
+_detector: Optional[EncodingDetector] = None
+_detector_lock = threading.Lock()
+
+
+def get_encoding_detector() -> EncodingDetector:
+    """获取进程级共享编码识别器"""
+    global _detector
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                _detector = EncodingDetector()
+    return _detector
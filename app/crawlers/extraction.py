@@ -0,0 +1,147 @@
+"""
+编译后的字段提取计划
+
+把 article_selectors 中逗号分隔的选择器预先编译成按标签/类名索引的匹配表，
+对每个新闻条目只遍历一次子树就能取出全部字段。
+无法编译的复杂选择器（后代组合器、伪类等）退回 select_one。
+"""
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from bs4 import Tag
+
+from app.crawlers.parsers import LxmlNode
+
+# tag / .class / tag.class / tag[attr] / .class[attr]
+_SIMPLE_SELECTOR_RE = re.compile(
+    r'^(?P<tag>[a-zA-Z][\w-]*)?(?P<classes>(?:\.[\w-]+)*)(?:\[(?P<attr>[\w-]+)\])?$'
+)
+
+
+class SimpleSelector:
+    """单个简单选择器"""
+
+    __slots__ = ('field', 'tag', 'classes', 'attr')
+
+    def __init__(self, field: str, tag: Optional[str], classes: Tuple[str, ...], attr: Optional[str]):
+        self.field = field
+        self.tag = tag
+        self.classes = classes
+        self.attr = attr
+
+    def matches(self, tag: str, classes: Tuple[str, ...], node: Any) -> bool:
+        if self.tag is not None and self.tag != tag:
+            return False
+        for cls in self.classes:
+            if cls not in classes:
+                return False
+        if self.attr is not None and not node.get(self.attr):
+            return False
+        return True
+
+
+def parse_simple_selector(field: str, selector: str) -> Optional[SimpleSelector]:
+    """解析简单选择器，复杂选择器返回None"""
+    match = _SIMPLE_SELECTOR_RE.match(selector.strip())
+    if not match or not any(match.group(g) for g in ('tag', 'classes', 'attr')):
+        return None
+    classes = tuple(c for c in match.group('classes').split('.') if c)
+    tag = match.group('tag').lower() if match.group('tag') else None
+    return SimpleSelector(field, tag, classes, match.group('attr'))
+
+
+def _class_names(value: Any) -> Tuple[str, ...]:
+    """统一类名格式（bs4返回列表，lxml/selectolax返回字符串）"""
+    if not value:
+        return ()
+    if isinstance(value, str):
+        return tuple(value.split())
+    return tuple(value)
+
+
+def _iter_elements(item: Any):
+    """按文档顺序遍历条目的所有后代元素，返回 (元素迭代器, 包装函数)"""
+    if isinstance(item, Tag):
+        return item.find_all(True), None
+    if isinstance(item, LxmlNode):
+        # 直接遍历原生lxml元素，只对命中的元素做包装
+        return item.element.iterdescendants(), LxmlNode
+    return item.iter_elements(), None
+
+
+class ExtractionPlan:
+    """字段提取计划: 一次遍历取出所有字段的首个匹配节点"""
+
+    def __init__(self, selectors: Dict[str, str]):
+        self.fields = list(selectors)
+        self.by_tag: Dict[str, List[SimpleSelector]] = {}
+        self.by_class: Dict[str, List[SimpleSelector]] = {}
+        self.by_attr: List[SimpleSelector] = []
+        self.fallback: Dict[str, str] = {}
+
+        for field, selector_list in selectors.items():
+            compiled = [parse_simple_selector(field, part) for part in selector_list.split(',')]
+            if not compiled or any(c is None for c in compiled):
+                self.fallback[field] = selector_list
+                continue
+            for selector in compiled:
+                if selector.classes:
+                    # 按第一个类名建索引，其余条件在matches中检查
+                    self.by_class.setdefault(selector.classes[0], []).append(selector)
+                elif selector.tag:
+                    self.by_tag.setdefault(selector.tag, []).append(selector)
+                else:
+                    self.by_attr.append(selector)
+
+        self.indexed_fields = [f for f in self.fields if f not in self.fallback]
+
+    def extract(self, item: Any) -> Dict[str, Any]:
+        """返回 {字段: 首个匹配节点或None}"""
+        found: Dict[str, Any] = dict.fromkeys(self.fields)
+        remaining = len(self.indexed_fields)
+        by_tag = self.by_tag
+        by_class = self.by_class
+        by_attr = self.by_attr
+
+        if remaining:
+            elements, wrap = _iter_elements(item)
+            for element in elements:
+                if wrap is not None:
+                    tag = element.tag
+                    if not isinstance(tag, str):
+                        # 跳过注释和处理指令
+                        continue
+                else:
+                    tag = element.name
+
+                classes = _class_names(element.get('class'))
+                candidates = by_tag.get(tag, ())
+                for cls in classes:
+                    extra = by_class.get(cls)
+                    if extra:
+                        candidates = [*candidates, *extra]
+                if by_attr:
+                    candidates = [*candidates, *by_attr]
+
+                for selector in candidates:
+                    if found[selector.field] is None and selector.matches(tag, classes, element):
+                        found[selector.field] = wrap(element) if wrap is not None else element
+                        remaining -= 1
+                if remaining == 0:
+                    break
+
+        for field, selector_list in self.fallback.items():
+            found[field] = item.select_one(selector_list)
+
+        return found
+
+
+@lru_cache(maxsize=128)
+def _compile_plan(selector_items: Tuple[Tuple[str, str], ...]) -> ExtractionPlan:
+    return ExtractionPlan(dict(selector_items))
+
+
+def get_extraction_plan(selectors: Dict[str, str]) -> ExtractionPlan:
+    """获取（按选择器内容缓存的）提取计划，同一爬虫类/新闻源的所有实例共享"""
+    return _compile_plan(tuple(selectors.items()))
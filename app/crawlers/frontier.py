@@ -0,0 +1,543 @@
+"""
+已见URL过滤器（按时间轮转的可扩展Bloom过滤器）
+
+每个轮转周期一代过滤器，只保留最近 N 代；每代由容量翻倍、误判率减半的分片组成，
+分片写满后自动追加新分片。误判率上界:
+    每代所有分片误判率之和 < error_rate / N，N 代合计 < error_rate
+位数组存放在 Redis 位图（多个worker共享）、本地mmap文件或进程内存中。
+分片是否写满的判断和写入必须是一步: Redis在一个脚本内完成，mmap文件在文件锁内完成
+（prefork的多个进程共享同一目录），否则并发写入会把分片写过容量，误判率上界不再成立。
+"""
+import atexit
+import fcntl
+import glob
+import hashlib
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import redis
+
+from app.config import settings
+from app.core.logging import LoggerMixin
+from app.core.redis_client import get_redis_client, reset_redis_client
+
+HashPair = Tuple[int, int]
+
+# 分片容量增长倍数、误判率收紧比例
+_GROWTH = 2
+_TIGHTENING = 0.5
+
+# 按当前分片的实际条数写入一批URL，写满时切换到下一个分片（位置由调用方算好，Lua没有64位整数）
+# KEYS: meta哈希, 分片base..base+n-1的位图
+# ARGV: base, ttl, n, 条数, n个分片容量, n个分片哈希数, 每条URL在n个分片上的位置
+# 当前分片不在base..base+n-1内或剩余容量不够时不写入，返回0，由调用方重新读取条数后重试
+_ADD_MANY_LUA = """
+local meta = KEYS[1]
+local base = tonumber(ARGV[1])
+local ttl = tonumber(ARGV[2])
+local slices = tonumber(ARGV[3])
+local total = tonumber(ARGV[4])
+local caps, ks, stride = {}, {}, 0
+for j = 1, slices do
+    caps[j] = tonumber(ARGV[4 + j])
+    ks[j] = tonumber(ARGV[4 + slices + j])
+    stride = stride + ks[j]
+end
+local current = 0
+for _, field in ipairs(redis.call('HKEYS', meta)) do
+    current = math.max(current, tonumber(field))
+end
+local j = current - base + 1
+if j < 1 or j > slices then
+    return 0
+end
+local count = tonumber(redis.call('HGET', meta, tostring(current)) or '0')
+local room = caps[j] - count
+for x = j + 1, slices do
+    room = room + caps[x]
+end
+if room < total then
+    return 0
+end
+local start = 5 + 2 * slices
+local added = 0
+for i = 1, total do
+    if count >= caps[j] then
+        redis.call('HINCRBY', meta, tostring(base + j - 1), added)
+        redis.call('EXPIRE', KEYS[j + 1], ttl)
+        j = j + 1
+        count = 0
+        added = 0
+    end
+    local offset = start + (i - 1) * stride
+    for x = 1, j - 1 do
+        offset = offset + ks[x]
+    end
+    for p = 0, ks[j] - 1 do
+        redis.call('SETBIT', KEYS[j + 1], tonumber(ARGV[offset + p]), 1)
+    end
+    count = count + 1
+    added = added + 1
+end
+redis.call('HINCRBY', meta, tostring(base + j - 1), added)
+redis.call('EXPIRE', KEYS[j + 1], ttl)
+redis.call('EXPIRE', meta, ttl)
+return 1
+"""
+
+# 读取到的条数过期时（其他worker同时写入）的重试次数
+_ADD_MANY_ATTEMPTS = 5
+
+
+def bloom_parameters(capacity: int, error_rate: float) -> Tuple[int, int]:
+    """根据容量和误判率计算位数m和哈希函数个数k"""
+    num_bits = int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+    num_hashes = max(1, int(round(num_bits / capacity * math.log(2))))
+    return num_bits, num_hashes
+
+
+def hash_pair(key: str) -> HashPair:
+    """一次blake2b得到两个64位哈希（双重哈希构造k个位置）"""
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+
+class SliceSpec:
+    """分片参数（第i个分片的容量和误判率由基础参数推导，无需持久化）"""
+
+    __slots__ = ('capacity', 'error_rate', 'num_bits', 'num_hashes')
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits, self.num_hashes = bloom_parameters(capacity, error_rate)
+
+    @classmethod
+    def for_index(cls, index: int, capacity: int, error_rate: float) -> 'SliceSpec':
+        return cls(capacity * _GROWTH ** index, error_rate * (1 - _TIGHTENING) * _TIGHTENING ** index)
+
+    def positions(self, hashes: HashPair) -> List[int]:
+        h1, h2 = hashes
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+
+class BloomSlice:
+    """本地分片，位数组为bytearray或mmap文件（文件头8字节记录已写入条数）"""
+
+    HEADER = struct.Struct('<Q')
+
+    def __init__(self, spec: SliceSpec, path: Optional[str] = None):
+        self.spec = spec
+        self.path = path
+        size = self.HEADER.size + (spec.num_bits + 7) // 8
+        self._file = None
+
+        if path is None:
+            self.buffer = bytearray(size)
+        else:
+            exists = os.path.exists(path) and os.path.getsize(path) == size
+            self._file = open(path, 'r+b' if exists else 'w+b')
+            if not exists:
+                self._file.truncate(size)
+            self.buffer = mmap.mmap(self._file.fileno(), size)
+
+    @property
+    def count(self) -> int:
+        return self.HEADER.unpack_from(self.buffer, 0)[0]
+
+    @count.setter
+    def count(self, value: int):
+        self.HEADER.pack_into(self.buffer, 0, value)
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.spec.capacity
+
+    def contains(self, hashes: HashPair) -> bool:
+        buffer = self.buffer
+        offset = self.HEADER.size
+        for position in self.spec.positions(hashes):
+            if not buffer[offset + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+    def add(self, hashes: HashPair):
+        buffer = self.buffer
+        offset = self.HEADER.size
+        for position in self.spec.positions(hashes):
+            buffer[offset + (position >> 3)] |= 1 << (position & 7)
+        self.count += 1
+
+    def close(self):
+        if self._file is not None:
+            self.buffer.close()
+            self._file.close()
+            self._file = None
+
+
+class LocalGeneration:
+    """一代本地过滤器（内存或mmap文件）"""
+
+    def __init__(self, generation: int, capacity: int, error_rate: float, directory: Optional[str] = None):
+        self.generation = generation
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.directory = directory
+        self.slices: List[BloomSlice] = []
+
+        # 恢复上次运行留下的分片
+        self._refresh()
+        if not self.slices:
+            with self._locked():
+                self.slices.append(self._open_slice(0))
+
+    def _open_slice(self, index: int) -> BloomSlice:
+        spec = SliceSpec.for_index(index, self.capacity, self.error_rate)
+        path = None
+        if self.directory is not None:
+            path = os.path.join(self.directory, f"{self.generation}-{index}.bloom")
+        return BloomSlice(spec, path)
+
+    @property
+    def error_bound(self) -> float:
+        return sum(s.spec.error_rate for s in self.slices)
+
+    def _refresh(self):
+        """打开其他进程追加的分片文件"""
+        if self.directory is None:
+            return
+        existing = len(glob.glob(os.path.join(self.directory, f"{self.generation}-*.bloom")))
+        for index in range(len(self.slices), existing):
+            self.slices.append(self._open_slice(index))
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """mmap分片的跨进程写锁（内存分片由调用方的线程锁保护）"""
+        if self.directory is None:
+            yield
+            return
+        with open(os.path.join(self.directory, f"{self.generation}.lock"), 'a+b') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def contains_many(self, hashes: Sequence[HashPair]) -> List[bool]:
+        self._refresh()
+        slices = self.slices
+        return [any(s.contains(h) for s in slices) for h in hashes]
+
+    def add_many(self, hashes: Sequence[HashPair]):
+        with self._locked():
+            self._refresh()
+            for h in hashes:
+                current = self.slices[-1]
+                if current.full:
+                    current = self._open_slice(len(self.slices))
+                    self.slices.append(current)
+                current.add(h)
+
+    def close(self):
+        for s in self.slices:
+            s.close()
+
+    def destroy(self):
+        """关闭并删除分片文件"""
+        self.close()
+        for s in self.slices:
+            if s.path and os.path.exists(s.path):
+                os.remove(s.path)
+        if self.directory is not None:
+            lock_path = os.path.join(self.directory, f"{self.generation}.lock")
+            if os.path.exists(lock_path):
+                os.remove(lock_path)
+
+
+class RedisGeneration:
+    """一代Redis过滤器: 每个分片一个位图，meta哈希记录各分片已写入条数"""
+
+    def __init__(self, client: redis.Redis, prefix: str, generation: int,
+                 capacity: int, error_rate: float, ttl: int, add_script: Optional[Any] = None):
+        self.client = client
+        self.prefix = f"{prefix}{generation}:"
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.ttl = ttl
+        self.add_script = add_script or client.register_script(_ADD_MANY_LUA)
+
+    def _counts(self) -> List[int]:
+        meta = self.client.hgetall(self.prefix + 'meta')
+        counts = {int(k): int(v) for k, v in meta.items()}
+        return [counts.get(i, 0) for i in range(len(counts))] or [0]
+
+    def _specs(self, num_slices: int) -> List[SliceSpec]:
+        return [SliceSpec.for_index(i, self.capacity, self.error_rate) for i in range(num_slices)]
+
+    def error_bound(self, num_slices: int) -> float:
+        return sum(spec.error_rate for spec in self._specs(num_slices))
+
+    def contains_many(self, hashes: Sequence[HashPair]) -> List[bool]:
+        specs = self._specs(len(self._counts()))
+        pipe = self.client.pipeline(transaction=False)
+        layout = []
+        for h in hashes:
+            for index, spec in enumerate(specs):
+                positions = spec.positions(h)
+                for position in positions:
+                    pipe.getbit(f"{self.prefix}{index}", position)
+                layout.append(len(positions))
+        bits = pipe.execute()
+
+        results = []
+        cursor = 0
+        slot = 0
+        for _ in hashes:
+            seen = False
+            for _ in specs:
+                size = layout[slot]
+                if all(bits[cursor:cursor + size]):
+                    seen = True
+                cursor += size
+                slot += 1
+            results.append(seen)
+        return results
+
+    def add_many(self, hashes: Sequence[HashPair]):
+        """判断分片是否写满和写入在一个脚本内完成，并发写入时不会把分片写过容量"""
+        if not hashes:
+            return
+        for _ in range(_ADD_MANY_ATTEMPTS):
+            counts = self._counts()
+            base = len(counts) - 1
+            # 假设当前分片已满，准备足够容纳整批的后续分片
+            specs = [SliceSpec.for_index(base, self.capacity, self.error_rate)]
+            while sum(spec.capacity for spec in specs[1:]) < len(hashes):
+                specs.append(SliceSpec.for_index(base + len(specs), self.capacity, self.error_rate))
+
+            args = [base, self.ttl, len(specs), len(hashes)]
+            args += [spec.capacity for spec in specs] + [spec.num_hashes for spec in specs]
+            for h in hashes:
+                for spec in specs:
+                    args.extend(spec.positions(h))
+            keys = [self.prefix + 'meta'] + [f"{self.prefix}{base + i}" for i in range(len(specs))]
+            if self.add_script(keys=keys, args=args):
+                return
+        raise redis.RedisError(f"Frontier slice layout kept changing during add ({len(hashes)} URLs)")
+
+
+class SeenUrlFilter(LoggerMixin):
+    """跨爬取持久化的已见URL集合，支持 redis / mmap / memory 三种后端"""
+
+    REDIS_PREFIX = "news_engine:frontier:"
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        path: Optional[str] = None,
+        capacity: Optional[int] = None,
+        error_rate: Optional[float] = None,
+        rotate_seconds: Optional[int] = None,
+        generations: Optional[int] = None,
+        redis_client: Optional[redis.Redis] = None,
+    ):
+        super().__init__()
+        self.backend = backend or settings.CRAWLER_FRONTIER_BACKEND
+        self.path = path or settings.CRAWLER_FRONTIER_PATH
+        self.capacity = capacity or settings.CRAWLER_FRONTIER_CAPACITY
+        self.error_rate = error_rate or settings.CRAWLER_FRONTIER_ERROR_RATE
+        self.rotate_seconds = rotate_seconds or settings.CRAWLER_FRONTIER_ROTATE_SECONDS
+        self.generations = generations or settings.CRAWLER_FRONTIER_GENERATIONS
+        self._redis = redis_client
+
+        # 每代分到的误判率预算
+        self.generation_error_rate = self.error_rate / self.generations
+
+        self._local: Dict[int, LocalGeneration] = {}
+        self._lock = threading.Lock()
+        # (Redis客户端, 已注册的写入脚本)
+        self._add_script: Optional[Any] = None
+
+        # 统计
+        self.checked = 0
+        self.hits = 0
+        self.added = 0
+
+        if self.backend == 'mmap':
+            os.makedirs(self.path, exist_ok=True)
+
+    # ---------- 代管理 ----------
+
+    def current_generation(self, now: Optional[float] = None) -> int:
+        return int((now or time.time()) // self.rotate_seconds)
+
+    def live_generations(self, now: Optional[float] = None) -> List[int]:
+        current = self.current_generation(now)
+        return list(range(current - self.generations + 1, current + 1))
+
+    def _redis_client(self) -> Optional[redis.Redis]:
+        """获取Redis客户端（不可用时退化为本地内存）"""
+        if self.backend != 'redis':
+            return None
+        return self._redis or get_redis_client()
+
+    def _redis_generation(self, client: redis.Redis, generation: int) -> RedisGeneration:
+        ttl = self.rotate_seconds * (self.generations + 1)
+        if self._add_script is None or self._add_script[0] is not client:
+            self._add_script = (client, client.register_script(_ADD_MANY_LUA))
+        return RedisGeneration(client, self.REDIS_PREFIX, generation,
+                               self.capacity, self.generation_error_rate, ttl, self._add_script[1])
+
+    def _local_generation(self, generation: int) -> LocalGeneration:
+        local = self._local.get(generation)
+        if local is None:
+            directory = self.path if self.backend == 'mmap' else None
+            local = LocalGeneration(generation, self.capacity, self.generation_error_rate, directory)
+            self._local[generation] = local
+        return local
+
+    def _rotate_local(self, live: List[int]):
+        """丢弃过期的本地代"""
+        oldest = live[0]
+        for generation in [g for g in self._local if g < oldest]:
+            self._local.pop(generation).destroy()
+
+        if self.backend == 'mmap':
+            for path in glob.glob(os.path.join(self.path, "*.bloom")) + glob.glob(os.path.join(self.path, "*.lock")):
+                name = os.path.basename(path).split('-', 1)[0].split('.', 1)[0]
+                if name.isdigit() and int(name) < oldest:
+                    os.remove(path)
+
+    # ---------- 对外接口 ----------
+
+    def contains_many(self, keys: Sequence[str]) -> List[bool]:
+        """批量判断URL是否已见过（可能误判为已见，不会漏判）"""
+        if not keys:
+            return []
+        hashes = [hash_pair(key) for key in keys]
+        live = self.live_generations()
+        results = [False] * len(keys)
+
+        client = self._redis_client()
+        if client is not None:
+            try:
+                for generation in reversed(live):
+                    pending = [i for i, seen in enumerate(results) if not seen]
+                    if not pending:
+                        break
+                    found = self._redis_generation(client, generation).contains_many([hashes[i] for i in pending])
+                    for i, seen in zip(pending, found):
+                        results[i] = seen
+                self._record_check(results)
+                return results
+            except redis.RedisError as e:
+                self.log_warning(f"Frontier read failed: {str(e)}")
+                reset_redis_client()
+                results = [False] * len(keys)
+
+        with self._lock:
+            self._rotate_local(live)
+            for generation in reversed(live):
+                local = self._local.get(generation)
+                if local is None and self.backend == 'mmap':
+                    # 磁盘上可能有之前进程写入的分片
+                    if glob.glob(os.path.join(self.path, f"{generation}-*.bloom")):
+                        local = self._local_generation(generation)
+                if local is None:
+                    continue
+                pending = [i for i, seen in enumerate(results) if not seen]
+                if not pending:
+                    break
+                for i, seen in zip(pending, local.contains_many([hashes[i] for i in pending])):
+                    results[i] = seen
+
+        self._record_check(results)
+        return results
+
+    def _record_check(self, results: List[bool]):
+        self.checked += len(results)
+        self.hits += sum(results)
+
+    def add_many(self, keys: Iterable[str]):
+        """批量记录URL（写入当前代）"""
+        hashes = [hash_pair(key) for key in keys]
+        if not hashes:
+            return
+        generation = self.current_generation()
+
+        client = self._redis_client()
+        if client is not None:
+            try:
+                self._redis_generation(client, generation).add_many(hashes)
+                self.added += len(hashes)
+                return
+            except redis.RedisError as e:
+                self.log_warning(f"Frontier write failed: {str(e)}")
+                reset_redis_client()
+
+        with self._lock:
+            self._local_generation(generation).add_many(hashes)
+        self.added += len(hashes)
+
+    def contains(self, key: str) -> bool:
+        return self.contains_many([key])[0]
+
+    def add(self, key: str):
+        self.add_many([key])
+
+    @property
+    def false_positive_bound(self) -> float:
+        """当前误判率上界（所有存活代、所有分片之和）"""
+        client = self._redis_client()
+        if client is not None:
+            try:
+                bound = 0.0
+                for generation in self.live_generations():
+                    redis_generation = self._redis_generation(client, generation)
+                    if client.exists(redis_generation.prefix + 'meta'):
+                        bound += redis_generation.error_bound(len(redis_generation._counts()))
+                return bound
+            except redis.RedisError:
+                reset_redis_client()
+        with self._lock:
+            return sum(local.error_bound for local in self._local.values())
+
+    def get_stats(self) -> Dict[str, object]:
+        """获取过滤统计"""
+        return {
+            'backend': self.backend,
+            'checked': self.checked,
+            'known_skipped': self.hits,
+            'added': self.added,
+            'false_positive_bound': self.false_positive_bound,
+        }
+
+    def close(self):
+        """关闭mmap文件"""
+        with self._lock:
+            for local in self._local.values():
+                local.close()
+            self._local.clear()
+
+
+_url_frontier: Optional[SeenUrlFilter] = None
+_url_frontier_lock = threading.Lock()
+
+
+def get_url_frontier() -> SeenUrlFilter:
+    """获取进程级共享已见URL过滤器"""
+    global _url_frontier
+    if _url_frontier is None:
+        with _url_frontier_lock:
+            if _url_frontier is None:
+                _url_frontier = SeenUrlFilter()
+                if _url_frontier.backend == 'mmap':
+                    atexit.register(_url_frontier.close)
+    return _url_frontier
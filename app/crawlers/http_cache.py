@@ -0,0 +1,225 @@
+"""
+HTTP条件请求缓存（ETag / Last-Modified / 内容哈希）
+"""
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import redis
+
+from app.config import settings
+from app.core.logging import LoggerMixin
+from app.core.redis_client import get_redis_client, reset_redis_client
+
+
+def body_hash(content: bytes) -> str:
+    """计算响应体哈希"""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+class ValidatorCache(LoggerMixin):
+    """URL级验证器缓存，支持 memory / file / redis 三种后端，带LRU和TTL淘汰"""
+
+    REDIS_PREFIX = "news_engine:http_validators:"
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        ttl: Optional[int] = None,
+        redis_client: Optional[redis.Redis] = None,
+    ):
+        super().__init__()
+        self.backend = backend or settings.CRAWLER_HTTP_CACHE_BACKEND
+        self.path = path or settings.CRAWLER_HTTP_CACHE_PATH
+        self.max_entries = max_entries or settings.CRAWLER_HTTP_CACHE_MAX_ENTRIES
+        self.ttl = ttl or settings.CRAWLER_HTTP_CACHE_TTL
+        self._redis = redis_client
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = 0
+
+        # 统计
+        self.requests = 0
+        self.not_modified_hits = 0
+        self.unchanged_hits = 0
+        self.bytes_saved = 0
+
+        if self.backend == 'file':
+            self._load_file()
+
+    # ---------- 后端读写 ----------
+
+    def _redis_client(self) -> Optional[redis.Redis]:
+        """获取Redis客户端（不可用时退化为本地内存）"""
+        if self.backend != 'redis':
+            return None
+        return self._redis or get_redis_client()
+
+    def _get(self, url: str) -> Optional[Dict[str, Any]]:
+        client = self._redis_client()
+        if client is not None:
+            try:
+                raw = client.get(self.REDIS_PREFIX + url)
+                return json.loads(raw) if raw else None
+            except redis.RedisError as e:
+                self.log_warning(f"Validator cache read failed: {str(e)}")
+                reset_redis_client()
+
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            if time.time() - entry['stored_at'] > self.ttl:
+                del self._entries[url]
+                return None
+            self._entries.move_to_end(url)
+            return entry
+
+    def _set(self, url: str, entry: Dict[str, Any]):
+        client = self._redis_client()
+        if client is not None:
+            try:
+                client.set(self.REDIS_PREFIX + url, json.dumps(entry), ex=self.ttl)
+                return
+            except redis.RedisError as e:
+                self.log_warning(f"Validator cache write failed: {str(e)}")
+                reset_redis_client()
+
+        with self._lock:
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty += 1
+
+        if self.backend == 'file' and self._dirty >= settings.CRAWLER_HTTP_CACHE_FLUSH_EVERY:
+            self.flush()
+
+    def _load_file(self):
+        """从本地文件加载缓存"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            now = time.time()
+            for url, entry in data.items():
+                if now - entry.get('stored_at', 0) <= self.ttl:
+                    self._entries[url] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        except (OSError, ValueError) as e:
+            self.log_warning(f"Failed to load validator cache {self.path}: {str(e)}")
+
+    def flush(self):
+        """将本地缓存写回文件（原子替换）"""
+        if self.backend != 'file':
+            return
+        with self._lock:
+            data = dict(self._entries)
+            self._dirty = 0
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.log_warning(f"Failed to flush validator cache {self.path}: {str(e)}")
+
+    # ---------- 对外接口 ----------
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """生成条件请求头"""
+        self.requests += 1
+        entry = self._get(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def is_not_modified(self, url: str, response: Any, check_body: bool = True) -> bool:
+        """判断响应是否表示内容未变化（304或响应体哈希一致，check_body=False时只看304）"""
+        if response.status_code == 304:
+            entry = self._get(url) or {}
+            self.not_modified_hits += 1
+            self.bytes_saved += entry.get('size', 0)
+            return True
+
+        if not check_body:
+            return False
+        entry = self._get(url)
+        if entry and entry.get('body_hash') == body_hash(response.content):
+            self.unchanged_hits += 1
+            return True
+        return False
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """读取URL的缓存条目（含store时附带的额外字段）"""
+        return self._get(url)
+
+    def store(
+        self,
+        url: str,
+        response: Any,
+        digest: Optional[str] = None,
+        size: Optional[int] = None,
+        extra: Optional[Dict[str, Any]] = None,
+    ):
+        """记录响应的验证器（页面处理成功后调用；流式响应传入边读边算的摘要和大小，
+        extra随验证器一起保存，304时由lookup取回）"""
+        if response.status_code == 304:
+            return
+        if digest is None:
+            content = response.content
+            digest, size = body_hash(content), len(content)
+        self._set(url, {
+            **(extra or {}),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'body_hash': digest,
+            'size': size or 0,
+            'stored_at': time.time(),
+        })
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存命中统计"""
+        hits = self.not_modified_hits + self.unchanged_hits
+        return {
+            'backend': self.backend,
+            'requests': self.requests,
+            'not_modified_hits': self.not_modified_hits,
+            'unchanged_hits': self.unchanged_hits,
+            'hit_ratio': hits / self.requests if self.requests else 0.0,
+            'bytes_saved': self.bytes_saved,
+            'entries': len(self._entries),
+        }
+
+
+_validator_cache: Optional[ValidatorCache] = None
+_validator_cache_lock = threading.Lock()
+
+
+def get_validator_cache() -> ValidatorCache:
+    """获取进程级共享验证器缓存"""
+    global _validator_cache
+    if _validator_cache is None:
+        with _validator_cache_lock:
+            if _validator_cache is None:
+                _validator_cache = ValidatorCache()
+                if _validator_cache.backend == 'file':
+                    atexit.register(_validator_cache.flush)
+    return _validator_cache
@@ -0,0 +1,157 @@
+"""
+进程级共享HTTP连接池
+"""
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.config import settings
+from app.core.logging import LoggerMixin
+
+
+class _NoCookiesPolicy(DefaultCookiePolicy):
+    """共享会话不保存也不发送Cookie（同一次请求的重定向链内仍按requests的逐请求Cookie处理）"""
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+
+class PooledHttpClient(LoggerMixin):
+    """共享的keep-alive连接池客户端，请求头按请求传入而不是绑定在会话上"""
+
+    def __init__(
+        self,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        host_pool_sizes: Optional[Dict[str, int]] = None,
+    ):
+        super().__init__()
+        self.pool_connections = pool_connections or settings.CRAWLER_POOL_CONNECTIONS
+        self.pool_maxsize = pool_maxsize or settings.CRAWLER_POOL_MAXSIZE
+        self.host_pool_sizes = dict(settings.CRAWLER_HOST_POOL_SIZES)
+        self.host_pool_sizes.update(host_pool_sizes or {})
+
+        self.session = requests.Session()
+        # 会话上不保留任何默认头和Cookie，避免不同新闻源之间互相污染（Cookie罐也不会无限增长）
+        self.session.headers.clear()
+        self.session.cookies.set_policy(_NoCookiesPolicy())
+        self._adapters: Dict[str, HTTPAdapter] = {}
+        self._lock = threading.Lock()
+
+        default_adapter = self._new_adapter(self.pool_maxsize)
+        self.session.mount('http://', default_adapter)
+        self.session.mount('https://', default_adapter)
+        self._adapters['*'] = default_adapter
+
+        for host, size in self.host_pool_sizes.items():
+            self.size_host_pool(host, size)
+
+        if settings.PROXY_ENABLED and settings.PROXY_URL:
+            self.session.proxies = {
+                'http': settings.PROXY_URL,
+                'https': settings.PROXY_URL
+            }
+
+        self.requests_sent = 0
+
+    def _new_adapter(self, maxsize: int) -> HTTPAdapter:
+        """创建连接池适配器（重试由爬虫自己控制）"""
+        return HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=maxsize,
+            pool_block=False,
+            max_retries=0
+        )
+
+    def size_host_pool(self, host: str, maxsize: int):
+        """为指定主机设置独立的连接池大小"""
+        host = host.lower()
+        with self._lock:
+            if host in self._adapters:
+                return
+            adapter = self._new_adapter(maxsize)
+            self.session.mount(f'http://{host}/', adapter)
+            self.session.mount(f'https://{host}/', adapter)
+            self._adapters[host] = adapter
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, **kwargs: Any) -> requests.Response:
+        """发送GET请求"""
+        self.requests_sent += 1
+        return self.session.get(url, headers=headers, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取连接池统计（连接复用率、打开的连接数）"""
+        pools = {}
+        new_connections = 0
+        pool_requests = 0
+        open_connections = 0
+
+        for adapter in list(self._adapters.values()):
+            for key in list(adapter.poolmanager.pools.keys()):
+                pool = adapter.poolmanager.pools.get(key)
+                if pool is None:
+                    continue
+                idle = sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0
+                new_connections += pool.num_connections
+                pool_requests += pool.num_requests
+                open_connections += idle
+                pools[f"{key.key_scheme}://{key.key_host}:{key.key_port}"] = {
+                    'maxsize': pool.pool.maxsize if pool.pool else 0,
+                    'connections_created': pool.num_connections,
+                    'requests': pool.num_requests,
+                    'idle_connections': idle,
+                }
+
+        reuse_ratio = 1 - new_connections / pool_requests if pool_requests else 0.0
+        return {
+            'requests': self.requests_sent,
+            'connections_created': new_connections,
+            'reuse_ratio': reuse_ratio,
+            'open_connections': open_connections,
+            'pools': pools,
+        }
+
+    def close(self):
+        """关闭所有连接"""
+        self.session.close()
+
+
+_http_client: Optional[PooledHttpClient] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> PooledHttpClient:
+    """获取进程级共享HTTP客户端（Celery worker进程内跨任务复用）"""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = PooledHttpClient()
+    return _http_client
+
+
+def close_http_client():
+    """关闭共享HTTP客户端（worker进程退出时调用）"""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+
+
+def _reset_after_fork():
+    """fork后子进程不能复用父进程的套接字"""
+    global _http_client, _http_client_lock
+    _http_client = None
+    _http_client_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
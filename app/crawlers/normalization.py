@@ -0,0 +1,130 @@
+"""
+文本与时间规范化
+
+所有正则在模块加载时编译一次；时间解析只做一次search，
+把“3小时前”“10分钟前”“MM-DD”“HH:MM”等写法转换为带时区的datetime。
+"""
+import re
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from zoneinfo import ZoneInfo
+
+from app.config import settings
+
+TIMEZONE = ZoneInfo(settings.CRAWLER_TIMEZONE)
+
+# 需要移除的字符（保留字母、数字、汉字、空白和常用标点 - . , ! ?）
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s\-.,!?]+')
+
+_TIME_RE = re.compile(
+    r'(?P<just_now>刚刚)'
+    r'|(?P<ago_n>\d{1,3})\s*(?P<ago_unit>秒|分钟|小时|天)前'
+    r'|(?P<yesterday>昨天)\s*(?P<y_hour>\d{1,2}):(?P<y_minute>\d{2})'
+    r'|(?P<year>\d{4})[-/年.](?P<month>\d{1,2})[-/月.](?P<day>\d{1,2})日?'
+    r'(?:[\sT]*(?P<hour>\d{1,2}):(?P<minute>\d{2})(?::(?P<second>\d{2}))?)?'
+    r'|(?P<md_month>\d{1,2})[-/月](?P<md_day>\d{1,2})日?'
+    r'(?:\s*(?P<md_hour>\d{1,2}):(?P<md_minute>\d{2}))?'
+    r'|(?P<t_hour>\d{1,2}):(?P<t_minute>\d{2})'
+)
+
+_AGO_UNITS = {
+    '秒': 'seconds',
+    '分钟': 'minutes',
+    '小时': 'hours',
+    '天': 'days',
+}
+
+# 列表页时间与本机时钟可能有少量偏差，超出这个范围的“未来时间”视为上一天/上一年
+_FUTURE_TOLERANCE = timedelta(minutes=10)
+
+
+def clean_text(text: Optional[str]) -> str:
+    """清理文本: 移除特殊字符并合并空白"""
+    if not text:
+        return ""
+    # 一次正则过滤，空白合并交给C实现的split/join
+    return ' '.join(_SPECIAL_CHARS_RE.sub('', text).split())
+
+
+def clean_texts(texts: Iterable[Optional[str]]) -> List[str]:
+    """批量清理文本"""
+    sub = _SPECIAL_CHARS_RE.sub
+    return [' '.join(sub('', text).split()) if text else "" for text in texts]
+
+
+def collapse_whitespace(text: Optional[str]) -> str:
+    """只合并空白、保留标点（用于正文段落）"""
+    return ' '.join(text.split()) if text else ""
+
+
+def now_local() -> datetime:
+    """当前时间（带时区）"""
+    return datetime.now(TIMEZONE)
+
+
+def parse_publish_time(time_str: Optional[str], now: Optional[datetime] = None) -> Optional[datetime]:
+    """把发布时间文本解析为带时区的datetime，无法识别时返回None"""
+    if not time_str:
+        return None
+
+    match = _TIME_RE.search(time_str)
+    if not match:
+        return None
+
+    # 列表页时间精度最多到秒
+    now = now or now_local().replace(microsecond=0)
+    groups = match.groupdict()
+
+    try:
+        if groups['just_now']:
+            return now
+
+        if groups['ago_n']:
+            unit = _AGO_UNITS[groups['ago_unit']]
+            return now - timedelta(**{unit: int(groups['ago_n'])})
+
+        if groups['yesterday']:
+            day = now - timedelta(days=1)
+            return day.replace(
+                hour=int(groups['y_hour']), minute=int(groups['y_minute']), second=0, microsecond=0
+            )
+
+        if groups['year']:
+            return datetime(
+                int(groups['year']), int(groups['month']), int(groups['day']),
+                int(groups['hour'] or 0), int(groups['minute'] or 0), int(groups['second'] or 0),
+                tzinfo=now.tzinfo
+            )
+
+        if groups['md_month']:
+            value = datetime(
+                now.year, int(groups['md_month']), int(groups['md_day']),
+                int(groups['md_hour'] or 0), int(groups['md_minute'] or 0),
+                tzinfo=now.tzinfo
+            )
+            if value - now > _FUTURE_TOLERANCE:
+                value = value.replace(year=now.year - 1)
+            return value
+
+        value = now.replace(
+            hour=int(groups['t_hour']), minute=int(groups['t_minute']), second=0, microsecond=0
+        )
+        if value - now > _FUTURE_TOLERANCE:
+            value -= timedelta(days=1)
+        return value
+
+    except ValueError:
+        # 非法日期，如 02-30 或 25:00
+        return None
+
+
+def parse_publish_times(values: Iterable[Optional[str]], now: Optional[datetime] = None) -> List[Optional[datetime]]:
+    """批量解析发布时间（整批使用同一个基准时间，相同文本只解析一次）"""
+    now = now or now_local().replace(microsecond=0)
+    cache: Dict[Optional[str], Optional[datetime]] = {}
+    results = []
+    for value in values:
+        if value not in cache:
+            cache[value] = parse_publish_time(value, now)
+        results.append(cache[value])
+    return results
@@ -0,0 +1,222 @@
+"""
+HTML解析后端
+
+所有后端返回的文档节点都支持爬虫用到的同一组操作:
+select / select_one / find / get_text / get / [] / name
+"""
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import lxml.html
+from bs4 import BeautifulSoup
+
+from app.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+Markup = Union[str, bytes]
+
+
+class ParserBackend(ABC):
+    """解析后端抽象类"""
+
+    name = ''
+
+    @abstractmethod
+    def parse(self, markup: Markup, encoding: Optional[str] = None) -> Any:
+        """解析HTML，返回文档根节点"""
+        pass
+
+
+class BeautifulSoupBackend(ParserBackend):
+    """BeautifulSoup后端（兼容性最好，速度最慢）"""
+
+    name = 'bs4'
+
+    def parse(self, markup: Markup, encoding: Optional[str] = None) -> BeautifulSoup:
+        if isinstance(markup, bytes) and encoding:
+            return BeautifulSoup(markup, 'lxml', from_encoding=encoding)
+        return BeautifulSoup(markup, 'lxml')
+
+
+@lru_cache(maxsize=512)
+def compile_css(selector: str):
+    """编译CSS选择器为XPath（按选择器字符串缓存）"""
+    from lxml.cssselect import CSSSelector
+    return CSSSelector(selector, translator='html')
+
+
+class LxmlNode:
+    """lxml元素的轻量包装，提供与BeautifulSoup一致的常用接口"""
+
+    __slots__ = ('element',)
+
+    def __init__(self, element: lxml.html.HtmlElement):
+        self.element = element
+
+    @property
+    def name(self) -> str:
+        return self.element.tag if isinstance(self.element.tag, str) else ''
+
+    @property
+    def attrs(self) -> Dict[str, str]:
+        return dict(self.element.attrib)
+
+    def select(self, selector: str) -> List['LxmlNode']:
+        return [LxmlNode(e) for e in compile_css(selector)(self.element)]
+
+    def select_one(self, selector: str) -> Optional['LxmlNode']:
+        matches = compile_css(selector)(self.element)
+        return LxmlNode(matches[0]) if matches else None
+
+    def find(self, name: str) -> Optional['LxmlNode']:
+        for element in self.element.iterdescendants(name):
+            return LxmlNode(element)
+        return None
+
+    def iter_elements(self) -> Iterator['LxmlNode']:
+        """按文档顺序遍历所有后代元素"""
+        for element in self.element.iterdescendants():
+            if isinstance(element.tag, str):
+                yield LxmlNode(element)
+
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        texts = self.element.itertext()
+        if strip:
+            return separator.join(t.strip() for t in texts if t.strip())
+        return separator.join(texts)
+
+    @property
+    def text(self) -> str:
+        return self.get_text()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.element.get(key, default)
+
+    def __getitem__(self, key: str) -> str:
+        value = self.element.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __bool__(self) -> bool:
+        return True
+
+
+class LxmlBackend(ParserBackend):
+    """lxml.html后端，CSS选择器预编译为XPath"""
+
+    name = 'lxml'
+
+    def parse(self, markup: Markup, encoding: Optional[str] = None) -> LxmlNode:
+        if isinstance(markup, bytes) and encoding:
+            parser = lxml.html.HTMLParser(encoding=encoding)
+            return LxmlNode(lxml.html.document_fromstring(markup, parser=parser))
+        if isinstance(markup, str) and markup.lstrip().startswith('<?xml'):
+            # 带编码声明的str无法直接交给lxml
+            markup = markup.encode('utf-8')
+        return LxmlNode(lxml.html.document_fromstring(markup))
+
+
+class SelectolaxNode:
+    """selectolax(lexbor)节点的轻量包装"""
+
+    __slots__ = ('node',)
+
+    def __init__(self, node: Any):
+        self.node = node
+
+    @property
+    def name(self) -> str:
+        return self.node.tag or ''
+
+    @property
+    def attrs(self) -> Dict[str, str]:
+        return dict(self.node.attributes)
+
+    def select(self, selector: str) -> List['SelectolaxNode']:
+        return [SelectolaxNode(n) for n in self.node.css(selector)]
+
+    def select_one(self, selector: str) -> Optional['SelectolaxNode']:
+        node = self.node.css_first(selector)
+        return SelectolaxNode(node) if node is not None else None
+
+    def find(self, name: str) -> Optional['SelectolaxNode']:
+        return self.select_one(name)
+
+    def iter_elements(self) -> Iterator['SelectolaxNode']:
+        """按文档顺序遍历所有后代元素"""
+        nodes = self.node.traverse(include_text=False)
+        next(nodes, None)  # 跳过自身
+        for node in nodes:
+            if node.tag and not node.tag.startswith('-'):
+                yield SelectolaxNode(node)
+
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        return self.node.text(deep=True, separator=separator, strip=strip)
+
+    @property
+    def text(self) -> str:
+        return self.get_text()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self.node.attributes.get(key)
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> str:
+        value = self.node.attributes.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __bool__(self) -> bool:
+        return True
+
+
+class SelectolaxBackend(ParserBackend):
+    """selectolax(lexbor)后端，需要安装selectolax"""
+
+    name = 'selectolax'
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser_class = LexborHTMLParser
+
+    def parse(self, markup: Markup, encoding: Optional[str] = None) -> SelectolaxNode:
+        if isinstance(markup, bytes) and encoding:
+            markup = markup.decode(encoding, errors='replace')
+        tree = self._parser_class(markup)
+        return SelectolaxNode(tree.root)
+
+
+PARSER_BACKENDS = {
+    'bs4': BeautifulSoupBackend,
+    'lxml': LxmlBackend,
+    'selectolax': SelectolaxBackend,
+}
+
+_backends: Dict[str, ParserBackend] = {}
+_backends_lock = threading.RLock()
+
+
+def get_parser_backend(name: Optional[str] = None) -> ParserBackend:
+    """按名称获取解析后端实例（不可用时退回lxml）"""
+    name = name or settings.CRAWLER_PARSER_BACKEND
+    backend = _backends.get(name)
+    if backend is not None:
+        return backend
+
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend: {name}")
+
+    with _backends_lock:
+        if name not in _backends:
+            try:
+                _backends[name] = PARSER_BACKENDS[name]()
+            except ImportError as e:
+                logger.warning(f"Parser backend {name} unavailable, falling back to lxml: {str(e)}")
+                _backends[name] = get_parser_backend('lxml') if name != 'lxml' else LxmlBackend()
+    return _backends[name]
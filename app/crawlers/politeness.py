@@ -0,0 +1,146 @@
+"""
+按主机的礼貌抓取调度（令牌桶限速）
+"""
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from app.config import settings
+
+
+class TokenBucket:
+    """令牌桶：rate为每秒补充的令牌数，burst为桶容量"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        """按流逝时间补充令牌"""
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def reserve(self, now: Optional[float] = None) -> float:
+        """预留一个令牌，返回需要等待的秒数（0表示可立即发送）"""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        # 令牌允许为负，后续请求依次排到更晚的时间槽
+        return -self.tokens / self.rate
+
+
+class HostRateLimiter:
+    """进程内共享的主机级限速器，同一主机的所有爬虫共用一个令牌桶"""
+
+    def __init__(self, default_rate: Optional[float] = None, default_burst: Optional[int] = None):
+        self.default_rate = default_rate if default_rate is not None else settings.CRAWLER_HOST_RATE
+        self.default_burst = default_burst if default_burst is not None else settings.CRAWLER_HOST_BURST
+        self._buckets: Dict[str, TokenBucket] = {}
+        # 主机速率上限（robots.txt的Crawl-delay），之后的configure_host不能超过
+        self._ceilings: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        # 统计
+        self.total_wait = 0.0
+        self.throttled_requests = 0
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """提取主机名"""
+        return (urlparse(url).hostname or '').lower()
+
+    def configure_host(self, host: str, rate: Optional[float] = None, burst: Optional[int] = None):
+        """设置主机的速率和突发量（rate<=0表示不限速；有速率上限时取 min(rate, 上限)）"""
+        host = host.lower()
+        rate = self.default_rate if rate is None else rate
+        burst = self.default_burst if burst is None else burst
+        with self._lock:
+            ceiling = self._ceilings.get(host)
+            if ceiling is not None and (rate <= 0 or rate > ceiling):
+                # 按上限限速时不允许突发
+                rate, burst = ceiling, 1
+            self._set_bucket(host, rate, burst)
+
+    def limit_host(self, host: str, max_rate: float):
+        """设置主机速率上限（如robots.txt的Crawl-delay），当前速率更快时立即降低"""
+        host = host.lower()
+        with self._lock:
+            self._ceilings[host] = max_rate
+            bucket = self._buckets.get(host)
+            if bucket is None or bucket.rate <= 0 or bucket.rate > max_rate:
+                self._set_bucket(host, max_rate, 1)
+
+    def _set_bucket(self, host: str, rate: float, burst: int):
+        """创建或更新主机的令牌桶（调用方持有锁）"""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            self._buckets[host] = TokenBucket(rate, burst)
+        else:
+            bucket.rate = rate
+            bucket.burst = max(1, burst)
+            bucket.tokens = min(bucket.tokens, bucket.burst)
+
+    def get_host_rate(self, host: str) -> Optional[float]:
+        """获取主机当前速率"""
+        bucket = self._buckets.get(host.lower())
+        return bucket.rate if bucket else None
+
+    def reserve(self, url: str) -> float:
+        """为URL所在主机预留一个请求时间槽，返回需要等待的秒数"""
+        host = self.host_of(url)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.default_rate, self.default_burst)
+                self._buckets[host] = bucket
+            if bucket.rate <= 0:
+                return 0.0
+            wait = bucket.reserve()
+            if wait > 0:
+                self.total_wait += wait
+                self.throttled_requests += 1
+            return wait
+
+    def acquire(self, url: str) -> float:
+        """同步获取请求许可（只在超出主机速率时等待）"""
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url: str) -> float:
+        """异步获取请求许可（等待期间不阻塞事件循环）"""
+        wait = self.reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def get_stats(self) -> Dict[str, float]:
+        """获取限速统计"""
+        return {
+            'hosts': len(self._buckets),
+            'throttled_requests': self.throttled_requests,
+            'total_wait': self.total_wait,
+        }
+
+
+_rate_limiter: Optional[HostRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """获取进程级共享限速器"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = HostRateLimiter()
+    return _rate_limiter
@@ -0,0 +1,274 @@
+"""
+爬虫注册表
+
+把新闻源的解析器名称（NewsSource.parser）映射到爬虫类，并在worker进程内缓存按新闻源配置好的爬虫实例。
+爬虫类按 "模块:类名" 延迟导入，API进程只校验名称时不需要导入解析库；
+worker启动时调用 warm() 预先导入并编译选择器，第一个任务不承担这些开销。
+"""
+import importlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+from urllib.parse import urlsplit
+
+from app.config import settings
+from app.core.logging import LoggerMixin, get_logger
+
+logger = get_logger(__name__)
+
+# 解析器名称 -> 爬虫类
+CRAWLER_CLASSES: Dict[str, str] = {
+    'sina': 'app.crawlers.sina_crawler:SinaCrawler',
+    'tencent': 'app.crawlers.tencent_crawler:TencentCrawler',
+    'rss': 'app.crawlers.base_crawler:RSSFeedCrawler',
+    'sitemap': 'app.crawlers.sitemap_crawler:SitemapCrawler',
+}
+
+# 解析器名称没有注册时，按新闻源类型选择通用爬虫
+TYPE_DEFAULTS: Dict[str, str] = {
+    'rss': 'rss',
+    'sitemap': 'sitemap',
+}
+
+# 决定爬虫实例配置的新闻源字段，任一字段变化时重新创建实例
+_CONFIG_FIELDS = ('url', 'type', 'parser', 'parser_backend', 'rate_limit', 'rate_burst')
+
+_WARMUP_URL = 'https://warmup.invalid/news/1.html'
+_WARMUP_HTML = (
+    '<html><head><meta charset="utf-8"><title>warmup</title></head><body>'
+    '<div class="news-item"><h2><a href="/news/doc-1.shtml">标题</a></h2><p class="summary">摘要</p>'
+    '<span class="time">1小时前</span></div><a class="next" href="/news/2.html">下一页</a></body></html>'
+).encode('utf-8')
+_WARMUP_RSS = (
+    '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel><title>warmup</title>'
+    '<item><title>标题</title><link>https://warmup.invalid/news/doc-1.shtml</link></item></channel></rss>'
+).encode('utf-8')
+
+
+def load_configured_sources(path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """从新闻源配置文件读取新闻源，按ID索引（没有id字段时以URL主机名作为ID）"""
+    path = path or settings.CRAWLER_SOURCES_FILE
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Failed to load news sources from {path}: {str(e)}")
+        return {}
+
+    sources = {}
+    groups = data.values() if isinstance(data, dict) else [data]
+    for entries in groups:
+        for entry in entries if isinstance(entries, list) else []:
+            source_id = entry.get('id') or urlsplit(entry.get('url', '')).hostname
+            if source_id:
+                sources[source_id] = dict(entry, id=source_id)
+    return sources
+
+
+def find_configured_source(source_id: str) -> Optional[Dict[str, Any]]:
+    """按ID查找新闻源配置文件中的新闻源（beat调度和其他进程触发的爬取都能解析）"""
+    return load_configured_sources().get(source_id)
+
+
+def source_config(source: Any) -> Dict[str, Any]:
+    """NewsSource模型或其JSON字典 -> 字典"""
+    if hasattr(source, 'model_dump'):
+        return source.model_dump(mode='json')
+    return dict(source)
+
+
+class CrawlerRegistry(LoggerMixin):
+    """解析器注册表 + 按新闻源缓存的空闲爬虫实例"""
+
+    def __init__(self, max_idle: Optional[int] = None, **crawler_kwargs):
+        super().__init__()
+        self.max_idle = max_idle if max_idle is not None else settings.CRAWLER_REGISTRY_MAX_IDLE
+        # 传给每个爬虫构造函数的公共参数（如测试中使用的内存后端）
+        self.crawler_kwargs = crawler_kwargs
+        self._targets: Dict[str, Any] = dict(CRAWLER_CLASSES)
+        self._classes: Dict[str, Type] = {}
+        # 配置指纹 -> 空闲实例（按最近归还排序，超出max_idle时淘汰最久未用的）
+        self._idle: 'OrderedDict[Tuple, List[Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 统计
+        self.created = 0
+        self.reused = 0
+
+    def register(self, parser: str, target: Any):
+        """注册解析器（爬虫类或 "模块:类名"）"""
+        with self._lock:
+            self._targets[parser] = target
+            self._classes.pop(parser, None)
+
+    def parsers(self) -> List[str]:
+        return sorted(self._targets)
+
+    def resolve(self, parser: Optional[str], source_type: Optional[str] = None) -> Type:
+        """解析器名称 -> 爬虫类（未注册时按新闻源类型兜底）"""
+        name = parser if parser in self._targets else TYPE_DEFAULTS.get(source_type or '')
+        if name is None:
+            raise ValueError(f"No crawler registered for parser: {parser}")
+
+        cls = self._classes.get(name)
+        if cls is None:
+            target = self._targets[name]
+            if isinstance(target, str):
+                module_name, _, class_name = target.partition(':')
+                target = getattr(importlib.import_module(module_name), class_name)
+            with self._lock:
+                cls = self._classes.setdefault(name, target)
+        return cls
+
+    @staticmethod
+    def fingerprint(source: Dict[str, Any]) -> Tuple:
+        return (source.get('id'),) + tuple(str(source.get(field)) for field in _CONFIG_FIELDS)
+
+    def build(self, source: Dict[str, Any]) -> Any:
+        """按新闻源配置创建新的爬虫实例"""
+        cls = self.resolve(source.get('parser'), source.get('type'))
+        kwargs = dict(self.crawler_kwargs)
+        for field in ('parser_backend', 'rate_limit', 'rate_burst'):
+            if source.get(field) is not None:
+                kwargs[field] = source[field]
+        if source.get('name'):
+            kwargs.setdefault('source_name', source['name'])
+        self.created += 1
+        return cls(str(source.get('id')), str(source['url']), **kwargs)
+
+    @contextmanager
+    def lease(
+        self,
+        source: Any,
+        crawl_id: Optional[str] = None,
+        force_crawl: bool = False,
+        max_pages: Optional[int] = None
+    ) -> Iterator[Any]:
+        """借出一个配置好的爬虫实例，用完归还（同一新闻源并发爬取时各用各的实例）"""
+        source = source_config(source)
+        key = self.fingerprint(source)
+        crawler = None
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                crawler = idle.pop()
+                self.reused += 1
+
+        if crawler is None:
+            self._evict_stale(key)
+            crawler = self.build(source)
+
+        # 每次爬取的参数
+        crawler.crawl_id = crawl_id
+        crawler.force_crawl = force_crawl
+        crawler.max_pages = max_pages or self.crawler_kwargs.get('max_pages', settings.CRAWLER_MAX_PAGES)
+        try:
+            yield crawler
+        finally:
+            self._release(key, crawler)
+
+    def content_selectors(self, source: Any) -> Optional[str]:
+        """新闻源解析器内置的正文选择器（详情抓取阶段用作模板提示；没有注册解析器时为None）"""
+        try:
+            with self.lease(source) as crawler:
+                return (getattr(crawler, 'content_selectors', None) or {}).get('content')
+        except ValueError:
+            return None
+
+    def _release(self, key: Tuple, crawler: Any):
+        with self._lock:
+            self._idle.setdefault(key, []).append(crawler)
+            self._idle.move_to_end(key)
+            while sum(len(instances) for instances in self._idle.values()) > self.max_idle:
+                oldest_key, instances = next(iter(self._idle.items()))
+                instances.pop(0).cleanup()
+                if not instances:
+                    del self._idle[oldest_key]
+
+    def _evict_stale(self, key: Tuple):
+        """新闻源配置变化后，丢弃旧配置的实例"""
+        with self._lock:
+            for other in [k for k in self._idle if k[0] == key[0] and k != key]:
+                for crawler in self._idle.pop(other):
+                    crawler.cleanup()
+
+    def clear(self):
+        """丢弃所有空闲实例"""
+        with self._lock:
+            self._idle.clear()
+
+    def warm(self, parsers: Optional[List[str]] = None) -> Dict[str, float]:
+        """导入爬虫类并用内置小页面跑一遍解析和提取（导入解析库、编译选择器），返回各解析器耗时(秒)"""
+        timings = {}
+        for parser in parsers or self.parsers():
+            start = time.perf_counter()
+            try:
+                cls = self.resolve(parser)
+                crawler = cls(f"warmup-{parser}", _WARMUP_URL, **self.crawler_kwargs)
+                self._exercise(crawler)
+            except Exception as e:
+                self.log_warning(f"Crawler warm-up failed for parser {parser}: {str(e)}")
+                continue
+            timings[parser] = time.perf_counter() - start
+        self.log_info("Crawler registry warmed", parsers=list(timings))
+        return timings
+
+    @staticmethod
+    def _exercise(crawler: Any):
+        from app.crawlers.base_crawler import RSSFeedCrawler, WebsiteCrawler
+
+        if isinstance(crawler, RSSFeedCrawler):
+            response = SimpleNamespace(content=_WARMUP_RSS, headers={'Content-Type': 'application/rss+xml'})
+            crawler.extract_articles(crawler.parse_feed(response, _WARMUP_URL), _WARMUP_URL)
+        elif isinstance(crawler, WebsiteCrawler):
+            # 不检查robots.txt，预热不发起任何请求
+            crawler.robots = None
+            soup = crawler.parse_html(_WARMUP_HTML, 'utf-8')
+            crawler.extract_articles(soup, _WARMUP_URL)
+            crawler.get_next_page_url(soup, _WARMUP_URL)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计"""
+        with self._lock:
+            idle = sum(len(instances) for instances in self._idle.values())
+        return {
+            'parsers': self.parsers(),
+            'loaded': sorted(self._classes),
+            'idle': idle,
+            'created': self.created,
+            'reused': self.reused,
+        }
+
+
+_registry: Optional[CrawlerRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_crawler_registry() -> CrawlerRegistry:
+    """获取进程级共享爬虫注册表"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = CrawlerRegistry()
+    return _registry
+
+
+def _reset_after_fork():
+    """fork后子进程不能复用父进程的爬虫实例（实例持有父进程的连接池）"""
+    global _registry_lock
+    _registry_lock = threading.Lock()
+    if _registry is not None:
+        _registry._lock = threading.Lock()
+        _registry.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
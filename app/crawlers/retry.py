@@ -0,0 +1,144 @@
+"""
+请求重试策略
+
+按状态码和异常类型区分可重试/不可重试错误，可重试时使用全抖动指数退避
+（delay = uniform(0, min(max_delay, base * 2^attempt))），服务器给出Retry-After时以其为准。
+重试结果按主机记录统计。
+"""
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+
+from app.config import settings
+
+# 可重试的HTTP状态码（超时、限流、服务端临时错误）
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# 可重试的网络异常（超时、连接失败、连接被中断）
+RETRYABLE_EXCEPTIONS = (
+    requests.Timeout,
+    requests.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    httpx.TimeoutException,
+    httpx.NetworkError,
+    httpx.RemoteProtocolError,
+)
+
+
+class RetryMetrics:
+    """按主机统计重试结果"""
+
+    def __init__(self):
+        self._hosts: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def record(self, url: str, outcome: str, reason: Optional[str] = None):
+        host = (urlsplit(url).hostname or '').lower()
+        with self._lock:
+            counter = self._hosts.setdefault(host, Counter())
+            counter[outcome] += 1
+            if reason:
+                counter[f"reason:{reason}"] += 1
+
+    def get_stats(self, host: Optional[str] = None) -> Dict[str, Any]:
+        """获取统计（指定主机时只返回该主机）"""
+        with self._lock:
+            if host is not None:
+                return dict(self._hosts.get(host.lower(), {}))
+            return {h: dict(c) for h, c in self._hosts.items()}
+
+
+_retry_metrics = RetryMetrics()
+
+
+def get_retry_metrics() -> RetryMetrics:
+    """获取进程级重试统计"""
+    return _retry_metrics
+
+
+class RetryPolicy:
+    """重试策略: 错误分类 + 全抖动指数退避 + Retry-After"""
+
+    def __init__(
+        self,
+        max_retries: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+        max_retry_after: Optional[float] = None,
+        retry_statuses: frozenset = RETRYABLE_STATUSES,
+        metrics: Optional[RetryMetrics] = None,
+        rng: Callable[[float, float], float] = random.uniform,
+    ):
+        self.max_retries = settings.CRAWLER_MAX_RETRIES if max_retries is None else max_retries
+        self.base_delay = settings.CRAWLER_RETRY_BASE_DELAY if base_delay is None else base_delay
+        self.max_delay = settings.CRAWLER_RETRY_MAX_DELAY if max_delay is None else max_delay
+        self.max_retry_after = settings.CRAWLER_RETRY_MAX_AFTER if max_retry_after is None else max_retry_after
+        self.retry_statuses = retry_statuses
+        self.metrics = metrics or get_retry_metrics()
+        self.rng = rng
+
+    def classify(self, exc: Exception) -> Optional[str]:
+        """返回可重试原因，不可重试时返回None"""
+        response = getattr(exc, 'response', None)
+        if response is not None and isinstance(exc, (requests.HTTPError, httpx.HTTPStatusError)):
+            status = response.status_code
+            return f"status_{status}" if status in self.retry_statuses else None
+        if isinstance(exc, (requests.Timeout, httpx.TimeoutException)):
+            return 'timeout'
+        if isinstance(exc, RETRYABLE_EXCEPTIONS):
+            return 'connection'
+        return None
+
+    def backoff(self, attempt: int) -> float:
+        """全抖动指数退避"""
+        return self.rng(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    @staticmethod
+    def retry_after(response: Any) -> Optional[float]:
+        """解析Retry-After（秒数或HTTP日期）"""
+        if response is None:
+            return None
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def next_delay(self, url: str, attempt: int, exc: Exception) -> Optional[float]:
+        """第attempt次失败后的等待时间，不再重试时返回None"""
+        reason = self.classify(exc)
+        if reason is None:
+            self.metrics.record(url, 'not_retryable')
+            return None
+        if attempt >= self.max_retries:
+            self.metrics.record(url, 'gave_up', reason)
+            return None
+
+        retry_after = self.retry_after(getattr(exc, 'response', None))
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                # 服务器要求等待太久，放弃本次抓取而不是占住worker
+                self.metrics.record(url, 'gave_up', 'retry_after_too_long')
+                return None
+            delay = retry_after
+        else:
+            delay = self.backoff(attempt)
+
+        self.metrics.record(url, 'retry', reason)
+        return delay
+
+    def record_success(self, url: str, attempt: int):
+        """记录请求成功（区分是否经过重试）"""
+        self.metrics.record(url, 'success_after_retry' if attempt else 'success')
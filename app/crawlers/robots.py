@@ -0,0 +1,269 @@
+"""
+robots.txt缓存
+
+每个站点的robots.txt在所有worker之间共享缓存（Redis，带TTL），
+解析一次得到按规则长度排序的匹配器；Crawl-delay写入主机限速器。
+抓取失败时做负缓存，避免每次都重新请求。
+"""
+import json
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import redis
+
+from app.config import settings
+from app.core.logging import LoggerMixin
+from app.core.redis_client import get_redis_client, reset_redis_client
+from app.crawlers.http_client import PooledHttpClient, get_http_client
+from app.crawlers.politeness import HostRateLimiter, get_rate_limiter
+
+# robots.txt最大读取字节数（RFC 9309要求至少解析500KB）
+MAX_ROBOTS_SIZE = 512 * 1024
+
+
+class RobotsRules:
+    """编译后的allow/disallow规则，最长匹配优先，长度相同时allow优先"""
+
+    def __init__(self, rules: List[Tuple[str, bool]], crawl_delay: Optional[float] = None):
+        self.crawl_delay = crawl_delay
+        compiled = []
+        for pattern, allow in rules:
+            if '*' in pattern or pattern.endswith('$'):
+                regex = re.escape(pattern).replace(r'\*', '.*')
+                if regex.endswith(r'\$'):
+                    regex = regex[:-2] + '$'
+                compiled.append((len(pattern), allow, pattern, re.compile(regex)))
+            else:
+                # 普通前缀规则直接用startswith
+                compiled.append((len(pattern), allow, pattern, None))
+        compiled.sort(key=lambda rule: (rule[0], rule[1]), reverse=True)
+        self._rules = compiled
+
+    def allowed(self, url: str) -> bool:
+        """URL是否允许抓取"""
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if path == '/robots.txt':
+            return True
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        for _, allow, pattern, regex in self._rules:
+            if regex is None:
+                if path.startswith(pattern):
+                    return allow
+            elif regex.match(path):
+                return allow
+        return True
+
+
+ALLOW_ALL = RobotsRules([])
+DISALLOW_ALL = RobotsRules([('/', False)])
+
+
+def parse_robots(text: str, agent: str) -> RobotsRules:
+    """解析robots.txt，合并所有匹配本爬虫标识的分组（没有时使用 * 分组）"""
+    agent = agent.lower()
+    groups: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+
+    for line in text.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if ':' not in line:
+            continue
+        field, value = line.split(':', 1)
+        field = field.strip().lower()
+        value = value.strip()
+
+        if field == 'user-agent':
+            if current is None or current['rules'] or current['delay'] is not None:
+                current = {'agents': [], 'rules': [], 'delay': None}
+                groups.append(current)
+            current['agents'].append(value.lower())
+        elif current is None:
+            continue
+        elif field in ('allow', 'disallow'):
+            if value:
+                current['rules'].append((value, field == 'allow'))
+        elif field == 'crawl-delay':
+            try:
+                current['delay'] = float(value)
+            except ValueError:
+                pass
+
+    matched = [g for g in groups if any(a != '*' and a in agent for a in g['agents'])]
+    if not matched:
+        matched = [g for g in groups if '*' in g['agents']]
+
+    rules = [rule for g in matched for rule in g['rules']]
+    delays = [g['delay'] for g in matched if g['delay'] is not None]
+    return RobotsRules(rules, max(delays) if delays else None)
+
+
+class RobotsCache(LoggerMixin):
+    """按站点缓存robots规则，支持 redis / memory 两种后端"""
+
+    REDIS_PREFIX = "news_engine:robots:"
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        agent: Optional[str] = None,
+        ttl: Optional[int] = None,
+        negative_ttl: Optional[int] = None,
+        http_client: Optional[PooledHttpClient] = None,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        redis_client: Optional[redis.Redis] = None,
+    ):
+        super().__init__()
+        self.backend = backend or settings.CRAWLER_ROBOTS_BACKEND
+        self.agent = agent or settings.CRAWLER_ROBOTS_AGENT
+        self.ttl = ttl or settings.CRAWLER_ROBOTS_TTL
+        self.negative_ttl = negative_ttl or settings.CRAWLER_ROBOTS_NEGATIVE_TTL
+        self.http_client = http_client
+        self.rate_limiter = rate_limiter
+        self._redis = redis_client
+
+        # 站点 -> (规则, 过期时间)
+        self._local: Dict[str, Tuple[RobotsRules, float]] = {}
+        self._lock = threading.Lock()
+
+        # 统计
+        self.fetches = 0
+        self.blocked = 0
+
+    @staticmethod
+    def origin_of(url: str) -> Optional[str]:
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.netloc:
+            return None
+        return f"{parts.scheme}://{parts.netloc.lower()}"
+
+    def _redis_client(self) -> Optional[redis.Redis]:
+        """获取Redis客户端（不可用时只用本地缓存）"""
+        if self.backend != 'redis':
+            return None
+        return self._redis or get_redis_client()
+
+    def _load_shared(self, origin: str) -> Optional[Dict[str, Any]]:
+        client = self._redis_client()
+        if client is None:
+            return None
+        try:
+            raw = client.get(self.REDIS_PREFIX + origin)
+            return json.loads(raw) if raw else None
+        except redis.RedisError as e:
+            self.log_warning(f"Robots cache read failed: {str(e)}")
+            reset_redis_client()
+            return None
+
+    def _store_shared(self, origin: str, entry: Dict[str, Any], ttl: int):
+        client = self._redis_client()
+        if client is None:
+            return
+        try:
+            client.set(self.REDIS_PREFIX + origin, json.dumps(entry), ex=ttl)
+        except redis.RedisError as e:
+            self.log_warning(f"Robots cache write failed: {str(e)}")
+            reset_redis_client()
+
+    def _fetch(self, origin: str) -> Tuple[Dict[str, Any], int]:
+        """请求robots.txt，返回 (缓存条目, TTL)"""
+        self.fetches += 1
+        client = self.http_client or get_http_client()
+        try:
+            response = client.get(
+                f"{origin}/robots.txt",
+                headers={'User-Agent': settings.CRAWLER_USER_AGENT},
+                timeout=settings.CRAWLER_ROBOTS_TIMEOUT,
+                allow_redirects=True
+            )
+        except Exception as e:
+            # 无法访问时按RFC 9309视为全部禁止，短时间后重试
+            self.log_warning(f"Failed to fetch robots.txt for {origin}: {str(e)}")
+            return {'status': 'disallow_all'}, self.negative_ttl
+
+        if 200 <= response.status_code < 300:
+            body = response.content[:MAX_ROBOTS_SIZE].decode('utf-8', errors='replace')
+            return {'status': 'ok', 'body': body}, self.ttl
+        if 400 <= response.status_code < 500:
+            # 没有robots.txt: 全部允许
+            return {'status': 'allow_all'}, self.ttl
+        return {'status': 'disallow_all'}, self.negative_ttl
+
+    def _compile(self, entry: Dict[str, Any]) -> RobotsRules:
+        status = entry.get('status')
+        if status == 'ok':
+            return parse_robots(entry.get('body', ''), self.agent)
+        if status == 'disallow_all':
+            return DISALLOW_ALL
+        return ALLOW_ALL
+
+    def _apply_crawl_delay(self, origin: str, rules: RobotsRules):
+        """Crawl-delay作为主机速率上限（之后创建的爬虫配置更快的速率时也不会超过）"""
+        if not rules.crawl_delay or rules.crawl_delay <= 0:
+            return
+        limiter = self.rate_limiter or get_rate_limiter()
+        host = urlsplit(origin).hostname or ''
+        limiter.limit_host(host, 1.0 / rules.crawl_delay)
+        self.log_info(f"Applied robots Crawl-delay for {host}", crawl_delay=rules.crawl_delay)
+
+    def get_rules(self, url: str, fetch: bool = True) -> Optional[RobotsRules]:
+        """获取URL所在站点的规则（本地缓存 -> Redis -> 请求robots.txt），fetch=False时不发请求"""
+        origin = self.origin_of(url)
+        if origin is None:
+            return None
+
+        now = time.time()
+        cached = self._local.get(origin)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+
+        entry = self._load_shared(origin)
+        ttl = None
+        if entry is None:
+            if not fetch:
+                return None
+            entry, ttl = self._fetch(origin)
+            self._store_shared(origin, entry, ttl)
+
+        rules = self._compile(entry)
+        local_ttl = ttl or (self.negative_ttl if entry.get('status') == 'disallow_all' else self.ttl)
+        with self._lock:
+            self._local[origin] = (rules, now + local_ttl)
+        self._apply_crawl_delay(origin, rules)
+        return rules
+
+    def allowed(self, url: str, fetch: bool = True) -> bool:
+        """URL是否允许抓取（规则未知且fetch=False时允许）"""
+        rules = self.get_rules(url, fetch=fetch)
+        if rules is None or rules.allowed(url):
+            return True
+        self.blocked += 1
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计"""
+        return {
+            'backend': self.backend,
+            'sites': len(self._local),
+            'fetches': self.fetches,
+            'blocked': self.blocked,
+        }
+
+
+_robots_cache: Optional[RobotsCache] = None
+_robots_cache_lock = threading.Lock()
+
+
+def get_robots_cache() -> RobotsCache:
+    """获取进程级共享robots缓存"""
+    global _robots_cache
+    if _robots_cache is None:
+        with _robots_cache_lock:
+            if _robots_cache is None:
+                _robots_cache = RobotsCache()
+    return _robots_cache
@@ -8,9 +8,18 @@ import re
 from datetime import datetime
 
 from app.crawlers.base_crawler import WebsiteCrawler
+from app.crawlers import normalization
 from app.core.logging import LoggerMixin
 
 
+# 新浪新闻常见的分页模式（页码在第1个分组中）
+PAGE_NUMBER_PATTERNS = [
+    re.compile(r'(\d+)\.s?html?$'),  # 数字.html
+    re.compile(r'page=(\d+)'),  # page=数字
+    re.compile(r'p=(\d+)'),  # p=数字
+]
+
+
 class SinaCrawler(WebsiteCrawler):
     """新浪新闻爬虫"""
     
@@ -31,6 +40,11 @@ class SinaCrawler(WebsiteCrawler):
             'next_page': '.next, .pagination .next, a[rel="next"]',
             'page_numbers': '.pagination a, .page-num a'
         }
+        
+        # 正文容器（作为正文提取的模板提示）
+        self.content_selectors = {
+            'content': '#artibody, .article-content, .content, .main-content, article, .post-content'
+        }
     
     def extract_articles(self, soup: BeautifulSoup, page_url: str) -> List[Dict[str, Any]]:
         """从新浪新闻页面提取文章"""
@@ -67,33 +81,21 @@ class SinaCrawler(WebsiteCrawler):
     def extract_article_data(self, item: BeautifulSoup, page_url: str) -> Optional[Dict[str, Any]]:
         """提取文章数据"""
         try:
-            # 提取标题
-            title = self.extract_text(item, self.article_selectors['title'])
-            
-            # 提取链接
-            link = self.extract_link(item, page_url)
-            
-            # 提取摘要/内容
-            content = self.extract_text(item, self.article_selectors['content'])
-            
-            # 提取作者
-            author = self.extract_text(item, self.article_selectors['author'])
-            
-            # 提取发布时间
-            publish_time = self.extract_text(item, self.article_selectors['publish_time'])
-            
-            # 提取分类
-            category = self.extract_text(item, self.article_selectors['category'])
+            # 一次遍历提取标题、链接、摘要、作者、发布时间、分类
+            fields = self.extract_fields(item, page_url)
+            title = fields['title']
+            link = fields['link']
+            content = fields['content']
+            author = fields['author']
+            publish_time = fields['publish_time']
+            category = fields['category']
             
             # 验证必要字段
             if not title or not link:
                 return None
             
             # 清理和格式化数据
-            title = self.clean_text(title)
-            content = self.clean_text(content)
-            author = self.clean_text(author)
-            category = self.clean_text(category)
+            title, content, author, category = normalization.clean_texts([title, content, author, category])
             
             # 解析发布时间
             parsed_time = self.parse_publish_time(publish_time)
@@ -123,26 +125,13 @@ class SinaCrawler(WebsiteCrawler):
             title = soup.find('title')
             title_text = title.get_text(strip=True) if title else ''
             
-            # 查找主要内容
-            content_selectors = [
-                '.article-content',
-                '.content',
-                '.main-content',
-                'article',
-                '.post-content'
-            ]
-            
-            content = ''
-            for selector in content_selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    content = content_elem.get_text(strip=True)
-                    break
+            # 按文本密度查找主要内容
+            content = self.extract_main_content(soup, page_url)['content']
             
             if title_text and content:
                 return {
                     'title': self.clean_text(title_text),
-                    'content': self.clean_text(content),
+                    'content': content,
                     'url': page_url,
                     'source_id': self.source_id,
                     'source_name': '新浪新闻',
@@ -204,21 +193,14 @@ class SinaCrawler(WebsiteCrawler):
     def infer_next_page_url(self, current_url: str) -> Optional[str]:
         """从URL模式推断下一页"""
         try:
-            # 新浪新闻常见的分页模式
-            patterns = [
-                r'(\d+)\.s?html?$',  # 数字.html
-                r'page=(\d+)',        # page=数字
-                r'p=(\d+)',           # p=数字
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, current_url)
+            for pattern in PAGE_NUMBER_PATTERNS:
+                match = pattern.search(current_url)
                 if match:
                     current_page = int(match.group(1))
                     next_page = current_page + 1
                     
-                    # 替换页码
-                    next_url = re.sub(pattern, str(next_page), current_url)
+                    # 只替换页码本身，保留前后缀
+                    next_url = current_url[:match.start(1)] + str(next_page) + current_url[match.end(1):]
                     
                     # 验证URL
                     if self.is_valid_next_page_url(next_url, current_url):
@@ -231,39 +213,12 @@ class SinaCrawler(WebsiteCrawler):
     
     def clean_text(self, text: str) -> str:
         """清理文本内容"""
-        if not text:
-            return ""
-        
-        # 移除多余的空白字符
-        text = re.sub(r'\s+', ' ', text.strip())
-        
-        # 移除特殊字符
-        text = re.sub(r'[^\w\s\u4e00-\u9fff\-\.\,\!\?]', '', text)
-        
-        return text
+        return normalization.clean_text(text)
     
     def parse_publish_time(self, time_str: str) -> Optional[str]:
-        """解析发布时间"""
+        """解析发布时间，返回带时区的ISO时间；无法识别时原样返回"""
         if not time_str:
             return None
         
-        try:
-            # 新浪新闻常见的时间格式
-            time_patterns = [
-                r'(\d{4}-\d{2}-\d{2})',
-                r'(\d{2}-\d{2})',
-                r'(\d{2}:\d{2})',
-                r'(\d{1,2}小时前)',
-                r'(\d{1,2}分钟前)'
-            ]
-            
-            for pattern in time_patterns:
-                match = re.search(pattern, time_str)
-                if match:
-                    # 这里可以添加更复杂的时间解析逻辑
-                    return time_str
-            
-            return time_str
-        
-        except Exception:
-            return time_str
+        parsed = normalization.parse_publish_time(time_str)
+        return parsed.isoformat() if parsed else time_str
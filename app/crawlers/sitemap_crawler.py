@@ -0,0 +1,314 @@
+"""
+新闻站点地图爬虫
+
+流式解析 sitemap index 和 sitemap（含 Google News 扩展），
+用 lastmod 水位线只产出上次爬取之后新增或更新的URL。
+"""
+import asyncio
+import hashlib
+import threading
+import zlib
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import redis
+from bs4 import BeautifulSoup
+from lxml import etree
+
+from app.config import settings
+from app.core.logging import LoggerMixin
+from app.core.redis_client import get_redis_client, reset_redis_client
+from app.crawlers import normalization
+from app.crawlers.async_fetcher import AsyncFetcher
+from app.crawlers.base_crawler import BaseCrawler
+from app.crawlers.url_canon import canonicalize_url
+
+# 每次从响应中读取的字节数
+CHUNK_SIZE = 64 * 1024
+
+NEWS_NAMESPACE = "http://www.google.com/schemas/sitemap-news/0.9"
+
+# gzip魔数（.xml.gz 站点地图不一定带 Content-Encoding）
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
+def parse_w3c_datetime(value: Optional[str]) -> Optional[datetime]:
+    """解析W3C日期时间（lastmod / publication_date），无时区时按本地时区"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=normalization.TIMEZONE)
+    return parsed
+
+
+def iter_sitemap_entries(chunks: Iterator[bytes]) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """增量解析站点地图，逐条返回 ('sitemap' | 'url', {字段: 文本})，解析过的元素立即释放"""
+    parser = etree.XMLPullParser(events=('end',), resolve_entities=False, no_network=True, huge_tree=True)
+    decompressor = None
+    first = True
+
+    def drain():
+        for _, elem in parser.read_events():
+            tag = etree.QName(elem).localname
+            if tag not in ('url', 'sitemap'):
+                continue
+
+            fields = {}
+            for child in elem.iter():
+                if child is elem or not isinstance(child.tag, str):
+                    continue
+                qname = etree.QName(child)
+                # 同名字段（如image:title）以news扩展为准
+                if child.text and child.text.strip() and (
+                    qname.localname not in fields or qname.namespace == NEWS_NAMESPACE
+                ):
+                    fields[qname.localname] = child.text.strip()
+            yield tag, fields
+
+            # 释放已处理的元素及其前面的兄弟节点
+            elem.clear()
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if first:
+            first = False
+            if chunk.startswith(_GZIP_MAGIC):
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if decompressor is not None:
+            chunk = decompressor.decompress(chunk)
+        parser.feed(chunk)
+        yield from drain()
+
+    if decompressor is not None:
+        parser.feed(decompressor.flush())
+    parser.close()
+    yield from drain()
+
+
+class SitemapWatermarks(LoggerMixin):
+    """按新闻源保存已产出的最新 lastmod，支持 redis / memory 两种后端"""
+
+    REDIS_KEY = "news_engine:sitemap_watermarks"
+
+    def __init__(self, backend: Optional[str] = None, redis_client: Optional[redis.Redis] = None):
+        super().__init__()
+        self.backend = backend or settings.CRAWLER_SITEMAP_STATE_BACKEND
+        self._redis = redis_client
+        self._entries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _redis_client(self) -> Optional[redis.Redis]:
+        """获取Redis客户端（不可用时退化为本地内存）"""
+        if self.backend != 'redis':
+            return None
+        return self._redis or get_redis_client()
+
+    def get(self, source_id: str) -> Optional[datetime]:
+        client = self._redis_client()
+        if client is not None:
+            try:
+                raw = client.hget(self.REDIS_KEY, source_id)
+                return parse_w3c_datetime(raw.decode()) if raw else None
+            except redis.RedisError as e:
+                self.log_warning(f"Sitemap watermark read failed: {str(e)}")
+                reset_redis_client()
+
+        with self._lock:
+            return parse_w3c_datetime(self._entries.get(source_id))
+
+    def set(self, source_id: str, watermark: datetime):
+        client = self._redis_client()
+        if client is not None:
+            try:
+                client.hset(self.REDIS_KEY, source_id, watermark.isoformat())
+                return
+            except redis.RedisError as e:
+                self.log_warning(f"Sitemap watermark write failed: {str(e)}")
+                reset_redis_client()
+
+        with self._lock:
+            self._entries[source_id] = watermark.isoformat()
+
+
+_watermarks: Optional[SitemapWatermarks] = None
+_watermarks_lock = threading.Lock()
+
+
+def get_sitemap_watermarks() -> SitemapWatermarks:
+    """获取进程级共享水位线存储"""
+    global _watermarks
+    if _watermarks is None:
+        with _watermarks_lock:
+            if _watermarks is None:
+                _watermarks = SitemapWatermarks()
+    return _watermarks
+
+
+class SitemapCrawler(BaseCrawler):
+    """新闻站点地图爬虫（source_url 可以是 sitemap index 或 sitemap）"""
+
+    def __init__(self, source_id: str, source_url: str, **kwargs):
+        super().__init__(source_id, source_url, **kwargs)
+        self.watermarks: SitemapWatermarks = kwargs.get('watermarks') or get_sitemap_watermarks()
+        self.source_name = kwargs.get('source_name', '')
+        # 增量由水位线和已见URL过滤器保证，不使用翻页断点
+        self.checkpoints = None
+        self.sitemaps_failed = 0
+
+    def open_sitemap(self, url: str) -> Optional[Any]:
+        """以流式方式请求站点地图（抓取失败时返回None并计入sitemaps_failed，304时响应已关闭）"""
+        response = self.get_page(url, stream=True)
+        if response is None:
+            self.sitemaps_failed += 1
+            return None
+        if response.not_modified:
+            self.pages_not_modified += 1
+            self.log_info(f"Sitemap not modified, skipping: {url}")
+            response.close()
+        return response
+
+    def cached_children(self, url: str) -> List[Tuple[str, Optional[str]]]:
+        """上次完整处理该站点地图时记录的子站点地图 [(loc, lastmod)]"""
+        entry = self.http_cache.lookup(url) if self.http_cache is not None else None
+        return [tuple(child) for child in (entry or {}).get('children', [])]
+
+    def iter_crawl(self) -> Iterator[Dict[str, Any]]:
+        """逐个站点地图流式产出新文章，全部站点地图都成功处理后才推进水位线"""
+        self.begin_crawl()
+        self.sitemaps_failed = 0
+        watermark = self.watermarks.get(self.source_id)
+        newest = watermark
+        pending = deque([self.source_url])
+        queued = {canonicalize_url(self.source_url)}
+
+        def queue_child(loc: str, lastmod: Optional[datetime]):
+            # 子站点地图在水位线之前没有更新就不请求（与水位线同一时刻的仍然请求）
+            child = canonicalize_url(loc)
+            if child not in queued and (watermark is None or lastmod is None or lastmod >= watermark):
+                queued.add(child)
+                pending.append(loc.strip())
+
+        try:
+            while pending and self.pages_crawled < self.max_pages:
+                sitemap_url = pending.popleft()
+                self.log_info(f"Crawling sitemap {self.pages_crawled + 1}: {sitemap_url}")
+
+                response = self.open_sitemap(sitemap_url)
+                if response is None:
+                    continue
+                if response.not_modified:
+                    # sitemap index未变化时子站点地图仍可能更新，按上次记录的子站点地图列表继续检查
+                    for loc, lastmod in self.cached_children(sitemap_url):
+                        queue_child(loc, parse_w3c_datetime(lastmod))
+                    continue
+
+                digest = hashlib.blake2b(digest_size=16)
+                size = 0
+
+                def chunks():
+                    nonlocal size
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        digest.update(chunk)
+                        size += len(chunk)
+                        yield chunk
+
+                batch: List[Dict[str, Any]] = []
+                children: List[Tuple[str, Optional[str]]] = []
+                found = 0
+                try:
+                    for kind, fields in iter_sitemap_entries(chunks()):
+                        loc = fields.get('loc')
+                        if not loc:
+                            continue
+                        lastmod = parse_w3c_datetime(fields.get('lastmod') or fields.get('publication_date'))
+
+                        if kind == 'sitemap':
+                            children.append((loc, fields.get('lastmod')))
+                            queue_child(loc, lastmod)
+                            continue
+
+                        # 与水位线同一时刻的条目可能是上次爬取之后发布的，不跳过，由已见URL过滤器去重
+                        if watermark is not None and lastmod is not None and lastmod < watermark:
+                            continue
+                        if lastmod is not None and (newest is None or lastmod > newest):
+                            newest = lastmod
+
+                        article = self.build_article(loc, fields, lastmod)
+                        if article is not None:
+                            found += 1
+                            batch.append(article)
+                        if len(batch) >= settings.CRAWLER_SITEMAP_BATCH_SIZE:
+                            yield from self.emit_batch(batch)
+                            batch = []
+                    yield from self.emit_batch(batch)
+                finally:
+                    response.close()
+
+                self.pages_crawled += 1
+                self.articles_found += found
+                self.log_info(f"Sitemap {self.pages_crawled} completed, found {found} new entries")
+                if self.http_cache is not None:
+                    self.http_cache.store(sitemap_url, response, digest=digest.hexdigest(), size=size,
+                                          extra={'children': children} if children else None)
+
+            # 所有站点地图都处理完且没有抓取失败才推进水位线，被max_pages截断或有子站点地图失败时下次重新检查
+            if not pending and not self.sitemaps_failed and newest is not None and newest != watermark:
+                self.watermarks.set(self.source_id, newest)
+
+        except Exception as e:
+            self.record_crawl_error(e)
+
+    def emit_batch(self, batch: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """批量去重后产出，下游写出后再记录已见URL"""
+        fresh = self.filter_seen(batch)
+        yield from fresh
+        self.flush_sink()
+        if self.frontier is not None and fresh:
+            self.frontier.add_many([key for key in map(self.article_key, fresh) if key])
+
+    async def aiter_crawl(self, fetcher: AsyncFetcher):
+        """流式解析是同步的，放到线程中执行，不阻塞事件循环"""
+        iterator = self.iter_crawl()
+        done = object()
+        while True:
+            article = await asyncio.to_thread(next, iterator, done)
+            if article is done:
+                break
+            yield article
+
+    def build_article(self, loc: str, fields: Dict[str, str], lastmod: Optional[datetime]) -> Optional[Dict[str, Any]]:
+        """由站点地图条目构造文章（正文由详情抓取阶段补全）"""
+        url = loc.strip()
+        if not self.is_valid_link(url):
+            return None
+
+        published = parse_w3c_datetime(fields.get('publication_date')) or lastmod
+        return {
+            'title': normalization.clean_text(fields.get('title', '')),
+            'content': '',
+            'url': url,
+            'author': '',
+            'publish_time': published.isoformat() if published else None,
+            'category': fields.get('keywords', ''),
+            'source_id': self.source_id,
+            'source_name': self.source_name or fields.get('name', ''),
+            'extracted_at': datetime.utcnow().isoformat()
+        }
+
+    def extract_articles(self, soup: BeautifulSoup, page_url: str) -> List[Dict[str, Any]]:
+        """站点地图不经过HTML解析，见iter_crawl"""
+        return []
+
+    def get_next_page_url(self, soup: BeautifulSoup, current_url: str) -> Optional[str]:
+        """站点地图没有翻页"""
+        return None
@@ -0,0 +1,160 @@
+"""
+URL规范化
+
+同一篇文章常带着不同的跟踪参数、http/https、移动端域名和锚点出现，
+规范化后才能用作去重键和缓存键。规则在加载时编译成集合和正则，
+结果用有界LRU缓存，每个链接都可以调用。
+"""
+import json
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from app.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 所有站点通用的跟踪参数
+DEFAULT_STRIP_PARAMS = (
+    'spm', 'gclid', 'fbclid', 'yclid', 'mc_cid', 'mc_eid',
+    'share_from', 'sharefrom', 'shareto', 'share_token', 'isappinstalled', 'wfr',
+)
+DEFAULT_STRIP_PREFIXES = ('utm_',)
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+class UrlRules:
+    """编译后的站点规范化规则"""
+
+    __slots__ = ('host_aliases', 'force_https', 'strip_params', 'strip_pattern')
+
+    def __init__(
+        self,
+        host_aliases: Optional[Dict[str, str]] = None,
+        force_https: bool = False,
+        strip_params: Iterable[str] = (),
+        strip_prefixes: Iterable[str] = (),
+    ):
+        self.host_aliases = {k.lower(): v.lower() for k, v in (host_aliases or {}).items()}
+        self.force_https = force_https
+        self.strip_params = frozenset(p.lower() for p in (*DEFAULT_STRIP_PARAMS, *strip_params))
+        prefixes = (*DEFAULT_STRIP_PREFIXES, *strip_prefixes)
+        self.strip_pattern = re.compile('|'.join(re.escape(p.lower()) for p in prefixes))
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'UrlRules':
+        return cls(
+            host_aliases=config.get('host_aliases'),
+            force_https=config.get('force_https', False),
+            strip_params=config.get('strip_params', ()),
+            strip_prefixes=config.get('strip_prefixes', ()),
+        )
+
+    def keeps(self, name: str) -> bool:
+        """查询参数是否保留"""
+        name = name.lower()
+        return name not in self.strip_params and not self.strip_pattern.match(name)
+
+
+DEFAULT_RULES = UrlRules()
+
+# 域名后缀 -> 规则（按新闻源配置中的 url_rules.domains 建立）
+_rules_by_domain: Dict[str, UrlRules] = {}
+_rules_lock = threading.Lock()
+_rules_loaded = False
+
+
+def load_url_rules(path: Optional[str] = None) -> Dict[str, UrlRules]:
+    """从新闻源配置文件加载各站点的规范化规则"""
+    path = path or settings.CRAWLER_SOURCES_FILE
+    rules: Dict[str, UrlRules] = {}
+    if not os.path.exists(path):
+        return rules
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Failed to load URL rules from {path}: {str(e)}")
+        return rules
+
+    groups = data.values() if isinstance(data, dict) else [data]
+    for sources in groups:
+        for source in sources if isinstance(sources, list) else []:
+            config = source.get('url_rules')
+            if not config:
+                continue
+            compiled = UrlRules.from_config(config)
+            domains = config.get('domains') or [urlsplit(source.get('url', '')).hostname]
+            for domain in domains:
+                if domain:
+                    rules[domain.lower()] = compiled
+    return rules
+
+
+def set_url_rules(rules: Dict[str, UrlRules]):
+    """替换站点规则（同时清空规范化缓存）"""
+    global _rules_by_domain, _rules_loaded
+    with _rules_lock:
+        _rules_by_domain = dict(rules)
+        _rules_loaded = True
+    canonicalize_url.cache_clear()
+
+
+def rules_for_host(host: str) -> UrlRules:
+    """按域名后缀查找规则（finance.sina.com.cn 命中 sina.com.cn）"""
+    global _rules_by_domain, _rules_loaded
+    if not _rules_loaded:
+        with _rules_lock:
+            if not _rules_loaded:
+                _rules_by_domain = load_url_rules()
+                _rules_loaded = True
+
+    while host:
+        rules = _rules_by_domain.get(host)
+        if rules is not None:
+            return rules
+        _, _, host = host.partition('.')
+    return DEFAULT_RULES
+
+
+@lru_cache(maxsize=settings.CRAWLER_URL_CANON_CACHE_SIZE)
+def canonicalize_url(url: str) -> str:
+    """规范化URL: 小写协议和域名、去默认端口、域名别名、去跟踪参数、参数排序、去锚点"""
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').rstrip('.')
+    if not host or scheme not in _DEFAULT_PORTS:
+        return url
+
+    rules = rules_for_host(host)
+    host = rules.host_aliases.get(host, host)
+    if rules.force_https:
+        scheme = 'https'
+        if port == 80:
+            port = None
+
+    netloc = host
+    if port is not None and port != _DEFAULT_PORTS[scheme]:
+        netloc = f"{host}:{port}"
+    if parts.username:
+        userinfo = parts.username + (f":{parts.password}" if parts.password else '')
+        netloc = f"{userinfo}@{netloc}"
+
+    query = ''
+    if parts.query:
+        # 不重新编码参数，只按名称过滤并排序
+        params = [p for p in parts.query.split('&') if p and rules.keeps(p.split('=', 1)[0])]
+        query = '&'.join(sorted(params))
+
+    return urlunsplit((scheme, netloc, parts.path or '/', query, ''))
@@ -11,6 +11,7 @@ class NewsSourceType(str, Enum):
     """新闻源类型"""
     WEBSITE = "website"
     RSS = "rss"
+    SITEMAP = "sitemap"
     API = "api"
     SOCIAL_MEDIA = "social_media"
 
@@ -43,8 +44,11 @@ class NewsSource(BaseModel):
     url: HttpUrl = Field(..., description="新闻源URL")
     type: NewsSourceType = Field(..., description="新闻源类型")
     parser: str = Field(..., description="解析器名称")
+    parser_backend: Optional[str] = Field(None, description="HTML解析后端(bs4/lxml/selectolax)")
     is_active: bool = Field(True, description="是否激活")
     crawl_interval: int = Field(300, description="爬取间隔(秒)")
+    rate_limit: Optional[float] = Field(None, description="单主机请求速率(次/秒)")
+    rate_burst: Optional[int] = Field(None, description="单主机突发请求数")
     last_crawl_time: Optional[datetime] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,241 @@
+"""
+文章批处理
+
+按微批处理文章: 每批从文章存储一次读取，各阶段对整批执行，再一次批量写回各阶段改动的字段
+（按字段写回，不覆盖详情抓取阶段同时写入的正文）。
+每个阶段记录每批耗时，供任务元数据上报。
+文章ID即文章存储中的文章URL。
+"""
+import hashlib
+import re
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config import settings
+from app.core.logging import LoggerMixin
+from app.crawlers import normalization
+from app.models.news import NewsCategory
+from app.storage.article_store import ArticleStore, ArticleStoreError, get_article_store
+
+# 分类关键词（标题和关键词中出现次数最多的分类胜出）
+CATEGORY_KEYWORDS: Dict[str, List[str]] = {
+    NewsCategory.POLITICS.value: ['政府', '政策', '会议', '部长', '外交', '人大', '政协', '改革'],
+    NewsCategory.ECONOMY.value: ['经济', '市场', '股市', '金融', '银行', '投资', '同比增长', '企业', 'GDP'],
+    NewsCategory.TECHNOLOGY.value: ['科技', '人工智能', '芯片', '互联网', '5G', '新能源', '技术', 'AI'],
+    NewsCategory.SPORTS.value: ['体育', '赛事', '比赛', '冠军', '足球', '篮球', '奥运'],
+    NewsCategory.ENTERTAINMENT.value: ['电影', '明星', '综艺', '演唱会', '票房'],
+    NewsCategory.HEALTH.value: ['健康', '医院', '疫苗', '医疗', '疾病'],
+    NewsCategory.EDUCATION.value: ['教育', '学校', '高考', '学生', '大学'],
+    NewsCategory.INTERNATIONAL.value: ['国际', '联合国', '美国', '欧盟', '海外'],
+}
+
+_CATEGORY_VALUES = {category.value for category in NewsCategory}
+
+# 情感词（基线词典，只用于粗略打分）
+POSITIVE_WORDS = ('增长', '突破', '成功', '利好', '提升', '创新', '获奖', '冠军', '回暖', '稳定')
+NEGATIVE_WORDS = ('下跌', '事故', '亏损', '失败', '危机', '违法', '死亡', '下滑', '暴跌', '处罚')
+
+# 没有jieba时的关键词候选: 2-4个汉字或3个以上字母
+_TERM_RE = re.compile(r'[\u4e00-\u9fff]{2,4}|[A-Za-z][A-Za-z0-9]{2,}')
+
+MAX_KEYWORDS = 5
+
+# 结果中保留的缺失/失败文章明细条数（其余只计数，避免大批量失败时任务结果膨胀）
+MAX_RESULT_SAMPLES = 20
+
+
+def _keyword_extractor() -> Optional[Callable[[str], List[str]]]:
+    """jieba可用时使用TF-IDF关键词提取"""
+    try:
+        import jieba.analyse
+    except ImportError:
+        return None
+    return lambda text: jieba.analyse.extract_tags(text, topK=MAX_KEYWORDS)
+
+
+class StageTimings:
+    """各阶段的按批耗时统计"""
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, stage: str, seconds: float, items: int):
+        stats = self._stats.setdefault(stage, {'batches': 0, 'items': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        ms = seconds * 1000
+        stats['batches'] += 1
+        stats['items'] += items
+        stats['total_ms'] += ms
+        stats['max_ms'] = max(stats['max_ms'], ms)
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {
+            stage: dict(stats, avg_ms=stats['total_ms'] / stats['batches'])
+            for stage, stats in self._stats.items()
+        }
+
+
+class BatchProcessor(LoggerMixin):
+    """文章微批处理器"""
+
+    STAGES = (
+        'content_cleaning',
+        'duplicate_detection',
+        'keyword_extraction',
+        'category_classification',
+        'sentiment_analysis',
+    )
+
+    def __init__(
+        self,
+        store: Optional[ArticleStore] = None,
+        batch_size: Optional[int] = None,
+        stages: Optional[List[str]] = None,
+    ):
+        super().__init__()
+        self.store = store or get_article_store()
+        self.batch_size = batch_size or settings.PROCESSOR_BATCH_SIZE
+        self.stages = list(stages or self.STAGES)
+        unknown = [stage for stage in self.stages if stage not in self.STAGES]
+        if unknown:
+            raise ValueError(f"Unknown processing stages: {', '.join(unknown)} (available: {', '.join(self.STAGES)})")
+        self.extract_keywords = _keyword_extractor() or self.frequent_terms
+        # 本次处理中已见过的正文哈希 -> 文章URL（跨批去重）
+        self._content_hashes: Dict[str, str] = {}
+
+    def process(
+        self,
+        article_ids: List[str],
+        on_batch: Optional[Callable[[Dict[str, Any]], Any]] = None
+    ) -> Dict[str, Any]:
+        """按批处理文章，on_batch在每批完成后收到当前进度和各阶段耗时（结果中的缺失/失败明细最多保留MAX_RESULT_SAMPLES条）"""
+        timings = StageTimings()
+        processed = duplicates = missing_count = failed_count = 0
+        missing: List[str] = []
+        failed: List[Dict[str, str]] = []
+
+        for start in range(0, len(article_ids), self.batch_size):
+            ids = article_ids[start:start + self.batch_size]
+            try:
+                batch, batch_missing = self.fetch(ids, timings)
+                missing_count += len(batch_missing)
+                missing.extend(batch_missing[:MAX_RESULT_SAMPLES - len(missing)])
+                if batch:
+                    originals = [dict(article) for article in batch]
+                    for stage in self.stages:
+                        begin = time.perf_counter()
+                        getattr(self, stage)(batch)
+                        timings.record(stage, time.perf_counter() - begin, len(batch))
+                    self.write(batch, originals, timings)
+                    processed += len(batch)
+                    duplicates += sum(1 for article in batch if article.get('duplicate_of'))
+            except ArticleStoreError:
+                # 存储不可用时后续批次也会失败，由任务整体重试
+                raise
+            except Exception as e:
+                # 一批失败不影响后续批次
+                self.log_error(f"Failed to process batch of {len(ids)} articles: {str(e)}")
+                failed_count += len(ids)
+                failed.extend(
+                    {'article_id': article_id, 'error': str(e)}
+                    for article_id in ids[:MAX_RESULT_SAMPLES - len(failed)]
+                )
+
+            self.log_info("Processed article batch", batch_size=len(ids), done=min(start + len(ids), len(article_ids)))
+            if on_batch is not None:
+                on_batch({
+                    'total_articles': len(article_ids),
+                    'done': min(start + len(ids), len(article_ids)),
+                    'timings': timings.as_dict(),
+                })
+
+        return {
+            'total_articles': len(article_ids),
+            'processed_count': processed,
+            'failed_count': failed_count,
+            'missing_count': missing_count,
+            'duplicate_count': duplicates,
+            'batch_size': self.batch_size,
+            'timings': timings.as_dict(),
+            'missing': missing,
+            'failed': failed,
+        }
+
+    def fetch(self, ids: List[str], timings: StageTimings):
+        """一次读取整批文章，返回 (文章列表, 不存在的ID)"""
+        begin = time.perf_counter()
+        articles = self.store.get_many(ids)
+        timings.record('fetch', time.perf_counter() - begin, len(ids))
+        batch = [article for article in articles if article is not None]
+        missing = [article_id for article_id, article in zip(ids, articles) if article is None]
+        return batch, missing
+
+    def write(self, batch: List[Dict[str, Any]], originals: List[Dict[str, Any]], timings: StageTimings):
+        """一次批量写回整批文章中各阶段改动过的字段"""
+        begin = time.perf_counter()
+        processed_at = datetime.utcnow().isoformat()
+        updates = []
+        for article, original in zip(batch, originals):
+            article['processing_status'] = 'processed'
+            article['processed_at'] = processed_at
+            update = {
+                field: value for field, value in article.items()
+                if field not in original or original[field] != value
+            }
+            updates.append(dict(update, url=article['url']))
+        self.store.update_many(updates)
+        timings.record('write', time.perf_counter() - begin, len(batch))
+
+    def content_cleaning(self, batch: List[Dict[str, Any]]):
+        """标题去特殊字符，正文/摘要合并空白（保留标点）"""
+        titles = normalization.clean_texts(article.get('title') for article in batch)
+        for article, title in zip(batch, titles):
+            article['title'] = title
+            for field in ('content', 'summary'):
+                if article.get(field):
+                    article[field] = normalization.collapse_whitespace(article[field])
+
+    def duplicate_detection(self, batch: List[Dict[str, Any]]):
+        """正文完全相同（忽略空白）的文章标记为重复"""
+        for article in batch:
+            text = ''.join((article.get('content') or article.get('title') or '').split())
+            if not text:
+                continue
+            digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+            article['content_hash'] = digest
+            first = self._content_hashes.setdefault(digest, article['url'])
+            if first != article['url']:
+                article['duplicate_of'] = first
+
+    def keyword_extraction(self, batch: List[Dict[str, Any]]):
+        for article in batch:
+            text = f"{article.get('title', '')} {article.get('content', '')}"
+            article['keywords'] = self.extract_keywords(text)
+
+    @staticmethod
+    def frequent_terms(text: str) -> List[str]:
+        """没有分词器时按词频取关键词候选"""
+        return [term for term, _ in Counter(_TERM_RE.findall(text)).most_common(MAX_KEYWORDS)]
+
+    def category_classification(self, batch: List[Dict[str, Any]]):
+        """按分类关键词命中数分类（已有分类时保留）"""
+        for article in batch:
+            if article.get('category') in _CATEGORY_VALUES:
+                continue
+            text = f"{article.get('title', '')} {' '.join(article.get('keywords', []))}"
+            scores = {category: sum(text.count(word) for word in words)
+                      for category, words in CATEGORY_KEYWORDS.items()}
+            best = max(scores, key=scores.get)
+            article['category'] = best if scores[best] else NewsCategory.OTHER.value
+
+    def sentiment_analysis(self, batch: List[Dict[str, Any]]):
+        """情感词典打分，得分在 [-1, 1]"""
+        for article in batch:
+            text = f"{article.get('title', '')} {article.get('content', '')}"
+            positive = sum(text.count(word) for word in POSITIVE_WORDS)
+            negative = sum(text.count(word) for word in NEGATIVE_WORDS)
+            total = positive + negative
+            score = (positive - negative) / total if total else 0.0
+            article['sentiment_score'] = round(score, 3)
+            article['sentiment_label'] = 'positive' if score > 0.2 else 'negative' if score < -0.2 else 'neutral'
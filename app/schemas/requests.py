@@ -37,7 +37,10 @@ class NewsSourceCreateRequest(BaseModel):
     url: str = Field(..., description="新闻源URL")
     type: NewsSourceType = Field(..., description="新闻源类型")
     parser: str = Field(..., description="解析器名称")
+    parser_backend: Optional[str] = Field(None, description="HTML解析后端(bs4/lxml/selectolax)")
     crawl_interval: int = Field(300, ge=60, description="爬取间隔(秒)")
+    rate_limit: Optional[float] = Field(None, gt=0, description="单主机请求速率(次/秒)")
+    rate_burst: Optional[int] = Field(None, ge=1, description="单主机突发请求数")
     
     class Config:
         schema_extra = {
@@ -57,8 +60,11 @@ class NewsSourceUpdateRequest(BaseModel):
     url: Optional[str] = Field(None, description="新闻源URL")
     type: Optional[NewsSourceType] = Field(None, description="新闻源类型")
     parser: Optional[str] = Field(None, description="解析器名称")
+    parser_backend: Optional[str] = Field(None, description="HTML解析后端(bs4/lxml/selectolax)")
     is_active: Optional[bool] = Field(None, description="是否激活")
     crawl_interval: Optional[int] = Field(None, ge=60, description="爬取间隔(秒)")
+    rate_limit: Optional[float] = Field(None, gt=0, description="单主机请求速率(次/秒)")
+    rate_burst: Optional[int] = Field(None, ge=1, description="单主机突发请求数")
 
 
 class CrawlerTaskRequest(BaseModel):
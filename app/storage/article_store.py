@@ -0,0 +1,201 @@
+"""
+文章存储
+
+按规范化URL保存爬虫产出的文章，详情抓取、批处理等后续阶段按URL读取并写回字段。
+redis后端每篇文章一个Hash（字段值为JSON），写回按字段HSET，并发写回不同字段时互不覆盖。
+文章会被其他进程读取，所以Redis读写失败时抛出ArticleStoreError而不是退化为进程内存储，由任务重试；
+memory后端只用于测试或单进程部署，需显式配置。
+"""
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import redis
+
+from app.config import settings
+from app.core.logging import LoggerMixin
+from app.core.redis_client import get_redis_client, reset_redis_client
+from app.crawlers.url_canon import canonicalize_url
+
+
+class ArticleStoreError(RuntimeError):
+    """文章存储不可用（任务应重试，不能把其他进程读不到的文章当作已写入）"""
+
+
+class ArticleStore(LoggerMixin):
+    """文章存储，支持 redis / memory 两种后端"""
+
+    # Hash格式与旧版的JSON字符串不同，换前缀避免读到旧值时WRONGTYPE
+    REDIS_PREFIX = "news_engine:article_fields:"
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        ttl: Optional[int] = None,
+        redis_client: Optional[redis.Redis] = None,
+    ):
+        super().__init__()
+        self.backend = backend or settings.ARTICLE_STORE_BACKEND
+        self.ttl = ttl or settings.ARTICLE_STORE_TTL
+        self._redis = redis_client
+        # 规范化URL -> (文章, 写入时间)
+        self._entries: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_of(article: Dict[str, Any]) -> Optional[str]:
+        url = article.get('url')
+        return canonicalize_url(url) if url else None
+
+    def _redis_client(self) -> redis.Redis:
+        """获取Redis客户端（不可用时抛出ArticleStoreError）"""
+        client = self._redis or get_redis_client()
+        if client is None:
+            raise ArticleStoreError("Redis is unavailable for the article store")
+        return client
+
+    @staticmethod
+    def _encode(article: Dict[str, Any]) -> Dict[str, str]:
+        return {field: json.dumps(value, ensure_ascii=False) for field, value in article.items()}
+
+    @staticmethod
+    def _decode(fields: Dict[bytes, bytes]) -> Optional[Dict[str, Any]]:
+        if not fields:
+            return None
+        return {
+            (field.decode() if isinstance(field, bytes) else field): json.loads(value)
+            for field, value in fields.items()
+        }
+
+    def _keyed(self, articles: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """按规范化URL归并（同一批中同一URL后出现的覆盖先出现的）"""
+        entries: Dict[str, Dict[str, Any]] = {}
+        for article in articles:
+            key = self.key_of(article)
+            if key:
+                entries.setdefault(key, {}).update(article)
+        return entries
+
+    def get_many(self, urls: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """按URL批量读取文章（不存在或已过期时为None）"""
+        keys = [canonicalize_url(url) for url in urls]
+        if self.backend == 'redis':
+            try:
+                pipe = self._redis_client().pipeline(transaction=False)
+                for key in keys:
+                    pipe.hgetall(self.REDIS_PREFIX + key)
+                return [self._decode(fields) for fields in pipe.execute()]
+            except redis.RedisError as e:
+                reset_redis_client()
+                raise ArticleStoreError(f"Article store read failed: {str(e)}") from e
+
+        now = time.time()
+        with self._lock:
+            results = []
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and now - entry[1] > self.ttl:
+                    del self._entries[key]
+                    entry = None
+                results.append(dict(entry[0]) if entry is not None else None)
+            return results
+
+    def save_many(self, articles: List[Dict[str, Any]]) -> int:
+        """批量写入文章（同一URL整条覆盖），返回写入条数"""
+        return self._write(articles, replace=True)
+
+    def update_many(self, updates: List[Dict[str, Any]]) -> int:
+        """把字段合并到已保存的文章中（只写给出的字段，没有保存过的文章直接写入），返回写入条数"""
+        return self._write(updates, replace=False)
+
+    def _write(self, articles: List[Dict[str, Any]], replace: bool) -> int:
+        entries = self._keyed(articles)
+        if not entries:
+            return 0
+
+        if self.backend == 'redis':
+            try:
+                pipe = self._redis_client().pipeline(transaction=True)
+                for key, article in entries.items():
+                    if replace:
+                        pipe.delete(self.REDIS_PREFIX + key)
+                    pipe.hset(self.REDIS_PREFIX + key, mapping=self._encode(article))
+                    pipe.expire(self.REDIS_PREFIX + key, self.ttl)
+                pipe.execute()
+                return len(entries)
+            except redis.RedisError as e:
+                reset_redis_client()
+                raise ArticleStoreError(f"Article store write failed: {str(e)}") from e
+
+        now = time.time()
+        with self._lock:
+            for key, article in entries.items():
+                current = self._entries.get(key)
+                if replace or current is None or now - current[1] > self.ttl:
+                    self._entries[key] = (dict(article), now)
+                else:
+                    self._entries[key] = (dict(current[0], **article), now)
+        return len(entries)
+
+
+class ArticleBatchWriter:
+    """爬虫sink: 把逐条产出的文章攒批写入存储，每批写入后回调（如按批投递详情抓取）"""
+
+    def __init__(
+        self,
+        store: Optional[ArticleStore] = None,
+        batch_size: Optional[int] = None,
+        on_flush: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+    ):
+        self.store = store or get_article_store()
+        self.batch_size = batch_size or settings.CRAWLER_DETAIL_BATCH_SIZE
+        self.on_flush = on_flush
+        self._batch: List[Dict[str, Any]] = []
+        # 第一次写入失败的异常（爬虫把sink异常记入errors后停止，任务据此决定是否重试）
+        self.error: Optional[Exception] = None
+
+        # 统计
+        self.written = 0
+        self.batches = 0
+
+    def __call__(self, article: Dict[str, Any]):
+        self._batch.append(article)
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """写入当前批次（爬取结束后调用一次，写出不足一批的剩余文章）"""
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        try:
+            self.written += self.store.save_many(batch)
+            self.batches += 1
+            if self.on_flush is not None:
+                self.on_flush(batch)
+        except Exception as e:
+            if self.error is None:
+                self.error = e
+            raise
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取统计"""
+        return {
+            'written': self.written,
+            'batches': self.batches,
+        }
+
+
+_article_store: Optional[ArticleStore] = None
+_article_store_lock = threading.Lock()
+
+
+def get_article_store() -> ArticleStore:
+    """获取进程级共享文章存储"""
+    global _article_store
+    if _article_store is None:
+        with _article_store_lock:
+            if _article_store is None:
+                _article_store = ArticleStore()
+    return _article_store
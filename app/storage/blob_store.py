@@ -0,0 +1,247 @@
+"""
+文章载荷存储（claim-check）
+
+爬虫任务把每批文章写入载荷存储，只把引用（"<key>#<part>"）交给broker和结果后端，
+下游任务按引用读取。这样无论一次爬取有多大，broker消息和任务结果都只有几十字节。
+
+后端:
+  redis  每个key一个Redis Stream，每批一个条目（XADD），整个stream按TTL过期
+  file   每个key一个本地分段文件（JSON lines），每批一行，引用记录偏移和长度；
+         只适用于所有worker共享同一磁盘的部署
+  memory 进程内（只用于测试或单进程部署，需显式配置）
+
+引用会发布给其他进程，所以redis/file后端读写失败时抛出BlobStoreError而不是退化为进程内存储，
+由任务重试。
+"""
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import redis
+
+from app.config import settings
+from app.core.logging import LoggerMixin
+from app.core.redis_client import get_redis_client, reset_redis_client
+
+Batch = List[Dict[str, Any]]
+
+
+class BlobStoreError(RuntimeError):
+    """载荷存储不可用（任务应重试，不能发布其他进程读不到的引用）"""
+
+
+class BlobStore(LoggerMixin):
+    """按key分段保存文章批次，支持 redis / file / memory 三种后端"""
+
+    REDIS_PREFIX = "news_engine:blob:"
+    SEGMENT_SUFFIX = ".jsonl"
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        path: Optional[str] = None,
+        ttl: Optional[int] = None,
+        redis_client: Optional[redis.Redis] = None,
+    ):
+        super().__init__()
+        self.backend = backend or settings.BLOB_STORE_BACKEND
+        self.path = path or settings.BLOB_STORE_PATH
+        self.ttl = ttl or settings.BLOB_STORE_TTL
+        self._redis = redis_client
+        # key -> (批次列表, 创建时间)
+        self._entries: Dict[str, Tuple[List[Batch], float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def split_ref(ref: str) -> Tuple[str, Optional[str]]:
+        """引用拆成 (key, 批次)；不带批次的引用指向key下的全部批次"""
+        key, _, part = ref.partition('#')
+        return key, part or None
+
+    def _redis_client(self) -> redis.Redis:
+        """获取Redis客户端（不可用时抛出BlobStoreError）"""
+        client = self._redis or get_redis_client()
+        if client is None:
+            raise BlobStoreError("Redis is unavailable for the blob store")
+        return client
+
+    def _segment_path(self, key: str) -> str:
+        return os.path.join(self.path, key.replace('/', '_').replace(':', '_') + self.SEGMENT_SUFFIX)
+
+    # ---------- 写入 ----------
+
+    def append(self, key: str, articles: Batch) -> str:
+        """把一批文章追加到key下，返回这一批的引用"""
+        if self.backend == 'redis':
+            data = json.dumps(articles, ensure_ascii=False)
+            try:
+                pipe = self._redis_client().pipeline(transaction=False)
+                pipe.xadd(self.REDIS_PREFIX + key, {'d': data})
+                pipe.expire(self.REDIS_PREFIX + key, self.ttl)
+                entry_id = pipe.execute()[0]
+            except redis.RedisError as e:
+                reset_redis_client()
+                raise BlobStoreError(f"Blob store write failed for {key}: {str(e)}") from e
+            if isinstance(entry_id, bytes):
+                entry_id = entry_id.decode()
+            return f"{key}#{entry_id}"
+
+        if self.backend == 'file':
+            try:
+                return self._append_segment(key, json.dumps(articles, ensure_ascii=False))
+            except OSError as e:
+                raise BlobStoreError(f"Blob segment write failed for {key}: {str(e)}") from e
+
+        with self._lock:
+            batches = self._entries.setdefault(key, ([], time.time()))[0]
+            batches.append([dict(article) for article in articles])
+            return f"{key}#{len(batches) - 1}"
+
+    def _append_segment(self, key: str, data: str) -> str:
+        """追加一行到分段文件，引用记录 偏移+长度"""
+        path = self._segment_path(key)
+        line = (data + '\n').encode('utf-8')
+        with self._lock:
+            if not os.path.exists(path):
+                # 每次新建分段时顺带清理过期分段
+                os.makedirs(self.path, exist_ok=True)
+                self._purge_segments()
+            with open(path, 'ab') as f:
+                offset = f.tell()
+                f.write(line)
+        return f"{key}#{offset}+{len(line)}"
+
+    # ---------- 读取 ----------
+
+    def get(self, ref: str) -> Batch:
+        """按引用读取文章（不存在或已过期时为空列表）"""
+        articles: Batch = []
+        for batch in self.iter_batches(ref):
+            articles.extend(batch)
+        return articles
+
+    def iter_batches(self, ref: str) -> Iterator[Batch]:
+        """按引用逐批读取，整个key的引用不会一次性载入全部批次"""
+        key, part = self.split_ref(ref)
+
+        if self.backend == 'redis':
+            client = self._redis_client()
+            try:
+                if part is not None:
+                    entries = client.xrange(self.REDIS_PREFIX + key, min=part, max=part)
+                    for _, fields in entries:
+                        yield json.loads(fields[b'd'])
+                    return
+                yield from self._iter_stream(client, key)
+                return
+            except redis.RedisError as e:
+                reset_redis_client()
+                raise BlobStoreError(f"Blob store read failed for {key}: {str(e)}") from e
+
+        if self.backend == 'file':
+            yield from self._iter_segment(key, part)
+            return
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[1] > self.ttl:
+                del self._entries[key]
+                entry = None
+            batches = list(entry[0]) if entry is not None else []
+        if part is not None:
+            index = int(part)
+            batches = batches[index:index + 1]
+        for batch in batches:
+            yield [dict(article) for article in batch]
+
+    def _iter_stream(self, client: redis.Redis, key: str, count: int = 100) -> Iterator[Batch]:
+        """分页读取整个stream（每次XRANGE最多count条）"""
+        start = '-'
+        while True:
+            entries = client.xrange(self.REDIS_PREFIX + key, min=start, max='+', count=count)
+            for _, fields in entries:
+                yield json.loads(fields[b'd'])
+            if len(entries) < count:
+                return
+            last_id = entries[-1][0].decode() if isinstance(entries[-1][0], bytes) else entries[-1][0]
+            start = '(' + last_id
+
+    def _iter_segment(self, key: str, part: Optional[str]) -> Iterator[Batch]:
+        """读取分段文件中的一行或全部行"""
+        path = self._segment_path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return
+            with open(path, 'rb') as f:
+                if part is not None:
+                    offset, _, length = part.partition('+')
+                    f.seek(int(offset))
+                    yield json.loads(f.read(int(length)))
+                    return
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            raise BlobStoreError(f"Blob segment read failed for {key}: {str(e)}") from e
+
+    # ---------- 清理 ----------
+
+    def delete(self, key: str):
+        """下游处理完后删除key下的全部批次"""
+        # 删除失败不影响调用方，载荷到TTL后自然过期
+        if self.backend == 'redis':
+            try:
+                self._redis_client().delete(self.REDIS_PREFIX + key)
+            except (BlobStoreError, redis.RedisError) as e:
+                self.log_warning(f"Blob store delete failed for {key}: {str(e)}")
+            return
+
+        if self.backend == 'file':
+            try:
+                os.remove(self._segment_path(key))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.log_warning(f"Blob segment delete failed for {key}: {str(e)}")
+            return
+
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _purge_segments(self) -> int:
+        """删除超过TTL未写入的分段文件（调用方持有锁）"""
+        removed = 0
+        now = time.time()
+        try:
+            names = os.listdir(self.path)
+        except OSError:
+            return 0
+        for name in names:
+            if not name.endswith(self.SEGMENT_SUFFIX):
+                continue
+            path = os.path.join(self.path, name)
+            try:
+                if now - os.path.getmtime(path) > self.ttl:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+
+_blob_store: Optional[BlobStore] = None
+_blob_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    """获取进程级共享载荷存储"""
+    global _blob_store
+    if _blob_store is None:
+        with _blob_store_lock:
+            if _blob_store is None:
+                _blob_store = BlobStore()
+    return _blob_store
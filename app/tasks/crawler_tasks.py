@@ -1,45 +1,90 @@
 """
 爬虫任务模块
 """
-from typing import Dict, Any, List
-import time
-from datetime import datetime
+from typing import Dict, Any, List, Union
+import asyncio
+from datetime import datetime, timedelta
+
+from celery.exceptions import Retry
 
 from app.celery_app import celery_app
+from app.config import settings
 from app.core.logging import get_logger, log_task_status
 
 logger = get_logger(__name__)
 
+# 任务结果中保留的错误明细条数（其余只计数，避免大规模失败时结果膨胀）
+MAX_RESULT_ERRORS = 20
+
 
 @celery_app.task(bind=True, name="crawler.start_crawler_task")
 def start_crawler_task(self, source_id: str, **kwargs) -> Dict[str, Any]:
-    """启动爬虫任务"""
+    """启动爬虫任务（kwargs: source 新闻源配置, force_crawl, max_pages）
+
+    不传source时按source_id从新闻源配置文件（CRAWLER_SOURCES_FILE）查找；
+    通过API创建的新闻源只保存在API进程内，由调用方随任务传入完整配置。
+    结果中的payload是载荷存储的key，保留BLOB_STORE_TTL秒（到payload_expires_at为止），
+    下游任务（process_news_task的payload_ref）须在此之前读取，过期后读到的是空列表。
+    """
     task_id = self.request.id
     log_task_status(task_id, "start_crawler_task", "started")
     
     try:
         logger.info(f"Starting crawler task for source: {source_id}")
         
-        # TODO: 从数据库获取新闻源信息
-        # source_info = await source_service.get_source_by_id(source_id)
+        from app.crawlers.registry import find_configured_source, get_crawler_registry
+        
+        source_info = kwargs.get('source') or find_configured_source(source_id)
         
-        # TODO: 验证新闻源是否存在和激活
-        # if not source_info or not source_info.is_active:
-        #     error_msg = f"Source {source_id} not found or not active"
-        #     logger.error(error_msg)
-        #     log_task_status(task_id, "start_crawler_task", "failed")
-        #     return {
-        #         'status': 'error',
-        #         'message': error_msg,
-        #         'source_id': source_id,
-        #         'task_id': task_id
-        #     }
+        # 验证新闻源是否存在和激活
+        if not source_info or not source_info.get('is_active', True):
+            error_msg = f"Source {source_id} not found or not active"
+            logger.error(error_msg)
+            log_task_status(task_id, "start_crawler_task", "failed")
+            return {
+                'status': 'error',
+                'message': error_msg,
+                'source_id': source_id,
+                'task_id': task_id
+            }
         
-        # TODO: 创建爬虫实例并执行爬取
-        # crawler = await create_crawler_instance(source_id, **kwargs)
-        # result = await crawler.crawl()
+        from app.storage.article_store import ArticleBatchWriter, ArticleStoreError
+        from app.storage.blob_store import BlobStoreError, get_blob_store
         
-        logger.info(f"Crawler task completed for source: {source_id}")
+        # 产出的文章按批写入文章存储和载荷存储（key为任务ID），detail队列只收到这一批的引用
+        blob_store = get_blob_store()
+        writer = ArticleBatchWriter(on_flush=lambda batch: enqueue_details(blob_store.append(task_id, batch)))
+        
+        # 复用本进程中已配置好的爬虫实例（crawl_id使用任务ID，重新投递时从断点继续）
+        try:
+            with get_crawler_registry().lease(
+                dict(source_info, id=source_id),
+                crawl_id=task_id,
+                force_crawl=kwargs.get('force_crawl', False),
+                max_pages=kwargs.get('max_pages')
+            ) as crawler:
+                result = crawler.crawl(sink=writer)
+            writer.flush()
+        except (ArticleStoreError, BlobStoreError):
+            pass
+        if isinstance(writer.error, (ArticleStoreError, BlobStoreError)):
+            # 文章或载荷写不进去时不能发布引用；失败批次所在页面没有提交，重试（同一任务ID）从断点重新产出
+            raise self.retry(exc=writer.error, countdown=settings.BLOB_STORE_RETRY_DELAY)
+        result['stored'] = writer.get_stats()
+        # 任务结果只带载荷引用和统计，下游任务按引用读取全部文章
+        result['payload'] = task_id if writer.batches else None
+        result['payload_expires_at'] = (
+            (datetime.utcnow() + timedelta(seconds=blob_store.ttl)).isoformat() if writer.batches else None
+        )
+        errors = result['errors']
+        result['error_count'] = len(errors)
+        result['errors'] = errors[:MAX_RESULT_ERRORS]
+        
+        logger.info(
+            f"Crawler task completed for source: {source_id}",
+            articles_processed=result['articles_processed'],
+            pages_crawled=result['pages_crawled']
+        )
         
         log_task_status(task_id, "start_crawler_task", "completed")
         
@@ -47,15 +92,12 @@ def start_crawler_task(self, source_id: str, **kwargs) -> Dict[str, Any]:
             'status': 'success',
             'message': f"Crawler task completed for source: {source_id}",
             'source_id': source_id,
-            'result': {
-                'articles_found': 0,
-                'articles_processed': 0,
-                'pages_crawled': 0,
-                'crawl_time': time.time()
-            },
+            'result': result,
             'task_id': task_id
         }
         
+    except Retry:
+        raise
     except Exception as e:
         error_msg = f"Crawler task failed for source {source_id}: {str(e)}"
         logger.error(error_msg, exc_info=True)
@@ -83,9 +125,10 @@ def schedule_crawler_task(self) -> Dict[str, Any]:
         # TODO: 获取所有激活的新闻源
         # active_sources = await source_service.get_active_sources()
         
-        # TODO: 根据爬取间隔和最后爬取时间决定是否启动爬虫
+        # TODO: 根据爬取间隔和最后爬取时间决定是否启动爬虫（主机熔断中的新闻源跳过）
+        # breaker = get_circuit_breaker()
         # for source in active_sources:
-        #     if should_crawl_source(source):
+        #     if should_crawl_source(source) and not breaker.is_open(source.url):
         #         start_crawler_task.delay(source.id)
         
         logger.info("Scheduled crawler task completed")
@@ -151,3 +194,102 @@ def batch_crawler_task(self, source_ids: List[str], **kwargs) -> Dict[str, Any]:
             'task_id': task_id,
             'error': str(e)
         }
+
+
+@celery_app.task(bind=True, name="crawler.probe_circuits_task")
+def probe_circuits_task(self) -> Dict[str, Any]:
+    """探测熔断中的主机是否恢复"""
+    task_id = self.request.id
+    log_task_status(task_id, "probe_circuits_task", "started")
+    
+    try:
+        from app.crawlers.circuit_breaker import get_circuit_breaker
+        from app.crawlers.http_client import get_http_client
+        
+        breaker = get_circuit_breaker()
+        client = get_http_client()
+        results = breaker.probe_open_hosts(
+            lambda url: client.get(url, timeout=settings.CRAWLER_TIMEOUT, allow_redirects=True)
+        )
+        
+        logger.info(f"Circuit probe completed for {len(results)} hosts")
+        
+        log_task_status(task_id, "probe_circuits_task", "completed")
+        
+        return {
+            'status': 'success',
+            'message': f'Probed {len(results)} open circuits',
+            'hosts': results,
+            'task_id': task_id
+        }
+        
+    except Exception as e:
+        error_msg = f"Circuit probe task failed: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        
+        log_task_status(task_id, "probe_circuits_task", "failed")
+        
+        return {
+            'status': 'error',
+            'message': error_msg,
+            'task_id': task_id,
+            'error': str(e)
+        }
+
+
+def enqueue_details(payload_ref: str) -> int:
+    """把一批文章的载荷引用投递到detail队列，返回投递的任务数"""
+    if not settings.CRAWLER_DETAIL_ENABLED:
+        return 0
+    fetch_details_task.delay(payload_ref)
+    return 1
+
+
+@celery_app.task(bind=True, name="crawler.fetch_details_task")
+def fetch_details_task(self, payload: Union[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """抓取一批文章的详情页正文并写回文章存储（payload为载荷引用，兼容直接传入的文章列表）"""
+    task_id = self.request.id
+    log_task_status(task_id, "fetch_details_task", "started")
+    
+    try:
+        from app.crawlers.detail_fetcher import DetailFetcher
+        from app.storage.blob_store import BlobStoreError, get_blob_store
+        
+        try:
+            articles = get_blob_store().get(payload) if isinstance(payload, str) else payload
+        except BlobStoreError as e:
+            raise self.retry(exc=e, countdown=settings.BLOB_STORE_RETRY_DELAY)
+        if not articles:
+            logger.warning(f"Detail payload {payload} is empty or expired")
+        
+        details = DetailFetcher()
+        stats = asyncio.run(details.run(articles))
+        if details.store_error is not None:
+            # 正文没有写回文章存储，整批重试（详情抓取和字段写回都是幂等的）
+            raise self.retry(exc=details.store_error, countdown=settings.BLOB_STORE_RETRY_DELAY)
+        
+        logger.info(f"Detail fetch completed for {len(articles)} articles")
+        
+        log_task_status(task_id, "fetch_details_task", "completed")
+        
+        return {
+            'status': 'success',
+            'message': f'Fetched details for {stats["fetched"]} of {len(articles)} articles',
+            'result': stats,
+            'task_id': task_id
+        }
+        
+    except Retry:
+        raise
+    except Exception as e:
+        error_msg = f"Detail fetch task failed: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        
+        log_task_status(task_id, "fetch_details_task", "failed")
+        
+        return {
+            'status': 'error',
+            'message': error_msg,
+            'task_id': task_id,
+            'error': str(e)
+        }
@@ -1,71 +1,72 @@
 """
 数据处理任务模块
 """
-from typing import Dict, Any, List
-import time
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from celery.exceptions import Retry
+
 from app.celery_app import celery_app
+from app.config import settings
 from app.core.logging import get_logger, log_task_status
 
 logger = get_logger(__name__)
 
 
 @celery_app.task(bind=True, name="processor.process_news_task")
-def process_news_task(self, article_ids: List[str], **kwargs) -> Dict[str, Any]:
-    """处理新闻文章任务"""
+def process_news_task(self, article_ids: Optional[List[str]] = None, **kwargs) -> Dict[str, Any]:
+    """处理新闻文章任务（文章ID为文章存储中的URL；kwargs: payload_ref 爬虫任务结果中的载荷引用, batch_size, stages）"""
     task_id = self.request.id
     log_task_status(task_id, "process_news_task", "started")
     
     try:
+        if kwargs.get('payload_ref'):
+            from app.storage.blob_store import BlobStoreError, get_blob_store
+            
+            # 按引用逐批读取爬虫产出的文章，只取URL，正文由批处理器从文章存储读取
+            try:
+                article_ids = [
+                    article['url']
+                    for batch in get_blob_store().iter_batches(kwargs['payload_ref'])
+                    for article in batch if article.get('url')
+                ]
+            except BlobStoreError as e:
+                raise self.retry(exc=e, countdown=settings.BLOB_STORE_RETRY_DELAY)
+        article_ids = article_ids or []
+        
         logger.info(f"Starting news processing task for {len(article_ids)} articles")
         
-        # TODO: 实现实际的数据处理逻辑
-        # 包括：内容清洗、去重、NLP分析、情感分析等
+        from app.processing.batch_processor import BatchProcessor
+        from app.storage.article_store import ArticleStoreError
         
-        processed_count = 0
-        failed_count = 0
-        results = []
+        processor = BatchProcessor(batch_size=kwargs.get('batch_size'), stages=kwargs.get('stages'))
         
-        for article_id in article_ids:
-            try:
-                # 模拟处理逻辑
-                result = process_single_article(article_id, **kwargs)
-                results.append(result)
-                processed_count += 1
-                
-                logger.info(f"Processed article {article_id}")
-                
-            except Exception as e:
-                logger.error(f"Failed to process article {article_id}: {str(e)}")
-                failed_count += 1
-                results.append({
-                    'article_id': article_id,
-                    'status': 'failed',
-                    'error': str(e)
-                })
+        # 每批完成后上报进度和各阶段按批耗时
+        try:
+            result = processor.process(
+                article_ids,
+                on_batch=lambda progress: self.update_state(state='PROGRESS', meta=progress)
+            )
+        except ArticleStoreError as e:
+            raise self.retry(exc=e, countdown=settings.BLOB_STORE_RETRY_DELAY)
         
         # 更新任务状态
         self.update_state(
             state='SUCCESS',
             meta={
-                'total_articles': len(article_ids),
-                'processed_count': processed_count,
-                'failed_count': failed_count
+                'total_articles': result['total_articles'],
+                'processed_count': result['processed_count'],
+                'failed_count': result['failed_count'],
+                'timings': result['timings']
             }
         )
         
         log_task_status(task_id, "process_news_task", "completed")
         
-        return {
-            'status': 'success',
-            'total_articles': len(article_ids),
-            'processed_count': processed_count,
-            'failed_count': failed_count,
-            'results': results,
-            'task_id': task_id
-        }
+        return dict(result, status='success', task_id=task_id)
         
+    except Retry:
+        raise
     except Exception as e:
         error_msg = f"News processing task failed: {str(e)}"
         logger.error(error_msg, exc_info=True)
@@ -257,33 +258,6 @@ def analyze_sentiment_task(self, article_ids: List[str], **kwargs) -> Dict[str,
         }
 
 
-def process_single_article(article_id: str, **kwargs) -> Dict[str, Any]:
-    """处理单个文章"""
-    # 模拟处理逻辑
-    processing_steps = [
-        'content_cleaning',
-        'duplicate_detection',
-        'keyword_extraction',
-        'category_classification',
-        'sentiment_analysis'
-    ]
-    
-    result = {
-        'article_id': article_id,
-        'status': 'processed',
-        'processing_steps': processing_steps,
-        'processing_time': time.time(),
-        'metadata': {
-            'keywords': ['AI', '技术', '创新'],
-            'category': 'technology',
-            'sentiment_score': 0.8,
-            'sentiment_label': 'positive'
-        }
-    }
-    
-    return result
-
-
 def analyze_article_sentiment(article_id: str) -> Dict[str, Any]:
     """分析文章情感"""
     # 模拟情感分析结果
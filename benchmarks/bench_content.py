@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+正文提取基准: 内置密度提取器与newspaper3k在正文页语料上的速度和准确率
+
+准确率按字符计算（提取结果与标准正文的字符多重集交集），
+语料默认由 benchmarks/pages.py 生成，也可以指定目录（同名的 .html 页面和 .txt 标准正文）。
+
+用法: python benchmarks/bench_content.py [--pages 200] [--corpus DIR]
+"""
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.crawlers.content_extractor import ContentExtractor
+from benchmarks.pages import render_article_page
+
+BENCH_URL = "https://news.example.com/article.html"
+
+
+def load_corpus(directory: str) -> List[Tuple[str, str]]:
+    """读取 (HTML, 标准正文) 语料"""
+    corpus = []
+    for html_path in sorted(Path(directory).glob('*.html')):
+        gold_path = html_path.with_suffix('.txt')
+        if gold_path.exists():
+            corpus.append((html_path.read_text(encoding='utf-8'), gold_path.read_text(encoding='utf-8')))
+    return corpus
+
+
+def char_scores(extracted: str, gold: str) -> Tuple[float, float]:
+    """字符级 (precision, recall)，忽略空白"""
+    got = Counter(''.join(extracted.split()))
+    want = Counter(''.join(gold.split()))
+    overlap = sum((got & want).values())
+    precision = overlap / sum(got.values()) if got else 0.0
+    recall = overlap / sum(want.values()) if want else 0.0
+    return precision, recall
+
+
+def newspaper_extract() -> Optional[Callable[[str], str]]:
+    """newspaper3k提取函数（未安装时返回None）"""
+    try:
+        from newspaper import Article
+    except ImportError:
+        return None
+
+    def extract(html: str) -> str:
+        article = Article(BENCH_URL, language='zh', fetch_images=False)
+        article.download(input_html=html)
+        article.parse()
+        return article.text
+    return extract
+
+
+def bench(name: str, extract: Callable[[str], str], corpus: List[Tuple[str, str]]):
+    precision_total = recall_total = 0.0
+    start = time.perf_counter()
+    for html, gold in corpus:
+        precision, recall = char_scores(extract(html), gold)
+        precision_total += precision
+        recall_total += recall
+    elapsed = time.perf_counter() - start
+
+    precision = precision_total / len(corpus)
+    recall = recall_total / len(corpus)
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    print(f"{name:<22}{elapsed / len(corpus) * 1000:>10.2f}{precision:>11.3f}{recall:>9.3f}{f1:>8.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="正文提取对比")
+    parser.add_argument('--pages', type=int, default=200, help="生成的正文页数量")
+    parser.add_argument('--paragraphs', type=int, default=20, help="每页段落数")
+    parser.add_argument('--corpus', help="语料目录（.html + 同名 .txt 标准正文）")
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = load_corpus(args.corpus)
+    else:
+        corpus = [render_article_page(seed, args.paragraphs) for seed in range(args.pages)]
+    if not corpus:
+        print("Empty corpus")
+        return
+
+    print(f"{len(corpus)} pages")
+    print(f"{'extractor':<22}{'ms/page':>10}{'precision':>11}{'recall':>9}{'f1':>8}")
+    print("-" * 60)
+
+    # 冷启动: 每页都做全树密度打分
+    bench('density (cold)', lambda html: ContentExtractor().extract(html)['content'], corpus)
+
+    # 同一站点: 首页学到模板提示后，后续页面直接命中
+    extractor = ContentExtractor()
+    bench('density (site hints)', lambda html: extractor.extract(html, BENCH_URL)['content'], corpus)
+
+    extract = newspaper_extract()
+    if extract is None:
+        print(f"{'newspaper3k':<22}{'not installed':>38}")
+    else:
+        bench('newspaper3k', extract, corpus)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+解析后端对比基准: 各后端在新浪/腾讯频道页上的解析和提取耗时
+
+用法: python benchmarks/bench_parsers.py [--items 300] [--rounds 20]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.crawlers.parsers import PARSER_BACKENDS, get_parser_backend
+from app.crawlers.sina_crawler import SinaCrawler
+from app.crawlers.tencent_crawler import TencentCrawler
+from benchmarks.pages import render_sina_channel, render_tencent_channel
+
+
+def bench(crawler_class, html: str, backend: str, rounds: int):
+    """返回 (平均解析毫秒, 平均提取毫秒, 文章数)"""
+    crawler = crawler_class("bench", "https://news.example.com/news/", parser_backend=backend)
+    parse_total = extract_total = 0.0
+    articles = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        soup = crawler.parse_html(html)
+        parsed = time.perf_counter()
+        articles = crawler.extract_articles(soup, "https://news.example.com/news/")
+        extracted = time.perf_counter()
+        parse_total += parsed - start
+        extract_total += extracted - parsed
+    return parse_total / rounds * 1000, extract_total / rounds * 1000, len(articles)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML解析后端对比")
+    parser.add_argument('--items', type=int, default=300, help="每页新闻条数")
+    parser.add_argument('--rounds', type=int, default=20, help="每个后端重复次数")
+    args = parser.parse_args()
+
+    pages = {
+        'sina': (SinaCrawler, render_sina_channel(items=args.items)),
+        'tencent': (TencentCrawler, render_tencent_channel(items=args.items)),
+    }
+
+    print(f"{'site':<10}{'backend':<12}{'parse ms':>10}{'extract ms':>12}{'articles':>10}")
+    print("-" * 54)
+    for site, (crawler_class, html) in pages.items():
+        for backend in PARSER_BACKENDS:
+            if get_parser_backend(backend).name != backend:
+                print(f"{site:<10}{backend:<12}{'unavailable':>32}")
+                continue
+            parse_ms, extract_ms, count = bench(crawler_class, html, backend, args.rounds)
+            print(f"{site:<10}{backend:<12}{parse_ms:>10.2f}{extract_ms:>12.2f}{count:>10}")
+
+
+if __name__ == "__main__":
+    main()
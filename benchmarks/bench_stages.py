@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+解析/提取分阶段微基准: 在仓库内固定的HTML语料上分别计时各爬虫的每个阶段
+
+阶段: parse_html、extract_articles、extract_links、get_next_page_url、normalize（文本清理+时间解析），
+RSS 为 parse_feed、extract_articles，正文页为 parse_html、extract_articles、extract_main_content。
+每个阶段输出 ops/s、单次耗时中位数，以及tracemalloc统计的单次峰值分配和返回时仍存活的分配；
+--json 保存机器可读结果，--compare 与之前保存的结果逐项对比（用于比较两个提交）。
+
+语料在 benchmarks/corpus/，由 --record 重新生成（manifest.json 描述每个页面的爬虫、URL和编码）。
+
+用法: python benchmarks/bench_stages.py [--rounds 50] [--json out.json] [--compare base.json]
+"""
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+import structlog
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.crawlers import normalization
+from app.crawlers.base_crawler import RSSFeedCrawler
+from app.crawlers.checkpoint import CheckpointStore
+from app.crawlers.circuit_breaker import CircuitBreaker
+from app.crawlers.content_extractor import ContentExtractor
+from app.crawlers.frontier import SeenUrlFilter
+from app.crawlers.http_cache import ValidatorCache
+from app.crawlers.politeness import HostRateLimiter
+from app.crawlers.robots import RobotsCache
+from app.crawlers.sina_crawler import SinaCrawler
+from app.crawlers.tencent_crawler import TencentCrawler
+
+CORPUS_DIR = Path(__file__).parent / 'corpus'
+
+CRAWLERS = {
+    'sina': SinaCrawler,
+    'tencent': TencentCrawler,
+    'rss': RSSFeedCrawler,
+}
+
+ROBOTS_TXT = b"User-agent: *\nDisallow: /private/\n"
+
+# 结果对比时，变化超过该比例才标记
+DEFAULT_THRESHOLD = 0.05
+
+
+def record_corpus(directory: Path = CORPUS_DIR):
+    """重新生成语料（页面内容由固定种子决定，重复生成结果一致）"""
+    from benchmarks.fake_portal import PortalConfig, render_rss
+    from benchmarks.pages import render_article_page, render_sina_channel, render_tencent_channel
+
+    directory.mkdir(parents=True, exist_ok=True)
+    sina = render_sina_channel(page=1, items=100, next_href='/news/2.html').replace(
+        '<meta charset="utf-8">', '<meta charset="gbk">')
+    files = {
+        # 新浪频道页按GBK保存，覆盖从原始字节按声明编码解码的路径
+        'sina_channel.html': sina.encode('gb18030'),
+        'tencent_channel.html': render_tencent_channel(page=1, items=100, next_href='/news/2.html').encode('utf-8'),
+        'sina_article.html': render_article_page(seed=7, paragraphs=20)[0].encode('utf-8'),
+        'sina_rss.xml': render_rss('sina', PortalConfig(items=50)).replace(
+            '<link>/', '<link>https://news.sina.com.cn/').encode('utf-8'),
+    }
+    for name, body in files.items():
+        (directory / name).write_bytes(body)
+
+    manifest = [
+        {'name': 'sina_channel', 'file': 'sina_channel.html', 'crawler': 'sina', 'kind': 'channel',
+         'url': 'https://news.sina.com.cn/news/1.html', 'content_type': 'text/html'},
+        {'name': 'tencent_channel', 'file': 'tencent_channel.html', 'crawler': 'tencent', 'kind': 'channel',
+         'url': 'https://news.qq.com/news/1.html', 'content_type': 'text/html; charset=utf-8'},
+        {'name': 'sina_article', 'file': 'sina_article.html', 'crawler': 'sina', 'kind': 'article',
+         'url': 'https://news.sina.com.cn/news/doc-7.shtml', 'content_type': 'text/html; charset=utf-8'},
+        {'name': 'sina_rss', 'file': 'sina_rss.xml', 'crawler': 'rss', 'kind': 'feed',
+         'url': 'https://news.sina.com.cn/rss/sina.xml', 'content_type': 'application/rss+xml; charset=utf-8'},
+    ]
+    (directory / 'manifest.json').write_text(json.dumps(manifest, indent=2, ensure_ascii=False) + '\n',
+                                             encoding='utf-8')
+
+
+def load_corpus(directory: Path = CORPUS_DIR) -> List[Dict[str, Any]]:
+    """读取语料清单，每项附带页面原始字节"""
+    manifest = json.loads((directory / 'manifest.json').read_text(encoding='utf-8'))
+    for entry in manifest:
+        entry['content'] = (directory / entry['file']).read_bytes()
+    return manifest
+
+
+def make_crawler(kind: str, url: str) -> Any:
+    """创建只在内存中工作的爬虫（robots规则由桩客户端返回，不访问网络和Redis）"""
+    robots_client = SimpleNamespace(get=lambda *args, **kwargs: SimpleNamespace(status_code=200, content=ROBOTS_TXT))
+    state = {
+        'http_cache': ValidatorCache(backend='memory'),
+        'frontier': SeenUrlFilter(backend='memory'),
+        'checkpoints': CheckpointStore(backend='memory'),
+        'circuit_breaker': CircuitBreaker(backend='memory'),
+        'rate_limiter': HostRateLimiter(default_rate=0),
+        'robots': RobotsCache(backend='memory', http_client=robots_client),
+    }
+    if kind != 'rss':
+        state['content_extractor'] = ContentExtractor()
+    return CRAWLERS[kind](f"bench-{kind}", url, delay=0, **state)
+
+
+def build_stages(entry: Dict[str, Any]) -> Dict[str, Callable[[], Any]]:
+    """按页面类型构造各阶段的无参调用（后续阶段的输入预先准备好）"""
+    crawler = make_crawler(entry['crawler'], entry['url'])
+    url, content = entry['url'], entry['content']
+
+    if entry['kind'] == 'feed':
+        response = SimpleNamespace(content=content, headers={'Content-Type': entry['content_type']})
+        feed = crawler.parse_feed(response, url)
+        return {
+            'parse_feed': lambda: crawler.parse_feed(response, url),
+            'extract_articles': lambda: crawler.extract_articles(feed, url),
+        }
+
+    encoding = crawler.encoding_detector.detect(url, content, entry['content_type'])[0]
+    soup = crawler.parse_html(content, encoding)
+    stages = {
+        'parse_html': lambda: crawler.parse_html(content, encoding),
+        'extract_articles': lambda: crawler.extract_articles(soup, url),
+    }
+    if entry['kind'] == 'article':
+        stages['extract_main_content'] = lambda: crawler.extract_main_content(soup, url)
+        return stages
+
+    # 规范化阶段的输入是条目中未经清理的字段原文
+    fields = [crawler.extract_fields(item, url) for item in soup.select(crawler.article_selectors['news_list'])]
+    texts = [f[name] for f in fields for name in ('title', 'content', 'author', 'category')]
+    times = [f['publish_time'] for f in fields]
+    stages.update({
+        'extract_links': lambda: crawler.extract_links(soup, url),
+        'get_next_page_url': lambda: crawler.get_next_page_url(soup, url),
+        'normalize': lambda: (normalization.clean_texts(texts), normalization.parse_publish_times(times)),
+    })
+    return stages
+
+
+def time_stage(func: Callable[[], Any], rounds: int) -> Dict[str, float]:
+    """计时（先预热一次），返回 ops/s 与单次耗时统计"""
+    func()
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    median = statistics.median(samples)
+    return {
+        'ops_per_s': 1 / median if median else 0.0,
+        'median_ms': median * 1000,
+        'min_ms': min(samples) * 1000,
+        'stdev_ms': statistics.stdev(samples) * 1000 if len(samples) > 1 else 0.0,
+    }
+
+
+def measure_memory(func: Callable[[], Any]) -> Dict[str, float]:
+    """单次调用的峰值分配，以及调用返回时仍存活的分配（主要是返回结果）；tracemalloc与计时分开运行"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        result = func()
+        peak = tracemalloc.get_traced_memory()[1]
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    diff = after.compare_to(before, 'filename')
+    del result
+    return {
+        'peak_kb': (peak - baseline) / 1024,
+        'live_kb': sum(stat.size_diff for stat in diff) / 1024,
+        'live_blocks': sum(stat.count_diff for stat in diff),
+    }
+
+
+def run_benchmarks(corpus: List[Dict[str, Any]], rounds: int = 50, memory: bool = True) -> List[Dict[str, Any]]:
+    """对语料中每个页面的每个阶段计时"""
+    results = []
+    for entry in corpus:
+        for stage, func in build_stages(entry).items():
+            row = {'page': entry['name'], 'crawler': entry['crawler'], 'stage': stage}
+            row.update(time_stage(func, rounds))
+            if memory:
+                row.update(measure_memory(func))
+            results.append(row)
+    return results
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """进程峰值常驻内存(MB)，不支持的平台返回None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux单位是KB，macOS是字节
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """逐项对比两次结果的 ops/s 和峰值分配（ratio > 1 表示变快）"""
+    old = {(r['page'], r['stage']): r for r in baseline['results']}
+    rows = []
+    for r in current['results']:
+        before = old.get((r['page'], r['stage']))
+        if before is None or not before['ops_per_s']:
+            continue
+        ratio = r['ops_per_s'] / before['ops_per_s']
+        rows.append({
+            'page': r['page'],
+            'stage': r['stage'],
+            'ratio': ratio,
+            'peak_kb_delta': r['peak_kb'] - before['peak_kb'] if 'peak_kb' in r and 'peak_kb' in before else None,
+            'flag': 'faster' if ratio > 1 + threshold else 'slower' if ratio < 1 - threshold else '',
+        })
+    return rows
+
+
+def print_results(results: List[Dict[str, Any]]):
+    print(f"{'page':<18}{'stage':<22}{'ops/s':>10}{'median ms':>11}{'peak KB':>10}{'live KB':>10}{'blocks':>8}")
+    print("-" * 89)
+    for r in results:
+        memory = (f"{r['peak_kb']:>10.1f}{r['live_kb']:>10.1f}{r['live_blocks']:>8}" if 'peak_kb' in r
+                  else f"{'n/a':>10}{'n/a':>10}{'n/a':>8}")
+        print(f"{r['page']:<18}{r['stage']:<22}{r['ops_per_s']:>10.1f}{r['median_ms']:>11.3f}{memory}")
+
+
+def print_comparison(rows: List[Dict[str, Any]], baseline: Dict[str, Any]):
+    print(f"\ncompared with {baseline['meta'].get('revision') or 'baseline'}:")
+    print(f"{'page':<18}{'stage':<22}{'speed':>8}{'peak KB Δ':>11}")
+    print("-" * 66)
+    for r in rows:
+        delta = f"{r['peak_kb_delta']:+.1f}" if r['peak_kb_delta'] is not None else 'n/a'
+        print(f"{r['page']:<18}{r['stage']:<22}{r['ratio']:>7.2f}x{delta:>11}  {r['flag']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="解析/提取分阶段微基准")
+    parser.add_argument('--rounds', type=int, default=50, help="每个阶段计时次数")
+    parser.add_argument('--corpus', default=str(CORPUS_DIR), help="语料目录")
+    parser.add_argument('--no-memory', action='store_true', help="跳过tracemalloc内存统计")
+    parser.add_argument('--json', help="把结果写入JSON文件")
+    parser.add_argument('--compare', help="与之前保存的JSON结果对比")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="对比时标记变化的比例")
+    parser.add_argument('--record', action='store_true', help="重新生成语料后退出")
+    args = parser.parse_args()
+
+    # 日志输出不计入阶段耗时
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    if args.record:
+        record_corpus(Path(args.corpus))
+        print(f"Corpus written to {args.corpus}")
+        return
+
+    results = run_benchmarks(load_corpus(Path(args.corpus)), args.rounds, memory=not args.no_memory)
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'rounds': args.rounds,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'peak_rss_mb': peak_rss_mb(),
+        },
+        'results': results,
+    }
+    print_results(results)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print_comparison(compare_results(baseline, report, args.threshold), baseline)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
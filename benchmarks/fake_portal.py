@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+本地假新闻门户: 为爬虫压测提供确定性的站点
+
+提供新浪/腾讯风格的频道分页、正文页、RSS、站点地图和robots.txt，
+支持ETag条件请求（304），可配置响应延迟、慢响应比例和错误比例。
+
+用法: python benchmarks/fake_portal.py [--port 8765] [--pages 20] [--items 50] [--latency 0.02]
+"""
+import argparse
+import hashlib
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.pages import render_article_page, render_sina_channel, render_tencent_channel
+
+# 所有页面使用同一个固定的修改时间，保证多次运行结果一致
+LAST_MODIFIED = formatdate(1709251200, usegmt=True)
+
+_CHANNEL_RE = re.compile(r'^/(sina|tencent)/news/(\d+)\.html$')
+_ARTICLE_RE = re.compile(r'^/(?:sina/news/doc-|tencent/news/a/)(\d+)\.s?html$')
+_RSS_RE = re.compile(r'^/rss/(sina|tencent)\.xml$')
+_SITEMAP_RE = re.compile(r'^/sitemaps/news-(\d+)\.xml$')
+
+
+class PortalConfig:
+    """门户配置"""
+
+    def __init__(
+        self,
+        pages: int = 20,
+        items: int = 50,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_latency: float = 1.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        crawl_delay: Optional[float] = None,
+        seed: int = 0,
+    ):
+        self.pages = pages
+        self.items = items
+        self.latency = latency
+        self.jitter = jitter
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.crawl_delay = crawl_delay
+        self.seed = seed
+
+
+def render_rss(site: str, config: PortalConfig) -> str:
+    """最新一页频道新闻的RSS"""
+    rng = random.Random(config.seed)
+    items = []
+    for i in range(config.items):
+        article_id = 10000 + i
+        path = f"/sina/news/doc-{article_id}.shtml" if site == 'sina' else f"/tencent/news/a/{article_id}.html"
+        items.append(
+            f'<item><title>{site}新闻{article_id}</title><link>{path}</link>'
+            f'<description>摘要{rng.randint(0, 10 ** 6)}</description>'
+            f'<pubDate>{formatdate(1709251200 - i * 60, usegmt=True)}</pubDate></item>'
+        )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+        f'<title>{site}新闻</title>{"".join(items)}</channel></rss>'
+    )
+
+
+def render_sitemap_index(config: PortalConfig) -> str:
+    entries = ''.join(
+        f'<sitemap><loc>/sitemaps/news-{i}.xml</loc><lastmod>2024-03-01T{i % 24:02d}:00:00+08:00</lastmod></sitemap>'
+        for i in range(1, config.pages + 1)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</sitemapindex>'
+    )
+
+
+def render_news_sitemap(page: int, config: PortalConfig) -> str:
+    entries = ''.join(
+        f'<url><loc>/sina/news/doc-{page * 10000 + i}.shtml</loc>'
+        f'<news:news><news:publication><news:name>新浪新闻</news:name><news:language>zh</news:language></news:publication>'
+        f'<news:publication_date>2024-03-01T{page % 24:02d}:00:00+08:00</news:publication_date>'
+        f'<news:title>新闻{page * 10000 + i}</news:title></news:news></url>'
+        for i in range(config.items)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+        f'xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">{entries}</urlset>'
+    )
+
+
+class FakePortalHandler(BaseHTTPRequestHandler):
+    """请求处理（server上挂有config、stats和页面缓存）"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def render(self, path: str) -> Optional[Tuple[str, str]]:
+        """返回 (内容类型, 页面)，路径不存在时返回None"""
+        config: PortalConfig = self.server.config
+        base = f"http://{self.headers.get('Host', 'localhost')}"
+
+        if path == '/robots.txt':
+            delay = f"Crawl-delay: {config.crawl_delay}\n" if config.crawl_delay else ''
+            return 'text/plain; charset=utf-8', f"User-agent: *\nDisallow: /private/\n{delay}"
+
+        match = _CHANNEL_RE.match(path)
+        if match:
+            site, page = match.group(1), int(match.group(2))
+            if not 1 <= page <= config.pages:
+                return None
+            render = render_sina_channel if site == 'sina' else render_tencent_channel
+            next_href = f"/{site}/news/{page + 1}.html" if page < config.pages else None
+            return 'text/html; charset=utf-8', render(page, config.items, config.seed, next_href, f"/{site}/news/")
+
+        match = _ARTICLE_RE.match(path)
+        if match:
+            return 'text/html; charset=utf-8', render_article_page(config.seed + int(match.group(1)))[0]
+
+        match = _RSS_RE.match(path)
+        if match:
+            return 'application/rss+xml; charset=utf-8', render_rss(match.group(1), config).replace(
+                '<link>/', f'<link>{base}/')
+
+        if path == '/sitemap_index.xml':
+            return 'application/xml', render_sitemap_index(config).replace('<loc>/', f'<loc>{base}/')
+
+        match = _SITEMAP_RE.match(path)
+        if match and 1 <= int(match.group(1)) <= config.pages:
+            return 'application/xml', render_news_sitemap(int(match.group(1)), config).replace(
+                '<loc>/', f'<loc>{base}/')
+
+        return None
+
+    def page(self, path: str) -> Optional[Tuple[str, bytes, str]]:
+        """渲染并缓存页面，返回 (内容类型, 字节, ETag)"""
+        cache: Dict[str, Tuple[str, bytes, str]] = self.server.pages
+        key = f"{self.headers.get('Host')}{path}"
+        cached = cache.get(key)
+        if cached is None:
+            rendered = self.render(path)
+            if rendered is None:
+                return None
+            content_type, text = rendered
+            body = text.encode('utf-8')
+            cached = (content_type, body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"')
+            cache[key] = cached
+        return cached
+
+    def send(self, status: int, body: bytes = b'', headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body and self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def do_GET(self):
+        config: PortalConfig = self.server.config
+        stats: Counter = self.server.stats
+        path = self.path.split('?', 1)[0]
+
+        with self.server.lock:
+            roll = self.server.rng.random()
+            jitter = self.server.rng.uniform(0, config.jitter) if config.jitter else 0.0
+        stats['requests'] += 1
+
+        delay = config.latency + jitter
+        if roll < config.slow_rate:
+            delay += config.slow_latency
+            stats['slow'] += 1
+        if delay:
+            time.sleep(delay)
+
+        # 错误比例从慢响应之后的区间取，两种情况互不重叠
+        if config.slow_rate <= roll < config.slow_rate + config.error_rate:
+            stats['errors'] += 1
+            self.send(config.error_status, b'error', {'Retry-After': '0'})
+            return
+
+        page = self.page(path)
+        if page is None:
+            stats['not_found'] += 1
+            self.send(404, b'not found')
+            return
+
+        content_type, body, etag = page
+        if self.headers.get('If-None-Match') == etag:
+            stats['not_modified'] += 1
+            self.send(304, headers={'ETag': etag})
+            return
+
+        stats['ok'] += 1
+        stats['bytes'] += len(body)
+        self.send(200, body, {'Content-Type': content_type, 'ETag': etag, 'Last-Modified': LAST_MODIFIED})
+
+    do_HEAD = do_GET
+
+
+class FakePortal:
+    """在后台线程中运行的假门户（支持with语句）"""
+
+    def __init__(self, config: Optional[PortalConfig] = None, host: str = '127.0.0.1', port: int = 0):
+        self.config = config or PortalConfig()
+        self.server = ThreadingHTTPServer((host, port), FakePortalHandler)
+        self.server.daemon_threads = True
+        self.server.config = self.config
+        self.server.stats = Counter()
+        self.server.pages = {}
+        self.server.lock = threading.Lock()
+        self.server.rng = random.Random(self.config.seed)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self) -> Counter:
+        return self.server.stats
+
+    def channel_url(self, site: str, page: int = 1) -> str:
+        return f"{self.url}/{site}/news/{page}.html"
+
+    def start(self) -> 'FakePortal':
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> 'FakePortal':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地假新闻门户")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--pages', type=int, default=20, help="每个频道的页数")
+    parser.add_argument('--items', type=int, default=50, help="每页新闻条数")
+    parser.add_argument('--latency', type=float, default=0.0, help="每个响应的固定延迟(秒)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="额外的随机延迟上限(秒)")
+    parser.add_argument('--slow-rate', type=float, default=0.0, help="慢响应比例")
+    parser.add_argument('--slow-latency', type=float, default=1.0, help="慢响应的额外延迟(秒)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="错误响应比例")
+    parser.add_argument('--error-status', type=int, default=503, help="错误响应状态码")
+    parser.add_argument('--crawl-delay', type=float, default=None, help="robots.txt中的Crawl-delay")
+    args = parser.parse_args()
+
+    config = PortalConfig(
+        pages=args.pages, items=args.items, latency=args.latency, jitter=args.jitter,
+        slow_rate=args.slow_rate, slow_latency=args.slow_latency,
+        error_rate=args.error_rate, error_status=args.error_status, crawl_delay=args.crawl_delay,
+    )
+    portal = FakePortal(config, args.host, args.port)
+    print(f"Fake portal listening on {portal.url}")
+    print(f"  channels: {portal.channel_url('sina')}  {portal.channel_url('tencent')}")
+    print(f"  rss: {portal.url}/rss/sina.xml  sitemap: {portal.url}/sitemap_index.xml")
+    try:
+        portal.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        portal.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+爬虫压测: 在本地假门户上运行新浪/腾讯/RSS爬虫，统计吞吐和资源占用
+
+每个爬虫运行多轮: 第一轮全量抓取，之后的轮次走条件请求（304）路径。
+输出 pages/s、articles/s、每页CPU时间和进程峰值内存，可用 --json 保存结果以便比较。
+
+用法: python benchmarks/load_crawlers.py [--pages 20] [--items 50] [--latency 0.01] [--fetch-mode sync]
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from unittest.mock import Mock
+
+import structlog
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.crawlers.base_crawler import RSSFeedCrawler
+from app.crawlers.checkpoint import CheckpointStore
+from app.crawlers.circuit_breaker import CircuitBreaker
+from app.crawlers.frontier import SeenUrlFilter
+from app.crawlers.http_cache import ValidatorCache
+from app.crawlers.http_client import PooledHttpClient
+from app.crawlers.politeness import HostRateLimiter
+from app.crawlers.robots import RobotsCache
+from app.crawlers.sina_crawler import SinaCrawler
+from app.crawlers.tencent_crawler import TencentCrawler
+from benchmarks.fake_portal import FakePortal, PortalConfig
+
+CRAWLERS = {
+    'sina': SinaCrawler,
+    'tencent': TencentCrawler,
+    'rss': RSSFeedCrawler,
+}
+
+
+def peak_rss_mb() -> Optional[float]:
+    """进程峰值常驻内存(MB)，不支持的平台返回None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux单位是KB，macOS是字节
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_crawler(kind: str, portal: FakePortal, state: Dict[str, Any], fetch_mode: str) -> Dict[str, Any]:
+    """运行一次爬取，返回本轮统计"""
+    if kind == 'rss':
+        source_url, max_pages = f"{portal.url}/rss/sina.xml", 1
+    else:
+        source_url, max_pages = portal.channel_url(kind), portal.config.pages
+
+    crawler = CRAWLERS[kind](
+        f"load-{kind}", source_url, delay=0, max_pages=max_pages, fetch_mode=fetch_mode, **state
+    )
+    articles = Mock()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    result = crawler.crawl(sink=articles)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    pages = result['pages_crawled'] + result['pages_not_modified']
+    return {
+        'crawler': kind,
+        'pages': result['pages_crawled'],
+        'not_modified': result['pages_not_modified'],
+        'articles': result['articles_processed'],
+        'errors': len(result['errors']),
+        'wall_s': wall,
+        'pages_per_s': pages / wall if wall else 0.0,
+        'articles_per_s': result['articles_processed'] / wall if wall else 0.0,
+        'cpu_ms_per_page': cpu * 1000 / pages if pages else 0.0,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def run_load(
+    portal: FakePortal,
+    crawlers: List[str],
+    rounds: int = 2,
+    fetch_mode: str = 'sync'
+) -> List[Dict[str, Any]]:
+    """依次压测各爬虫（各自使用独立的内存状态，不依赖Redis）"""
+    results = []
+    for kind in crawlers:
+        http_client = PooledHttpClient()
+        state = {
+            'http_client': http_client,
+            'http_cache': ValidatorCache(backend='memory'),
+            'frontier': SeenUrlFilter(backend='memory'),
+            'checkpoints': CheckpointStore(backend='memory'),
+            'circuit_breaker': CircuitBreaker(backend='memory'),
+            'rate_limiter': HostRateLimiter(default_rate=0),
+            'robots': RobotsCache(backend='memory', http_client=http_client),
+        }
+        try:
+            for round_number in range(1, rounds + 1):
+                stats = run_crawler(kind, portal, state, fetch_mode)
+                stats['round'] = round_number
+                results.append(stats)
+        finally:
+            http_client.close()
+    return results
+
+
+def print_results(results: List[Dict[str, Any]]):
+    print(f"{'crawler':<10}{'round':>6}{'pages':>7}{'304':>6}{'articles':>10}{'errors':>8}"
+          f"{'pages/s':>10}{'articles/s':>12}{'cpu ms/page':>13}{'peak MB':>9}")
+    print("-" * 91)
+    for r in results:
+        rss = f"{r['peak_rss_mb']:.1f}" if r['peak_rss_mb'] is not None else 'n/a'
+        print(f"{r['crawler']:<10}{r['round']:>6}{r['pages']:>7}{r['not_modified']:>6}{r['articles']:>10}"
+              f"{r['errors']:>8}{r['pages_per_s']:>10.1f}{r['articles_per_s']:>12.1f}"
+              f"{r['cpu_ms_per_page']:>13.2f}{rss:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="爬虫本地压测")
+    parser.add_argument('--pages', type=int, default=20, help="每个频道的页数")
+    parser.add_argument('--items', type=int, default=50, help="每页新闻条数")
+    parser.add_argument('--latency', type=float, default=0.0, help="每个响应的固定延迟(秒)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="额外的随机延迟上限(秒)")
+    parser.add_argument('--slow-rate', type=float, default=0.0, help="慢响应比例")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="错误响应比例")
+    parser.add_argument('--rounds', type=int, default=2, help="每个爬虫运行轮数")
+    parser.add_argument('--fetch-mode', choices=['sync', 'async'], default='sync')
+    parser.add_argument('--crawlers', default='sina,tencent,rss', help="逗号分隔: sina,tencent,rss")
+    parser.add_argument('--json', help="把结果写入JSON文件")
+    parser.add_argument('--verbose', action='store_true', help="输出爬虫的info日志（会计入CPU时间）")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    config = PortalConfig(pages=args.pages, items=args.items, latency=args.latency, jitter=args.jitter,
+                          slow_rate=args.slow_rate, error_rate=args.error_rate)
+    with FakePortal(config) as portal:
+        results = run_load(portal, args.crawlers.split(','), args.rounds, args.fetch_mode)
+        requests_stats = dict(portal.stats)
+
+    print_results(results)
+    print(f"portal: {requests_stats}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'results': results, 'portal': requests_stats}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
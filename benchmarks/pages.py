@@ -0,0 +1,113 @@
+"""
+合成新闻页面生成器（新浪/腾讯频道页结构、新闻正文页）
+"""
+import random
+from typing import Optional, Tuple
+
+_TITLE_WORDS = ['人工智能', '经济', '发布会', '国际', '科技', '市场', '政策', '体育', '赛事', '教育', '健康', '新能源']
+_SUMMARY_WORDS = ['记者', '获悉', '近日', '相关部门', '表示', '数据显示', '同比增长', '专家认为', '进一步', '推动']
+
+
+def _phrase(rng: random.Random, words, n: int) -> str:
+    return ''.join(rng.choice(words) for _ in range(n))
+
+
+def _chrome(rng: random.Random, body: str, title: str) -> str:
+    """包上导航栏、侧边栏等页面框架，使页面体积接近真实门户"""
+    nav = ''.join(f'<li><a href="/channel/{i}/">频道{i}</a></li>' for i in range(40))
+    side = ''.join(
+        f'<li class="rank-item"><a href="/rank/{i}.html">{_phrase(rng, _TITLE_WORDS, 3)}</a></li>'
+        for i in range(30)
+    )
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8">'
+        f'<title>{title}</title>'
+        '<script>var _cfg = {"ad": true, "tracking": "on"};</script>'
+        '<style>.news-item{margin:0}.item{padding:0}</style></head><body>'
+        f'<div class="header"><ul class="nav">{nav}</ul></div>'
+        f'<div class="main">{body}</div>'
+        f'<div class="sidebar"><ul class="rank">{side}</ul></div>'
+        '<div class="footer">Copyright 新闻网 版权所有</div>'
+        '</body></html>'
+    )
+
+
+def render_sina_channel(page: int = 1, items: int = 100, seed: int = 0,
+                        next_href: Optional[str] = None, base_path: str = '/news/') -> str:
+    """生成新浪风格的频道列表页"""
+    rng = random.Random(seed * 100003 + page)
+    parts = []
+    for i in range(items):
+        article_id = page * 10000 + i
+        parts.append(
+            '<div class="news-item">'
+            f'<h2><a href="{base_path}doc-{article_id}.shtml?from=channel">{_phrase(rng, _TITLE_WORDS, 4)}</a></h2>'
+            f'<p class="summary">{_phrase(rng, _SUMMARY_WORDS, 12)}</p>'
+            f'<span class="author">记者{rng.randint(1, 99)}</span>'
+            f'<span class="time">{rng.randint(1, 23)}小时前</span>'
+            f'<span class="category">{rng.choice(_TITLE_WORDS)}</span>'
+            '</div>'
+        )
+    if next_href:
+        parts.append(f'<div class="pagination"><a class="next" href="{next_href}">下一页</a></div>')
+    return _chrome(rng, f'<div class="news-list">{"".join(parts)}</div>', f'新浪新闻 第{page}页')
+
+
+def render_tencent_channel(page: int = 1, items: int = 100, seed: int = 0,
+                           next_href: Optional[str] = None, base_path: str = '/news/') -> str:
+    """生成腾讯风格的频道列表页"""
+    rng = random.Random(seed * 100019 + page)
+    parts = []
+    for i in range(items):
+        article_id = page * 10000 + i
+        parts.append(
+            '<li class="item">'
+            f'<a class="item-link" href="{base_path}a/{article_id}.html">'
+            f'<h3 class="item-title">{_phrase(rng, _TITLE_WORDS, 4)}</h3></a>'
+            f'<p class="item-desc">{_phrase(rng, _SUMMARY_WORDS, 12)}</p>'
+            f'<span class="item-author">腾讯新闻</span>'
+            f'<span class="item-time">{rng.randint(0, 59)}分钟前</span>'
+            f'<span class="item-category">{rng.choice(_TITLE_WORDS)}</span>'
+            '</li>'
+        )
+    if next_href:
+        parts.append(f'<div class="pagination"><a class="next" href="{next_href}">下一页</a></div>')
+    return _chrome(rng, f'<ul class="list">{"".join(parts)}</ul>', f'腾讯新闻 第{page}页')
+
+
+# 正文页模板: (正文容器开始, 正文容器结束)
+_ARTICLE_TEMPLATES = [
+    ('<div class="article" id="artibody">', '</div>'),
+    ('<div class="content-article">', '</div>'),
+    ('<article class="post"><div class="post-content">', '</div></article>'),
+    ('<td class="text">', '</td>'),
+]
+
+
+def render_article_page(seed: int = 0, paragraphs: int = 20) -> Tuple[str, str]:
+    """生成新闻正文页，返回 (HTML, 标准正文)；页面含推荐列表、评论区等干扰块"""
+    rng = random.Random(seed)
+    opening, closing = _ARTICLE_TEMPLATES[seed % len(_ARTICLE_TEMPLATES)]
+    title = _phrase(rng, _TITLE_WORDS, 4)
+    texts = [
+        '，'.join(_phrase(rng, _SUMMARY_WORDS, rng.randint(3, 6)) for _ in range(rng.randint(2, 5))) + '。'
+        for _ in range(paragraphs)
+    ]
+    body = ''.join(f'<p>{text}</p>' for text in texts)
+    if opening.startswith('<td'):
+        body = f'<table><tr>{opening}{body}{closing}</tr></table>'
+    else:
+        body = f'{opening}{body}{closing}'
+
+    related = ''.join(
+        f'<p><a href="/news/{seed}-{i}.html">{_phrase(rng, _TITLE_WORDS, 5)}</a></p>' for i in range(10)
+    )
+    comments = ''.join(f'<p class="comment">网友{i}: {_phrase(rng, _SUMMARY_WORDS, 2)}</p>' for i in range(8))
+    page = (
+        f'<h1 class="main-title">{title}</h1>'
+        f'<div class="date-source"><span>{rng.randint(1, 23)}小时前</span> <a href="/">新闻网</a></div>'
+        f'{body}'
+        f'<div class="related"><h3>相关新闻</h3>{related}</div>'
+        f'<div class="comments">{comments}</div>'
+    )
+    return _chrome(rng, page, title), '\n'.join(texts)
@@ -1,10 +1,19 @@
 #!/usr/bin/env python3
 """
 启动Celery Worker脚本
+
+按队列选择池配置（见 app/core/worker_profiles.py）:
+  不指定 --queues 时，为每组池配置相同的队列各启动一个worker子进程；
+  指定 --queues 时，在当前进程中启动一个消费这些队列的worker。
+gevent/eventlet池必须在导入requests、redis等库之前打补丁，当前进程已经导入了应用，
+所以这两种池改由 celery 命令行启动（celery在导入应用之前打补丁）。
+用法: python scripts/start_celery_worker.py [--queues crawler,detail] [--profile solo] [--concurrency N]
 """
-import os
+import argparse
+import subprocess
 import sys
 from pathlib import Path
+from typing import List, Optional
 
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent.parent
@@ -12,27 +21,85 @@ sys.path.insert(0, str(project_root))
 
 from app.celery_app import celery_app
 from app.config import settings
+from app.core.worker_profiles import WorkerProfile, group_queues, resolve_profile
 
+ALL_QUEUES = list(celery_app.conf.task_queues)
 
-def main():
-    """启动Celery Worker"""
-    print("🚀 启动News Engine Celery Worker...")
-    print(f"🔧 队列: crawler, processor, index")
+
+# 需要在导入任何库之前打猴子补丁的池
+GREEN_POOLS = ('gevent', 'eventlet')
+
+
+def worker_argv(queues: List[str], profile: WorkerProfile) -> List[str]:
+    """celery worker 参数"""
+    return [
+        'worker',
+        '--loglevel=' + settings.LOG_LEVEL.lower(),
+        *profile.worker_args(),
+        '--queues=' + ','.join(queues),
+        f'--hostname={profile.name}@%h',
+        '--time-limit=3600',
+        '--soft-time-limit=3000'
+    ]
+
+
+def run_worker(queues: List[str], profile_name: Optional[str] = None, concurrency: Optional[int] = None):
+    """在当前进程中启动worker（gevent/eventlet池通过celery命令行启动）"""
+    profile = resolve_profile(queues, profile_name)
+    if concurrency:
+        profile.concurrency = concurrency
+
+    print(f"🚀 启动News Engine Celery Worker ({profile.name})...")
+    print(f"🔧 队列: {', '.join(queues)}")
+    print(f"⚙️ 池: {profile.pool}  并发: {profile.concurrency}")
     print(f"📝 日志级别: {settings.LOG_LEVEL}")
     print(f"🌐 时区: Asia/Shanghai")
     print("-" * 50)
-    
+
+    if profile.pool in GREEN_POOLS:
+        command = [sys.executable, '-m', 'celery', '-A', 'app.celery_app', *worker_argv(queues, profile)]
+        sys.exit(subprocess.call(command, cwd=str(project_root)))
+
+    celery_app.worker_main(worker_argv(queues, profile))
+
+
+def run_all(profile_name: Optional[str] = None, concurrency: Optional[int] = None):
+    """每组池配置启动一个worker子进程，等待全部退出"""
+    groups = group_queues(ALL_QUEUES, profile_name)
+    if len(groups) == 1:
+        run_worker(ALL_QUEUES, profile_name, concurrency)
+        return
+
+    processes = []
+    for name, queues in groups.items():
+        command = [sys.executable, str(Path(__file__).resolve()), '--queues', ','.join(queues), '--profile', name]
+        if concurrency:
+            command += ['--concurrency', str(concurrency)]
+        processes.append(subprocess.Popen(command))
+    try:
+        for process in processes:
+            process.wait()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+        raise
+
+
+def main():
+    """启动Celery Worker"""
+    parser = argparse.ArgumentParser(description="启动Celery Worker")
+    parser.add_argument('--queues', help=f"逗号分隔的队列（默认全部: {','.join(ALL_QUEUES)}）")
+    parser.add_argument('--profile', choices=['io', 'cpu', 'small', 'solo'], help="强制使用的池配置")
+    parser.add_argument('--concurrency', type=int, help="覆盖池配置的并发数")
+    args = parser.parse_args()
+
     try:
-        # 启动Celery Worker
-        celery_app.worker_main([
-            'worker',
-            '--loglevel=' + settings.LOG_LEVEL.lower(),
-            '--concurrency=4',
-            '--queues=crawler,processor,index,default',
-            '--hostname=worker@%h',
-            '--time-limit=3600',
-            '--soft-time-limit=3000'
-        ])
+        if args.queues:
+            run_worker(args.queues.split(','), args.profile, args.concurrency)
+        else:
+            run_all(args.profile, args.concurrency)
     except KeyboardInterrupt:
         print("\n👋 Celery Worker已停止")
     except Exception as e:
@@ -124,11 +124,13 @@ class SmartSourceDiscovery:
                 if response.status_code == 200:
                     content_type = response.headers.get('content-type', '')
                     if 'xml' in content_type or 'rss' in content_type:
+                        # 站点地图交给SitemapCrawler按lastmod增量抓取
+                        is_sitemap = 'sitemap' in path
                         rss_sources.append({
-                            'name': f"RSS源 - {path}",
+                            'name': f"{'站点地图' if is_sitemap else 'RSS源'} - {path}",
                             'url': rss_url,
-                            'type': 'rss',
-                            'parser': 'rss',
+                            'type': 'sitemap' if is_sitemap else 'rss',
+                            'parser': 'sitemap' if is_sitemap else 'rss',
                             'crawl_interval': 600,
                             'discovery_method': 'common_path'
                         })
@@ -0,0 +1,57 @@
+"""
+测试公共夹具
+"""
+import pytest
+from unittest.mock import Mock
+from app.crawlers.checkpoint import CheckpointStore
+from app.crawlers.circuit_breaker import CircuitBreaker
+from app.crawlers.frontier import SeenUrlFilter
+from app.crawlers.http_cache import ValidatorCache
+from app.crawlers.robots import RobotsCache
+from app.crawlers.sina_crawler import SinaCrawler
+
+
+@pytest.fixture(autouse=True)
+def isolated_crawl_state(monkeypatch):
+    """每个爬虫实例使用独立的内存已见URL过滤器、断点存储、熔断器和robots缓存，测试之间互不影响"""
+    monkeypatch.setattr('app.crawlers.base_crawler.get_url_frontier',
+                        lambda: SeenUrlFilter(backend='memory'))
+    monkeypatch.setattr('app.crawlers.base_crawler.get_checkpoint_store',
+                        lambda: CheckpointStore(backend='memory'))
+    monkeypatch.setattr('app.crawlers.base_crawler.get_circuit_breaker',
+                        lambda: CircuitBreaker(backend='memory'))
+    # 不请求真实站点的robots.txt（404即全部允许）
+    monkeypatch.setattr('app.crawlers.base_crawler.get_robots_cache',
+                        lambda: RobotsCache(backend='memory', http_client=Mock(get=Mock(return_value=Mock(status_code=404)))))
+
+
+class StubCrawler(SinaCrawler):
+    """每页固定产出若干文章的测试爬虫"""
+    
+    def process_page(self, response, current_url):
+        page = int(current_url.rsplit('/', 1)[-1])
+        articles = [{'url': f"{current_url}/a{i}.html", 'page': page} for i in range(3)]
+        return articles, current_url.rsplit('/', 1)[0] + f"/{page + 1}"
+
+
+def stub_page(url):
+    """以URL为内容的200响应桩"""
+    return Mock(not_modified=False, status_code=200, content=url.encode(), headers={})
+
+
+@pytest.fixture
+def make_stub_crawler():
+    """构造从第1页开始翻页的测试爬虫，页面请求返回响应桩；传入fetched时记录抓取过的URL"""
+    def make(fetched=None, **kwargs):
+        kwargs.setdefault('http_cache', ValidatorCache(backend='memory'))
+        crawler = StubCrawler("stub", "https://news.sina.com.cn/news/1", delay=0, **kwargs)
+        
+        def get_page(url, retries=0):
+            if fetched is not None:
+                fetched.append(url)
+            return stub_page(url)
+        
+        crawler.get_page = get_page
+        return crawler
+    
+    return make
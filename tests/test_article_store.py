@@ -0,0 +1,58 @@
+"""
+文章存储测试文件
+"""
+import json
+import pytest
+from unittest.mock import MagicMock
+from app.storage.article_store import ArticleBatchWriter, ArticleStore, ArticleStoreError
+
+
+class TestArticleStore:
+    """文章存储测试类"""
+
+    def test_unavailable_redis_raises_instead_of_local_fallback(self, monkeypatch):
+        """测试Redis不可用时抛出异常，不写入其他进程读不到的进程内存储"""
+        monkeypatch.setattr('app.storage.article_store.get_redis_client', lambda: None)
+        store = ArticleStore(backend='redis')
+        with pytest.raises(ArticleStoreError):
+            store.save_many([{'url': 'https://a.com/1'}])
+        with pytest.raises(ArticleStoreError):
+            store.update_many([{'url': 'https://a.com/1', 'detail_status': 'ok'}])
+        with pytest.raises(ArticleStoreError):
+            store.get_many(['https://a.com/1'])
+        assert store._entries == {}
+
+    def test_redis_update_writes_only_given_fields(self):
+        """测试字段写回按字段HSET，不先读取整篇文章"""
+        client = MagicMock()
+        pipe = client.pipeline.return_value
+        store = ArticleStore(backend='redis', ttl=60, redis_client=client)
+
+        store.update_many([{'url': 'https://a.com/1?utm_source=x', 'detail_status': 'ok', 'tags': []}])
+
+        key = ArticleStore.REDIS_PREFIX + 'https://a.com/1'
+        pipe.hset.assert_called_once_with(key, mapping={
+            'url': json.dumps('https://a.com/1?utm_source=x'), 'detail_status': '"ok"', 'tags': '[]',
+        })
+        pipe.expire.assert_called_once_with(key, 60)
+        pipe.delete.assert_not_called()
+        pipe.hgetall.assert_not_called()
+
+    def test_memory_update_merges_fields(self):
+        """测试字段合并到已保存的文章中，整条写入时覆盖"""
+        store = ArticleStore(backend='memory')
+        store.save_many([{'url': 'https://a.com/1', 'title': '标题', 'content': '摘要'}])
+        store.update_many([{'url': 'https://a.com/1', 'content': '正文'}])
+        assert store.get_many(['https://a.com/1'])[0] == {'url': 'https://a.com/1', 'title': '标题', 'content': '正文'}
+
+        store.save_many([{'url': 'https://a.com/1', 'title': '新标题'}])
+        assert store.get_many(['https://a.com/1'])[0] == {'url': 'https://a.com/1', 'title': '新标题'}
+
+    def test_batch_writer_keeps_first_store_error(self, monkeypatch):
+        """测试写入失败的异常保留在写入器上，供任务判断是否重试"""
+        monkeypatch.setattr('app.storage.article_store.get_redis_client', lambda: None)
+        writer = ArticleBatchWriter(store=ArticleStore(backend='redis'), batch_size=1)
+        with pytest.raises(ArticleStoreError):
+            writer({'url': 'https://a.com/1'})
+        assert isinstance(writer.error, ArticleStoreError)
+        assert writer.get_stats() == {'written': 0, 'batches': 0}
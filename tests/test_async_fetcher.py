@@ -0,0 +1,62 @@
+"""
+异步抓取引擎测试文件
+"""
+import asyncio
+import httpx
+from app.crawlers.sina_crawler import SinaCrawler
+from app.crawlers.async_fetcher import AsyncFetcher
+
+
+class TestAsyncFetcher:
+    """异步抓取引擎测试类"""
+    
+    def test_concurrency_limits(self):
+        """测试全局和单主机并发上限"""
+        active = {'total': 0, 'peak': 0, 'hosts': {}, 'host_peak': {}}
+        
+        async def handler(request):
+            host = request.url.host
+            active['total'] += 1
+            active['hosts'][host] = active['hosts'].get(host, 0) + 1
+            active['peak'] = max(active['peak'], active['total'])
+            active['host_peak'][host] = max(active['host_peak'].get(host, 0), active['hosts'][host])
+            await asyncio.sleep(0.01)
+            active['total'] -= 1
+            active['hosts'][host] -= 1
+            return httpx.Response(200, text="<html></html>")
+        
+        urls = [f"https://a.example.com/{i}" for i in range(10)]
+        urls += [f"https://b.example.com/{i}" for i in range(10)]
+        
+        async def run():
+            fetcher = AsyncFetcher(
+                max_concurrency=3,
+                per_host_limit=2,
+                transport=httpx.MockTransport(handler)
+            )
+            async with fetcher:
+                return await fetcher.fetch_many(urls)
+        
+        responses = asyncio.run(run())
+        
+        assert all(r is not None and r.status_code == 200 for r in responses)
+        assert active['peak'] == 3
+        assert max(active['host_peak'].values()) == 2
+    
+    def test_crawl_async_keeps_contract(self):
+        """测试异步模式下crawl()返回结构不变"""
+        html = '<html><body><div class="news-item"><h2>标题</h2><a href="/a.html">链接</a></div></body></html>'
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, text=html))
+        crawler = SinaCrawler("test_sina", "https://news.sina.com.cn/news/", delay=0, max_pages=1)
+        
+        collected = []
+        
+        async def run():
+            async with AsyncFetcher(transport=transport) as fetcher:
+                return await crawler.crawl_async(fetcher, sink=collected.append)
+        
+        result = asyncio.run(run())
+        
+        assert result['pages_crawled'] == 1
+        assert result['source_id'] == "test_sina"
+        assert result['articles_processed'] == len(collected)
@@ -0,0 +1,40 @@
+"""
+流式爬取测试文件
+"""
+
+
+class TestStreamingCrawl:
+    """流式爬取测试类"""
+    
+    def test_iter_crawl_is_lazy(self, make_stub_crawler):
+        """测试下游消费完当前页之前不会抓取下一页"""
+        fetched = []
+        stream = make_stub_crawler(fetched, max_pages=5).iter_crawl()
+        
+        first = next(stream)
+        assert first['page'] == 1
+        assert len(fetched) == 1
+        
+        rest = list(stream)
+        assert len(rest) == 14
+        assert len(fetched) == 5
+    
+    def test_crawl_returns_only_stats(self, make_stub_crawler):
+        """测试crawl()把文章交给sink，结果中只有统计信息"""
+        sunk = []
+        result = make_stub_crawler(max_pages=4).crawl(sink=sunk.append)
+        
+        assert 'articles' not in result
+        assert len(sunk) == 12
+        assert result['articles_processed'] == 12
+        assert result['pages_crawled'] == 4
+    
+    def test_sink_error_stops_crawl(self, make_stub_crawler):
+        """测试下游写入失败时停止爬取并记录错误"""
+        def failing_sink(article):
+            raise RuntimeError("db down")
+        
+        result = make_stub_crawler(max_pages=4).crawl(sink=failing_sink)
+        
+        assert result['articles_processed'] == 0
+        assert result['errors'][-1]['type'] == 'sink_error'
@@ -0,0 +1,81 @@
+"""
+文章批处理测试文件
+"""
+import pytest
+from unittest.mock import Mock
+from app.processing.batch_processor import MAX_RESULT_SAMPLES, BatchProcessor
+from app.storage.article_store import ArticleStore
+
+
+class TestBatchProcessor:
+    """文章批处理测试类"""
+    
+    def test_micro_batches_use_one_read_and_one_write(self):
+        """测试每批只读写存储各一次，阶段耗时按批统计"""
+        store = ArticleStore(backend='memory')
+        articles = [
+            {'url': f'https://news.example.com/{i}.html', 'title': f' 人工智能芯片 突破{i} ',
+             'content': '公司宣布  芯片技术取得突破，业绩增长。' if i != 3 else '另一篇  文章，股市下跌，企业亏损。'}
+            for i in range(5)
+        ]
+        store.save_many(articles)
+        store.get_many = Mock(wraps=store.get_many)
+        store.update_many = Mock(wraps=store.update_many)
+        progress = []
+        
+        ids = [article['url'] for article in articles] + ['https://news.example.com/missing.html']
+        result = BatchProcessor(store=store, batch_size=2).process(ids, on_batch=progress.append)
+        
+        assert store.get_many.call_count == 3 and store.update_many.call_count == 3
+        assert (result['processed_count'], result['missing_count'], result['failed_count']) == (5, 1, 0)
+        # 0/1/2/4 正文相同
+        assert result['duplicate_count'] == 3
+        assert [p['done'] for p in progress] == [2, 4, 6]
+        assert set(result['timings']) == {'fetch', 'write', *BatchProcessor.STAGES}
+        assert all(t['batches'] == 3 for t in result['timings'].values())
+        
+        first = store.get_many([articles[0]['url']])[0]
+        assert first['title'] == '人工智能芯片 突破0'
+        assert first['category'] == 'technology' and first['sentiment_label'] == 'positive'
+        assert first['processing_status'] == 'processed' and first['keywords']
+        assert store.get_many([articles[3]['url']])[0]['sentiment_label'] == 'negative'
+    
+    def test_write_back_keeps_concurrent_fields(self):
+        """测试只写回各阶段改动的字段，读取之后其他阶段写入的字段不被覆盖"""
+        store = ArticleStore(backend='memory')
+        url = 'https://news.example.com/1.html'
+        store.save_many([{'url': url, 'title': '标题', 'content': '正文'}])
+        read = store.get_many
+        
+        def get_many(urls):
+            articles = read(urls)
+            store.update_many([{'url': url, 'detail_status': 'ok'}])  # 详情抓取在读取之后写回
+            return articles
+        
+        store.get_many = get_many
+        BatchProcessor(store=store).process([url])
+        
+        saved = read([url])[0]
+        assert saved['detail_status'] == 'ok' and saved['processing_status'] == 'processed'
+    
+    def test_result_samples_capped(self):
+        """测试结果只带缺失/失败文章的计数和有限条明细"""
+        store = ArticleStore(backend='memory')
+        store.save_many([{'url': f'https://news.example.com/{i}.html', 'title': '标题'} for i in range(30)])
+        processor = BatchProcessor(store=store, batch_size=10, stages=['content_cleaning'])
+        processor.content_cleaning = Mock(side_effect=ValueError("broken"))
+        
+        ids = [f'https://news.example.com/{i}.html' for i in range(30)]
+        result = processor.process(ids + [f'https://news.example.com/missing-{i}.html' for i in range(30)])
+        
+        assert (result['failed_count'], result['missing_count']) == (30, 30)
+        assert len(result['failed']) == len(result['missing']) == MAX_RESULT_SAMPLES
+        assert result['failed'][0] == {'article_id': ids[0], 'error': 'broken'}
+    
+    def test_unknown_stage_rejected(self):
+        """测试未知阶段名（包括fetch/write等内部方法）在构造时报错"""
+        store = ArticleStore(backend='memory')
+        for stages in (['sentiment_analysis', 'translate'], ['fetch']):
+            with pytest.raises(ValueError):
+                BatchProcessor(store=store, stages=stages)
+        assert BatchProcessor(store=store, stages=['content_cleaning']).stages == ['content_cleaning']
@@ -0,0 +1,55 @@
+"""
+基准与压测工具测试文件
+"""
+import requests
+from benchmarks.bench_stages import build_stages, compare_results, load_corpus, run_benchmarks
+from benchmarks.fake_portal import FakePortal, PortalConfig
+from benchmarks.load_crawlers import run_load
+
+
+class TestStageBenchmarks:
+    """分阶段微基准测试类"""
+    
+    def test_corpus_stages_produce_comparable_results(self):
+        """测试语料各页面的阶段都能运行，结果可以与之前的结果对比"""
+        corpus = load_corpus()
+        channel = next(entry for entry in corpus if entry['name'] == 'sina_channel')
+        stages = build_stages(channel)
+        assert len(stages['extract_articles']()) == 100
+        assert stages['get_next_page_url']().endswith('/news/2.html')
+        
+        report = {'results': run_benchmarks(corpus, rounds=1)}
+        assert {(r['page'], r['stage']) for r in report['results']} >= {
+            ('tencent_channel', 'normalize'), ('sina_article', 'extract_main_content'), ('sina_rss', 'parse_feed')
+        }
+        assert all(r['ops_per_s'] > 0 and r['peak_kb'] >= 0 for r in report['results'])
+        
+        rows = compare_results(report, report)
+        assert len(rows) == len(report['results'])
+        assert all(r['ratio'] == 1 and not r['flag'] for r in rows)
+
+
+class TestFakePortalLoad:
+    """本地假门户压测测试类"""
+    
+    def test_load_harness_against_fake_portal(self):
+        """测试三种爬虫在假门户上完整翻页，第二轮全部走304"""
+        with FakePortal(PortalConfig(pages=3, items=10)) as portal:
+            results = run_load(portal, ['sina', 'tencent', 'rss'], rounds=2)
+            stats = dict(portal.stats)
+        
+        first = {r['crawler']: r for r in results if r['round'] == 1}
+        second = {r['crawler']: r for r in results if r['round'] == 2}
+        assert first['sina']['pages'] == 3 and first['sina']['articles'] == 30
+        assert first['tencent']['pages'] == 3 and first['tencent']['articles'] == 30
+        assert first['rss']['articles'] == 10
+        assert all(r['not_modified'] == 1 and r['pages'] == 0 for r in second.values())
+        assert all(r['errors'] == 0 for r in results)
+        assert stats['not_modified'] == 3
+    
+    def test_configured_error_rate(self):
+        """测试错误响应按比例出现"""
+        with FakePortal(PortalConfig(error_rate=1.0)) as portal:
+            response = requests.get(portal.channel_url('sina'))
+        assert response.status_code == 503
+        assert portal.stats['errors'] == 1
@@ -0,0 +1,45 @@
+"""
+载荷存储测试文件
+"""
+import os
+import time
+import pytest
+from app.storage.blob_store import BlobStore, BlobStoreError
+
+
+class TestBlobStore:
+    """载荷存储测试类"""
+    
+    def test_file_segments_round_trip_by_reference(self, tmp_path):
+        """测试分段文件按批引用读取单批，按key引用读取全部，过期分段被清理"""
+        blobs = BlobStore(backend='file', path=str(tmp_path), ttl=60)
+        first = blobs.append('task-1', [{'url': 'https://a.com/1', 'title': '新闻一'}])
+        second = blobs.append('task-1', [{'url': 'https://a.com/2'}, {'url': 'https://a.com/3'}])
+        
+        assert blobs.get(second) == [{'url': 'https://a.com/2'}, {'url': 'https://a.com/3'}]
+        assert blobs.get(first)[0]['title'] == '新闻一'
+        assert [len(batch) for batch in blobs.iter_batches('task-1')] == [1, 2]
+        assert blobs.get('unknown') == []
+        
+        # 超过TTL的分段在下一次新建分段时删除
+        old_segment = tmp_path / 'task-1.jsonl'
+        os.utime(old_segment, (time.time() - 120, time.time() - 120))
+        assert blobs.get('task-1') == []
+        blobs.append('task-2', [{'url': 'https://a.com/4'}])
+        assert not old_segment.exists()
+        
+        blobs.delete('task-2')
+        assert blobs.get('task-2') == []
+    
+    def test_unavailable_backend_raises_instead_of_local_fallback(self, tmp_path, monkeypatch):
+        """测试Redis不可用或分段写不进去时抛出异常，不发布其他进程读不到的引用"""
+        monkeypatch.setattr('app.storage.blob_store.get_redis_client', lambda: None)
+        with pytest.raises(BlobStoreError):
+            BlobStore(backend='redis').append('task-1', [{'url': 'https://a.com/1'}])
+        with pytest.raises(BlobStoreError):
+            BlobStore(backend='redis').get('task-1#1-0')
+        
+        blocked = tmp_path / 'blocked'
+        blocked.write_text('')
+        with pytest.raises(BlobStoreError):
+            BlobStore(backend='file', path=str(blocked)).append('task-1', [{'url': 'https://a.com/1'}])
@@ -0,0 +1,115 @@
+"""
+爬取断点测试文件
+"""
+import pytest
+from app.crawlers.http_cache import ValidatorCache
+from app.crawlers.frontier import SeenUrlFilter
+from app.crawlers.checkpoint import CheckpointStore
+from app.storage.article_store import ArticleBatchWriter, ArticleStore
+
+
+class TestCrawlCheckpoint:
+    """爬取断点测试类"""
+    
+    @pytest.fixture
+    def make_crawler(self, make_stub_crawler):
+        def make(fetched, checkpoints, crawl_id="task-1", frontier=None):
+            return make_stub_crawler(fetched, max_pages=10, frontier=frontier or SeenUrlFilter(backend='memory'),
+                                     checkpoints=checkpoints, checkpoint_every=2, crawl_id=crawl_id)
+        return make
+    
+    def test_redelivered_task_resumes(self, make_crawler):
+        """测试worker中途退出后，同一任务从断点继续且不重复产出文章"""
+        checkpoints = CheckpointStore(backend='memory')
+        stream = make_crawler([], checkpoints).iter_crawl()
+        emitted = [next(stream) for _ in range(13)]  # 第5页第1篇时被杀掉
+        assert emitted[-1]['page'] == 5
+        assert checkpoints.load("stub", "task-1")['current_url'] == "https://news.sina.com.cn/news/5"
+        
+        fetched, sunk = [], []
+        result = make_crawler(fetched, checkpoints).crawl(sink=sunk.append)
+        
+        assert fetched[0] == "https://news.sina.com.cn/news/5"
+        assert len(fetched) == 6
+        assert result['pages_crawled'] == 10
+        assert {a['page'] for a in sunk} == set(range(5, 11))
+        assert checkpoints.load("stub", "task-1") is None
+    
+    def test_resume_after_uncheckpointed_pages(self, make_crawler):
+        """测试断点间隔之间的页面已提交到已见URL过滤器时，重新投递从第一个未提交的页面继续，不提前停止"""
+        checkpoints = CheckpointStore(backend='memory')
+        frontier = SeenUrlFilter(backend='memory')
+        stream = make_crawler([], checkpoints, frontier=frontier).iter_crawl()
+        emitted = [next(stream) for _ in range(10)]  # 第1-3页已提交，第4页第1篇时被杀掉
+        assert emitted[-1]['page'] == 4
+        
+        fetched, sunk = [], []
+        result = make_crawler(fetched, checkpoints, frontier=frontier).crawl(sink=sunk.append)
+        
+        assert fetched == [f"https://news.sina.com.cn/news/{page}" for page in range(4, 11)]
+        assert result['pages_crawled'] == 10
+        assert {a['page'] for a in sunk} == set(range(4, 11))
+    
+    def test_buffered_articles_written_before_page_commit(self, make_stub_crawler):
+        """测试攒批sink缓冲的文章在页面级提交之前写出，worker在批次中途被杀掉后重新投递不丢文章"""
+        class WorkerLost(BaseException):
+            pass
+        
+        checkpoints = CheckpointStore(backend='memory')
+        frontier = SeenUrlFilter(backend='memory')
+        http_cache = ValidatorCache(backend='memory')
+        store = ArticleStore(backend='memory')
+        
+        def run(sink):
+            crawler = make_stub_crawler(max_pages=10, http_cache=http_cache, frontier=frontier,
+                                        checkpoints=checkpoints, checkpoint_every=2, crawl_id="task-1")
+            return crawler.crawl(sink=sink)
+        
+        writer = ArticleBatchWriter(store=store, batch_size=50)
+        
+        def dying_sink(article):
+            writer(article)
+            if writer.written + len(writer._batch) == 8:  # 第3页第2篇时被杀掉，批次未满
+                raise WorkerLost()
+        
+        dying_sink.flush = writer.flush
+        with pytest.raises(WorkerLost):
+            run(dying_sink)
+        assert writer.written == 6
+        
+        redelivered = ArticleBatchWriter(store=store, batch_size=50)
+        run(redelivered)
+        redelivered.flush()
+        
+        urls = [f"https://news.sina.com.cn/news/{page}/a{i}.html" for page in range(1, 11) for i in range(3)]
+        assert all(store.get_many(urls))
+    
+    def test_other_task_starts_fresh(self, make_crawler):
+        """测试新任务不使用其他任务留下的断点"""
+        checkpoints = CheckpointStore(backend='memory')
+        stream = make_crawler([], checkpoints).iter_crawl()
+        for _ in range(13):
+            next(stream)
+        
+        fetched = []
+        make_crawler(fetched, checkpoints, crawl_id="task-2").crawl()
+        assert fetched[0] == "https://news.sina.com.cn/news/1"
+        # 重叠运行的任务结束时不覆盖、不删除其他任务的断点
+        assert checkpoints.load("stub", "task-1")['current_url'] == "https://news.sina.com.cn/news/5"
+        assert checkpoints.load("stub", "task-2") is None
+    
+    def test_crawl_without_id_never_resumes(self, make_crawler):
+        """测试没有crawl_id的临时爬取不读取、不保存、不删除断点"""
+        checkpoints = CheckpointStore(backend='memory')
+        stream = make_crawler([], checkpoints, crawl_id=None).iter_crawl()
+        for _ in range(13):
+            next(stream)
+        assert checkpoints.load("stub", "task-1") is None
+        
+        stream = make_crawler([], checkpoints).iter_crawl()
+        for _ in range(13):
+            next(stream)
+        fetched = []
+        make_crawler(fetched, checkpoints, crawl_id=None).crawl()
+        assert fetched[0] == "https://news.sina.com.cn/news/1"
+        assert checkpoints.load("stub", "task-1")['crawl_id'] == "task-1"
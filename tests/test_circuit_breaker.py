@@ -0,0 +1,94 @@
+"""
+熔断器测试文件
+"""
+import threading
+import requests
+from unittest.mock import Mock, patch
+from app.crawlers.sina_crawler import SinaCrawler
+from app.crawlers.retry import RetryPolicy, RetryMetrics
+from app.crawlers.circuit_breaker import CircuitBreaker
+
+
+class TestCircuitBreaker:
+    """主机熔断测试类"""
+    
+    def make_breaker(self):
+        self.now = 1000.0
+        return CircuitBreaker(backend='memory', failure_threshold=3, open_seconds=60, clock=lambda: self.now)
+    
+    def test_state_transitions(self):
+        """测试 closed -> open -> half_open -> closed"""
+        breaker = self.make_breaker()
+        url = "https://news.qq.com/a.html"
+        
+        for _ in range(3):
+            assert breaker.allow(url)
+            breaker.record_failure(url)
+        assert not breaker.allow(url)
+        assert breaker.is_open(url)
+        assert breaker.open_hosts() == ["news.qq.com"]
+        
+        self.now += 61
+        assert breaker.allow(url)  # 探测请求
+        assert not breaker.allow(url)  # 探测期间其他请求仍被拒绝
+        breaker.record_success(url)
+        
+        assert breaker.allow(url)
+        assert breaker.open_hosts() == []
+    
+    def test_concurrent_failures_counted_atomically(self):
+        """测试并发失败计数不丢失；Redis后端每次失败只执行一次计数脚本"""
+        breaker = CircuitBreaker(backend='memory', failure_threshold=200, open_seconds=60)
+        url = "https://news.qq.com/a.html"
+        threads = [threading.Thread(target=lambda: [breaker.record_failure(url) for _ in range(50)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert breaker.open_hosts() == ["news.qq.com"]
+        
+        script = Mock(return_value=[3, 1])
+        client = Mock(register_script=Mock(return_value=script))
+        breaker = CircuitBreaker(backend='redis', failure_threshold=3, redis_client=client)
+        breaker.record_failure(url)
+        breaker.record_failure(url)
+        
+        assert client.register_script.call_count == 1 and script.call_count == 2
+        keys = script.call_args.kwargs['keys']
+        assert keys == ["news_engine:circuit:news.qq.com", "news_engine:circuit:open", "news_engine:circuit:news.qq.com:probe"]
+        assert script.call_args.kwargs['args'][:3] == ["news.qq.com", url, 3]
+        assert not client.hgetall.called and not client.hset.called
+    
+    def test_failed_probe_reopens(self):
+        """测试探测失败后重新熔断，定时探测成功后恢复"""
+        breaker = self.make_breaker()
+        url = "https://news.qq.com/a.html"
+        for _ in range(3):
+            breaker.record_failure(url)
+        
+        self.now += 61
+        assert breaker.allow(url)
+        breaker.record_failure(url)
+        assert not breaker.allow(url)
+        
+        self.now += 61
+        results = breaker.probe_open_hosts(lambda probe_url: Mock(status_code=200))
+        assert results == {"news.qq.com": "closed"}
+    
+    def test_get_page_fails_fast_when_open(self):
+        """测试熔断后不再发请求，也不再退避等待"""
+        def fake_get(url, headers=None, **kwargs):
+            raise requests.ConnectionError("refused")
+        
+        client = Mock(get=Mock(side_effect=fake_get))
+        breaker = self.make_breaker()
+        crawler = SinaCrawler("s", "https://news.sina.com.cn/", delay=0, http_client=client,
+                              circuit_breaker=breaker,
+                              retry_policy=RetryPolicy(max_retries=5, metrics=RetryMetrics(), rng=lambda low, high: 0))
+        
+        with patch('app.crawlers.base_crawler.time.sleep'):
+            assert crawler.get_page("https://news.sina.com.cn/1") is None
+            assert crawler.get_page("https://news.sina.com.cn/2") is None
+        
+        assert client.get.call_count == 3
+        assert crawler.errors[-1]['error'] == 'circuit open'
@@ -0,0 +1,33 @@
+"""
+正文提取测试文件
+"""
+from app.crawlers.tencent_crawler import TencentCrawler
+from app.crawlers.content_extractor import ContentExtractor
+from benchmarks.pages import render_article_page
+
+
+class TestContentExtractor:
+    """正文提取测试类"""
+    
+    def test_density_extraction_learns_site_hint(self):
+        """测试按密度选出正文容器（排除推荐列表和评论），并记住该站点的正文容器"""
+        extractor = ContentExtractor()
+        url = "https://news.sina.com.cn/c/doc-1.shtml"
+        
+        for seed, method in ((0, 'density'), (4, 'hint')):
+            html, body = render_article_page(seed)
+            result = extractor.extract(html, url)
+            assert result['content'] == body
+            assert result['method'] == method
+            assert result['selector'] == "div#artibody"
+        
+        assert extractor.hints.selectors_for("news.sina.com.cn") == ["div#artibody"]
+    
+    def test_extract_from_page_uses_configured_selectors(self):
+        """测试列表页没有条目时按content_selectors提示提取整页正文"""
+        html, body = render_article_page(1)
+        crawler = TencentCrawler("t", "https://news.qq.com/", content_extractor=ContentExtractor())
+        article = crawler.extract_from_page(crawler.parse_html(html), "https://news.qq.com/a/1.html")
+        
+        assert article['content'] == body
+        assert crawler.content_extractor.get_stats()['hint_hits'] == 1
@@ -0,0 +1,111 @@
+"""
+爬虫注册表与爬虫任务测试文件
+"""
+import json
+from datetime import datetime
+import pytest
+from app.config import settings
+from app.crawlers.base_crawler import RSSFeedCrawler
+from app.crawlers.http_cache import ValidatorCache
+from app.crawlers.politeness import HostRateLimiter
+from app.crawlers.registry import CrawlerRegistry, load_configured_sources
+from app.crawlers.sina_crawler import SinaCrawler
+from app.storage.article_store import ArticleStore
+from app.storage.blob_store import BlobStore
+from benchmarks.fake_portal import FakePortal, PortalConfig
+
+
+class TestCrawlerRegistry:
+    """爬虫注册表测试类"""
+    
+    def make_registry(self, portal=None):
+        kwargs = {'http_cache': ValidatorCache(backend='memory'), 'delay': 0}
+        if portal is not None:
+            kwargs['rate_limiter'] = HostRateLimiter(default_rate=0)
+        return CrawlerRegistry(**kwargs)
+    
+    def test_lease_reuses_configured_instances(self):
+        """测试同一新闻源复用实例，配置变化后重新创建，未注册的解析器按类型兜底"""
+        registry = self.make_registry()
+        source = {'id': 's1', 'url': 'https://news.sina.com.cn/roll/', 'type': 'website', 'parser': 'sina'}
+        
+        with registry.lease(source, crawl_id='t1', max_pages=3) as first:
+            assert isinstance(first, SinaCrawler)
+            assert (first.crawl_id, first.max_pages) == ('t1', 3)
+        with registry.lease(source, crawl_id='t2', force_crawl=True) as second:
+            assert second is first
+            assert (second.crawl_id, second.force_crawl, second.max_pages) == ('t2', True, settings.CRAWLER_MAX_PAGES)
+        
+        with registry.lease(dict(source, parser_backend='lxml')) as changed:
+            assert changed is not first
+        assert registry.get_stats()['idle'] == 1
+        
+        assert registry.resolve('baidu', 'rss') is RSSFeedCrawler
+        with pytest.raises(ValueError):
+            registry.resolve('baidu', 'website')
+        assert set(registry.warm()) == {'sina', 'tencent', 'rss', 'sitemap'}
+    
+    def test_start_crawler_task_streams_articles_to_store(self, monkeypatch):
+        """测试爬虫任务实际执行爬取，文章按批写入存储并投递详情抓取"""
+        from app.tasks import crawler_tasks
+        
+        store = ArticleStore(backend='memory')
+        blobs = BlobStore(backend='memory')
+        enqueued = []
+        monkeypatch.setattr('app.storage.article_store.get_article_store', lambda: store)
+        monkeypatch.setattr('app.storage.blob_store.get_blob_store', lambda: blobs)
+        monkeypatch.setattr(crawler_tasks, 'enqueue_details', enqueued.append)
+        
+        with FakePortal(PortalConfig(pages=3, items=20)) as portal:
+            registry = self.make_registry(portal)
+            monkeypatch.setattr('app.crawlers.registry.get_crawler_registry', lambda: registry)
+            source = {'url': portal.channel_url('sina'), 'type': 'website', 'parser': 'sina', 'is_active': True}
+            
+            outcome = crawler_tasks.start_crawler_task.apply(
+                args=['sina-1'], kwargs={'source': source, 'max_pages': 2}
+            ).get()
+            again = crawler_tasks.start_crawler_task.apply(args=['sina-1'], kwargs={'source': source}).get()
+        
+        assert outcome['status'] == 'success'
+        assert outcome['result']['pages_crawled'] == 2
+        assert outcome['result']['stored']['written'] == 40
+        # detail任务和任务结果只带引用，文章按引用从载荷存储读取
+        assert all(isinstance(ref, str) for ref in enqueued)
+        assert sum(len(blobs.get(ref)) for ref in enqueued) == 40
+        assert len(blobs.get(outcome['result']['payload'])) == 40
+        assert outcome['result']['payload_expires_at'] > datetime.utcnow().isoformat()
+        assert len(json.dumps(outcome)) < 4096
+        assert store.get_many([f"{portal.url}/sina/news/doc-10000.shtml?from=channel"])[0]["source_id"] == "sina-1"
+        
+        # 第二次复用同一实例，首页未变化（304），统计不沿用上一次
+        assert registry.get_stats()['reused'] == 1
+        assert again['result']['pages_not_modified'] == 1 and again['result']['articles_processed'] == 0
+        
+        missing = crawler_tasks.start_crawler_task.apply(args=['unknown']).get()
+        assert missing['status'] == 'error'
+    
+    def test_task_resolves_configured_source(self, monkeypatch, tmp_path):
+        """测试不传新闻源配置时，任务按ID从新闻源配置文件查找（没有id时以主机名作为ID）"""
+        from app.tasks import crawler_tasks
+        
+        configured = load_configured_sources("news_sources.json")
+        assert configured["news.sina.com.cn"]["parser"] == "sina"
+        assert configured["news.qq.com"]["parser"] == "tencent"
+        
+        monkeypatch.setattr('app.storage.article_store.get_article_store', lambda: ArticleStore(backend='memory'))
+        monkeypatch.setattr('app.storage.blob_store.get_blob_store', lambda: BlobStore(backend='memory'))
+        monkeypatch.setattr(crawler_tasks, 'enqueue_details', lambda ref: 1)
+        
+        with FakePortal(PortalConfig(pages=2, items=5)) as portal:
+            sources_file = tmp_path / "sources.json"
+            sources_file.write_text(json.dumps({"easy_sources": [
+                {"id": "portal-sina", "url": portal.channel_url('sina'), "type": "website", "parser": "sina"}
+            ]}), encoding='utf-8')
+            monkeypatch.setattr(settings, 'CRAWLER_SOURCES_FILE', str(sources_file))
+            registry = self.make_registry(portal)
+            monkeypatch.setattr('app.crawlers.registry.get_crawler_registry', lambda: registry)
+            
+            outcome = crawler_tasks.start_crawler_task.apply(args=['portal-sina']).get()
+        
+        assert outcome['status'] == 'success'
+        assert outcome['result']['articles_processed'] == 10
@@ -1,10 +1,10 @@
 """
 爬虫测试文件
 """
-import pytest
-from unittest.mock import Mock, patch
+from datetime import datetime
 from app.crawlers.sina_crawler import SinaCrawler
 from app.crawlers.tencent_crawler import TencentCrawler
+from app.crawlers import normalization
 
 
 class TestSinaCrawler:
@@ -24,7 +24,10 @@ class TestSinaCrawler:
         """测试发布时间解析"""
         time_str = "2024-01-01 10:30"
         parsed = self.crawler.parse_publish_time(time_str)
-        assert parsed == time_str
+        assert parsed == "2024-01-01T10:30:00+08:00"
+        
+        # 无法识别的时间原样返回
+        assert self.crawler.parse_publish_time("未知时间") == "未知时间"
     
     def test_is_valid_next_page_url(self):
         """测试下一页URL验证"""
@@ -54,8 +57,8 @@ class TestTencentCrawler:
     def test_parse_publish_time(self):
         """测试发布时间解析"""
         time_str = "刚刚"
-        parsed = self.crawler.parse_publish_time(time_str)
-        assert parsed == time_str
+        parsed = datetime.fromisoformat(self.crawler.parse_publish_time(time_str))
+        assert abs((parsed - normalization.now_local()).total_seconds()) < 60
     
     def test_infer_next_page_url(self):
         """测试下一页URL推断"""
@@ -73,7 +76,3 @@ def test_crawler_inheritance():
     from app.crawlers.base_crawler import WebsiteCrawler
     assert isinstance(sina_crawler, WebsiteCrawler)
     assert isinstance(tencent_crawler, WebsiteCrawler)
-
-
-if __name__ == "__main__":
-    pytest.main([__file__])
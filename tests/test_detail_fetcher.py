@@ -0,0 +1,117 @@
+"""
+详情页抓取测试文件
+"""
+import asyncio
+import httpx
+from unittest.mock import Mock
+from app.crawlers.async_fetcher import AsyncFetcher
+from app.crawlers.politeness import HostRateLimiter
+from app.crawlers.content_extractor import ContentExtractor
+from app.crawlers.encoding import EncodingDetector
+from app.crawlers.detail_fetcher import DetailFetcher, crawl_with_details
+from app.storage.article_store import ArticleStore
+
+
+class TestDetailFetcher:
+    """详情页抓取测试类"""
+    
+    def test_pipeline_fetches_bodies_concurrently(self, make_stub_crawler):
+        """测试详情页与列表页翻页并行抓取，正文批量写回存储"""
+        body = '<html><body><div id="artibody"><p>第一段正文内容，足够长的一段文字。</p><p>第二段。</p></div></body></html>'
+        order = []
+        
+        async def handler(request):
+            path = request.url.path
+            order.append(path)
+            if path.endswith('.html'):
+                await asyncio.sleep(0.05)
+                return httpx.Response(200, text=body)
+            return httpx.Response(200, text="<html></html>")
+        
+        store = ArticleStore(backend='memory')
+        store.save_many([{'url': "https://news.sina.com.cn/news/1/a0.html", 'title': "标题"}])
+        crawler = make_stub_crawler(max_pages=3)
+        details = DetailFetcher(workers=4, queue_size=2, batch_size=4, store=store,
+                                rate_limiter=HostRateLimiter(default_rate=0))
+        
+        async def run():
+            async with AsyncFetcher(transport=httpx.MockTransport(handler), per_host_limit=4) as fetcher:
+                result = await crawl_with_details(crawler, details, fetcher)
+                return result, fetcher.peak_in_flight
+        
+        result, peak = asyncio.run(run())
+        
+        assert result['pages_crawled'] == 3
+        assert result['details']['fetched'] == 9
+        assert result['details']['written'] == 9
+        assert 1 < peak <= 4
+        # 详情页在翻页结束之前就开始抓取
+        assert any(path.endswith('.html') for path in order[:order.index("/news/3")])
+        
+        saved = store.get_many(["https://news.sina.com.cn/news/1/a0.html"])[0]
+        assert saved['title'] == "标题"
+        assert saved['content'] == "第一段正文内容，足够长的一段文字。\n第二段。"
+        assert saved['detail_status'] == 'ok'
+    
+    def test_source_selectors_seed_template_hints(self):
+        """测试详情抓取按文章所属新闻源的content_selectors登记模板提示"""
+        body = '<html><body><div id="artibody"><p>第一段正文内容，足够长的一段文字。</p><p>第二段。</p></div></body></html>'
+        store = ArticleStore(backend='memory')
+        extractor = ContentExtractor()
+        details = DetailFetcher(workers=1, store=store, extractor=extractor,
+                                rate_limiter=HostRateLimiter(default_rate=0))
+        details.crawler.robots = None
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, text=body))
+        articles = [{'url': "https://finance.sina.com.cn/a.html", 'source_id': "news.sina.com.cn"},
+                    {'url': "https://finance.sina.com.cn/b.html", 'source_id': "news.sina.com.cn"}]
+        
+        async def run():
+            async with AsyncFetcher(transport=transport) as fetcher:
+                return await details.run(articles, fetcher)
+        
+        asyncio.run(run())
+        
+        assert extractor.hints.selectors_for("finance.sina.com.cn")[0] == '#artibody'
+        assert (extractor.hint_hits, extractor.density_runs) == (2, 0)
+    
+    def test_gbk_pages_decoded_with_encoding_detector(self):
+        """测试响应头没有charset的GBK详情页按meta和主机缓存识别的编码解码"""
+        text = "第一段正文内容，足够长的一段文字。" * 3
+        pages = {
+            '/a.html': f'<html><head><meta charset="gbk"></head><body><div><p>{text}</p></div></body></html>',
+            '/b.html': f'<html><body><div><p>{text}</p></div></body></html>',
+        }
+        store = ArticleStore(backend='memory')
+        details = DetailFetcher(workers=1, store=store, extractor=ContentExtractor(),
+                                rate_limiter=HostRateLimiter(default_rate=0), encoding_detector=EncodingDetector())
+        details.crawler.robots = None
+        transport = httpx.MockTransport(lambda request: httpx.Response(
+            200, content=pages[request.url.path].encode('gbk'), headers={'Content-Type': 'text/html'}))
+        urls = ["https://news.sina.com.cn/a.html", "https://news.sina.com.cn/b.html"]
+        
+        async def run():
+            async with AsyncFetcher(transport=transport) as fetcher:
+                return await details.run([{'url': url} for url in urls], fetcher)
+        
+        asyncio.run(run())
+        
+        assert [article['content'] for article in store.get_many(urls)] == [text, text]
+    
+    def test_extractor_error_written_back_as_failed(self):
+        """测试正文提取抛出异常的文章仍然写回，并标记为失败"""
+        store = ArticleStore(backend='memory')
+        url = "https://news.sina.com.cn/news/1/a0.html"
+        store.save_many([{'url': url, 'title': "标题"}])
+        extractor = Mock(extract=Mock(side_effect=ValueError("broken page")))
+        details = DetailFetcher(workers=2, batch_size=4, store=store, extractor=extractor,
+                                rate_limiter=HostRateLimiter(default_rate=0))
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, text="<html></html>"))
+        
+        async def run():
+            async with AsyncFetcher(transport=transport) as fetcher:
+                return await details.run([{'url': url, 'title': "标题"}], fetcher)
+        
+        stats = asyncio.run(run())
+        
+        assert (stats['failed'], stats['written']) == (1, 1)
+        assert store.get_many([url])[0]['detail_status'] == 'failed'
@@ -0,0 +1,49 @@
+"""
+编码检测测试文件
+"""
+import requests
+from unittest.mock import Mock, PropertyMock, patch
+from app.crawlers.sina_crawler import SinaCrawler
+from app.crawlers.http_cache import ValidatorCache
+from app.crawlers.encoding import EncodingDetector, normalize_encoding
+from benchmarks.pages import render_sina_channel
+
+
+class TestEncodingDetection:
+    """响应编码识别测试类"""
+    
+    def test_detection_order(self):
+        """测试 头 -> meta -> 主机缓存 -> UTF-8校验 的识别顺序"""
+        detector = EncodingDetector()
+        gbk_page = '<html><head><meta http-equiv="Content-Type" content="text/html; charset=gb2312"></head>'.encode('gbk')
+        url = "https://news.sina.com.cn/"
+        
+        assert normalize_encoding("GBK") == "gb18030"
+        assert detector.detect(url, gbk_page, "text/html; charset=utf-8") == ("utf-8", "header")
+        assert detector.detect(url, gbk_page, "text/html; charset=ISO-8859-1") == ("gb18030", "meta")
+        assert detector.detect(url, "<p>正文</p>".encode('gbk'), "text/html") == ("gb18030", "host")
+        assert detector.detect("https://a.com/", "<p>正文</p>".encode('utf-8')) == ("utf-8", "utf8")
+        assert detector.detect("https://b.com/", "<p>正文</p>".encode('gbk')) == ("gb18030", "fallback")
+    
+    def test_gbk_page_parsed_from_bytes_without_guessing(self):
+        """测试GBK页面按meta声明直接以字节解析，不触发requests的整页字符集猜测"""
+        html = render_sina_channel(items=5).replace('charset="utf-8"', 'charset="gbk"')
+        
+        def get(url, **kwargs):
+            response = requests.Response()
+            response.status_code = 200
+            response.url = url
+            response._content = html.encode('gbk')
+            response.headers['Content-Type'] = 'text/html'
+            return response
+        
+        sunk = []
+        crawler = SinaCrawler("s", "https://news.sina.com.cn/news/", delay=0, max_pages=1,
+                              http_client=Mock(get=Mock(side_effect=get)), http_cache=ValidatorCache(backend='memory'),
+                              encoding_detector=EncodingDetector())
+        with patch.object(requests.Response, 'apparent_encoding', new_callable=PropertyMock) as guess:
+            crawler.crawl(sink=sunk.append)
+            guess.assert_not_called()
+        
+        assert len(sunk) == 5
+        assert sunk[0]['title'] == crawler.parse_html(html).select_one('.news-item h2').get_text(strip=True)
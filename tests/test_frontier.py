@@ -0,0 +1,120 @@
+"""
+已见URL过滤器测试文件
+"""
+import multiprocessing
+import os
+import pytest
+from unittest.mock import MagicMock, Mock, patch
+from app.crawlers.frontier import SeenUrlFilter, SliceSpec, hash_pair
+
+
+class TestSeenUrlFilter:
+    """已见URL过滤器测试类"""
+    
+    def test_bulk_add_and_contains(self):
+        """测试批量写入与查询，没有漏判"""
+        frontier = SeenUrlFilter(backend='memory', capacity=1000, error_rate=0.01, generations=2)
+        urls = [f"https://news.sina.com.cn/{i}.html" for i in range(500)]
+        frontier.add_many(urls)
+        
+        assert all(frontier.contains_many(urls))
+        assert frontier.get_stats()['known_skipped'] == 500
+    
+    def test_false_positive_rate_within_bound(self):
+        """测试分片扩容后实际误判率不超过上界"""
+        frontier = SeenUrlFilter(backend='memory', capacity=200, error_rate=0.01, generations=1)
+        frontier.add_many(f"https://a.com/{i}" for i in range(1000))
+        
+        bound = frontier.false_positive_bound
+        assert bound < 0.01
+        probes = [f"https://b.com/{i}" for i in range(5000)]
+        false_positives = sum(frontier.contains_many(probes))
+        assert false_positives / len(probes) <= bound * 2
+    
+    def test_generations_rotate(self):
+        """测试超过保留代数的URL被整体遗忘"""
+        frontier = SeenUrlFilter(backend='memory', rotate_seconds=10, generations=2)
+        with patch('app.crawlers.frontier.time.time', return_value=100.0):
+            frontier.add("https://a.com/1")
+        with patch('app.crawlers.frontier.time.time', return_value=115.0):
+            assert frontier.contains("https://a.com/1")
+        with patch('app.crawlers.frontier.time.time', return_value=125.0):
+            assert not frontier.contains("https://a.com/1")
+    
+    def test_mmap_backend_persists(self, tmp_path):
+        """测试mmap后端重启后仍然记得已见URL"""
+        frontier = SeenUrlFilter(backend='mmap', path=str(tmp_path), capacity=100)
+        frontier.add_many(["https://a.com/1", "https://a.com/2"])
+        frontier.close()
+        
+        reopened = SeenUrlFilter(backend='mmap', path=str(tmp_path), capacity=100)
+        assert reopened.contains_many(["https://a.com/1", "https://a.com/2", "https://a.com/3"]) == [True, True, False]
+    
+    def test_mmap_writers_share_slices(self, tmp_path):
+        """测试多个进程写同一目录时，追加的分片被其他进程看到，分片不超过容量"""
+        def worker(index):
+            frontier = SeenUrlFilter(backend='mmap', path=str(tmp_path), capacity=100)
+            for start in range(0, 200, 10):
+                frontier.add_many([f"https://a.com/{index}/{i}" for i in range(start, start + 10)])
+            frontier.close()
+            os._exit(0)
+        
+        context = multiprocessing.get_context('fork')
+        processes = [context.Process(target=worker, args=(index,)) for index in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        
+        frontier = SeenUrlFilter(backend='mmap', path=str(tmp_path), capacity=100)
+        slices = frontier._local_generation(frontier.current_generation()).slices
+        assert sum(s.count for s in slices) == 800
+        assert all(s.count <= s.spec.capacity for s in slices)
+        assert all(frontier.contains_many([f"https://a.com/{index}/{i}" for index in range(4) for i in range(200)]))
+    
+    def test_redis_add_is_one_script_call(self):
+        """测试Redis写入把分片判断和写入交给一个脚本，布局过期时重新读取条数后重试"""
+        client = MagicMock()
+        client.hgetall.return_value = {b'0': b'95'}
+        script = Mock(side_effect=[0, 1])
+        client.register_script.return_value = script
+        frontier = SeenUrlFilter(backend='redis', capacity=100, generations=1, redis_client=client)
+        
+        frontier.add_many([f"https://a.com/{i}" for i in range(10)])
+        
+        assert script.call_count == 2
+        client.pipeline.assert_not_called()
+        kwargs = script.call_args.kwargs
+        first, second = (SliceSpec.for_index(i, 100, frontier.generation_error_rate) for i in range(2))
+        prefix = f"{SeenUrlFilter.REDIS_PREFIX}{frontier.current_generation()}:"
+        assert kwargs['keys'] == [prefix + 'meta', prefix + '0', prefix + '1']
+        assert kwargs['args'][:8] == [0, frontier.rotate_seconds * 2, 2, 10,
+                                      first.capacity, second.capacity, first.num_hashes, second.num_hashes]
+        h = hash_pair("https://a.com/0")
+        assert kwargs['args'][8:8 + first.num_hashes + second.num_hashes] == first.positions(h) + second.positions(h)
+    
+    def test_slice_parameters(self):
+        """测试后续分片容量翻倍、误判率减半"""
+        first = SliceSpec.for_index(0, 1000, 0.01)
+        second = SliceSpec.for_index(1, 1000, 0.01)
+        assert second.capacity == 2 * first.capacity
+        assert second.error_rate == pytest.approx(first.error_rate / 2)
+    
+    def test_crawler_skips_known_articles(self, make_stub_crawler):
+        """测试第二次爬取不再产出已见过的文章，force_crawl时全部产出"""
+        frontier = SeenUrlFilter(backend='memory')
+        
+        def run(**kwargs):
+            sunk = []
+            crawler = make_stub_crawler(max_pages=3, frontier=frontier, **kwargs)
+            return crawler.crawl(sink=sunk.append), sunk
+        
+        first, first_sunk = run()
+        second, second_sunk = run()
+        forced, forced_sunk = run(force_crawl=True)
+        
+        assert len(first_sunk) == 9
+        assert second_sunk == []
+        assert second['articles_skipped'] == 3
+        assert second['pages_crawled'] == 1
+        assert len(forced_sunk) == 9
@@ -0,0 +1,75 @@
+"""
+HTTP缓存测试文件
+"""
+import asyncio
+import httpx
+from unittest.mock import Mock, patch
+from app.crawlers.sina_crawler import SinaCrawler
+from app.crawlers.tencent_crawler import TencentCrawler
+from app.crawlers.async_fetcher import AsyncFetcher
+from app.crawlers.http_cache import ValidatorCache
+
+
+class TestValidatorCache:
+    """条件请求缓存测试类"""
+    
+    def run_crawl(self, crawler, transport):
+        async def run():
+            async with AsyncFetcher(transport=transport) as fetcher:
+                return await crawler.crawl_async(fetcher)
+        return asyncio.run(run())
+    
+    def test_not_modified_skips_parsing(self):
+        """测试304响应跳过解析并统计节省的字节数"""
+        cache = ValidatorCache(backend='memory')
+        html = '<html><body><div class="news-item"><h2>标题</h2></div></body></html>'
+        seen_headers = []
+        
+        def handler(request):
+            seen_headers.append(request.headers.get('If-None-Match'))
+            if request.headers.get('If-None-Match') == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, text=html, headers={'ETag': '"v1"'})
+        
+        transport = httpx.MockTransport(handler)
+        url = "https://news.sina.com.cn/news/"
+        
+        first = self.run_crawl(SinaCrawler("s", url, delay=0, max_pages=1, http_cache=cache), transport)
+        crawler = SinaCrawler("s", url, delay=0, max_pages=1, http_cache=cache)
+        with patch.object(crawler, 'parse_html') as parse_html:
+            second = self.run_crawl(crawler, transport)
+            parse_html.assert_not_called()
+        
+        assert first['pages_crawled'] == 1
+        assert second['pages_crawled'] == 0
+        assert second['pages_not_modified'] == 1
+        assert seen_headers == [None, '"v1"']
+        # 304次数和节省的字节数随爬取结果上报
+        assert second['http_cache']['not_modified_hits'] == 1
+        assert second['http_cache']['bytes_saved'] == len(html.encode('utf-8'))
+    
+    def test_identical_body_counts_as_unchanged(self):
+        """测试无验证器时用内容哈希判断未变化"""
+        cache = ValidatorCache(backend='memory')
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, text="<html>same</html>"))
+        url = "https://news.qq.com/news/"
+        
+        self.run_crawl(TencentCrawler("t", url, delay=0, max_pages=1, http_cache=cache), transport)
+        second = self.run_crawl(TencentCrawler("t", url, delay=0, max_pages=1, http_cache=cache), transport)
+        forced = self.run_crawl(
+            TencentCrawler("t", url, delay=0, max_pages=1, http_cache=cache, force_crawl=True), transport
+        )
+        
+        assert second['pages_not_modified'] == 1
+        assert forced['pages_crawled'] == 1
+        assert cache.get_stats()['unchanged_hits'] == 1
+    
+    def test_lru_eviction(self):
+        """测试超过容量时淘汰最久未使用的条目"""
+        cache = ValidatorCache(backend='memory', max_entries=2)
+        response = Mock(status_code=200, content=b"x", headers={'ETag': '"e"'})
+        for url in ["https://a/1", "https://a/2", "https://a/3"]:
+            cache.store(url, response)
+        
+        assert cache.conditional_headers("https://a/1") == {}
+        assert cache.conditional_headers("https://a/3") == {'If-None-Match': '"e"'}
@@ -0,0 +1,74 @@
+"""
+HTTP连接池测试文件
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from app.crawlers.sina_crawler import SinaCrawler
+from app.crawlers.http_cache import ValidatorCache
+from app.crawlers.http_client import PooledHttpClient
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """返回固定页面的keep-alive处理器"""
+    protocol_version = "HTTP/1.1"
+    
+    def do_GET(self):
+        body = '<html><body><div class="news-item"><h2>标题</h2></div></body></html>'.encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "session=abc; Path=/")
+        self.send_header("X-Seen-Cookie", self.headers.get("Cookie", ""))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class TestPooledHttpClient:
+    """共享连接池测试类"""
+    
+    def setup_method(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+    
+    def teardown_method(self):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def test_connections_reused_across_crawlers(self):
+        """测试多个爬虫实例复用同一条keep-alive连接"""
+        client = PooledHttpClient()
+        cache = ValidatorCache(backend='memory')
+        for i in range(3):
+            crawler = SinaCrawler(
+                f"s{i}", f"{self.base_url}/news/{i}/", delay=0, max_pages=1,
+                http_client=client, http_cache=cache
+            )
+            with crawler:
+                crawler.crawl()
+        
+        stats = client.get_stats()
+        assert stats['requests'] == 3
+        assert stats['connections_created'] == 1
+        assert stats['reuse_ratio'] == pytest.approx(2 / 3)
+        assert stats['open_connections'] == 1
+        assert not client.session.headers
+        client.close()
+    
+    def test_shared_session_keeps_no_cookies(self):
+        """测试共享会话不保存站点下发的Cookie，后续请求不会带上"""
+        client = PooledHttpClient()
+        client.get(f"{self.base_url}/a")
+        response = client.get(f"{self.base_url}/b")
+        
+        assert response.headers["X-Seen-Cookie"] == ""
+        assert len(client.session.cookies) == 0
+        client.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,49 @@
+"""
+文本规范化测试文件
+"""
+from datetime import datetime
+import pytest
+from app.crawlers import normalization
+
+
+class TestNormalization:
+    """文本与时间规范化测试类"""
+    
+    now = datetime(2024, 3, 10, 12, 0, tzinfo=normalization.TIMEZONE)
+    
+    def test_clean_text(self):
+        """测试一次过滤特殊字符并合并空白"""
+        assert normalization.clean_text("  ★ 标题：测试 \n\t 内容! ") == "标题测试 内容!"
+        assert normalization.clean_text(None) == ""
+        assert normalization.clean_texts(["  a  b ", "", "【c】"]) == ["a b", "", "c"]
+    
+    @pytest.mark.parametrize("text,expected", [
+        ("刚刚", datetime(2024, 3, 10, 12, 0)),
+        ("3小时前", datetime(2024, 3, 10, 9, 0)),
+        ("10分钟前", datetime(2024, 3, 10, 11, 50)),
+        ("2天前", datetime(2024, 3, 8, 12, 0)),
+        ("昨天 08:15", datetime(2024, 3, 9, 8, 15)),
+        ("2024-01-01 10:30", datetime(2024, 1, 1, 10, 30)),
+        ("2023年12月31日 23:59:59", datetime(2023, 12, 31, 23, 59, 59)),
+        ("03-09 18:20", datetime(2024, 3, 9, 18, 20)),
+        ("12-25", datetime(2023, 12, 25)),
+        ("09:45", datetime(2024, 3, 10, 9, 45)),
+        ("23:30", datetime(2024, 3, 9, 23, 30)),
+    ])
+    def test_parse_publish_time(self, text, expected):
+        """测试各种发布时间写法解析为带时区的datetime"""
+        parsed = normalization.parse_publish_time(text, now=self.now)
+        assert parsed == expected.replace(tzinfo=normalization.TIMEZONE)
+        assert parsed.tzinfo is not None
+    
+    def test_parse_publish_time_invalid(self):
+        """测试无法识别或非法的时间"""
+        assert normalization.parse_publish_time("来源: 新华社", now=self.now) is None
+        assert normalization.parse_publish_time("02-30", now=self.now) is None
+        assert normalization.parse_publish_time("", now=self.now) is None
+    
+    def test_parse_publish_times_batch(self):
+        """测试批量解析使用同一基准时间"""
+        parsed = normalization.parse_publish_times(["1小时前", "1小时前", None], now=self.now)
+        assert parsed[0] == parsed[1] == datetime(2024, 3, 10, 11, 0, tzinfo=normalization.TIMEZONE)
+        assert parsed[2] is None
@@ -0,0 +1,90 @@
+"""
+解析后端测试文件
+"""
+import pytest
+from app.crawlers.sina_crawler import SinaCrawler
+from app.crawlers.tencent_crawler import TencentCrawler
+from app.crawlers.parsers import PARSER_BACKENDS, get_parser_backend
+from app.crawlers.extraction import get_extraction_plan
+from app.crawlers import normalization
+from benchmarks.pages import render_sina_channel, render_tencent_channel
+
+
+@pytest.mark.parametrize("backend", list(PARSER_BACKENDS))
+class TestParserBackends:
+    """解析后端一致性测试类"""
+    
+    def test_node_api(self, backend):
+        """测试各后端节点接口行为一致"""
+        crawler = SinaCrawler("s", "https://news.sina.com.cn/news/", parser_backend=backend)
+        soup = crawler.parse_html(
+            '<html><head><title>页面</title></head><body>'
+            '<div class="a"><h2> 标题 <b>加粗</b></h2><a href="/x.html" rel="next">下一页</a></div>'
+            '</body></html>'
+        )
+        
+        assert soup.find('title').get_text(strip=True) == "页面"
+        assert soup.select_one('.a h2').get_text(' ', strip=True) == "标题 加粗"
+        assert soup.select_one('a[rel="next"]')['href'] == "/x.html"
+        assert soup.select_one('.missing') is None
+        assert [a.get('href') for a in soup.select('a[href]')] == ["/x.html"]
+        assert crawler.extract_links(soup, "https://news.sina.com.cn/") == ["https://news.sina.com.cn/x.html"]
+    
+    def test_same_articles_as_bs4(self, backend, monkeypatch):
+        """测试各后端提取出的文章与bs4一致"""
+        # 固定相对时间（“N小时前”）的基准
+        now = normalization.now_local()
+        monkeypatch.setattr(normalization, 'now_local', lambda: now)
+        for crawler_class, html in [
+            (SinaCrawler, render_sina_channel(items=20)),
+            (TencentCrawler, render_tencent_channel(items=20)),
+        ]:
+            expected = crawler_class("c", "https://news.example.com/news/", parser_backend='bs4')
+            actual = crawler_class("c", "https://news.example.com/news/", parser_backend=backend)
+            page_url = "https://news.example.com/news/"
+            
+            strip = lambda articles: [{k: v for k, v in a.items() if k != 'extracted_at'} for a in articles]
+            want = strip(expected.extract_articles(expected.parse_html(html), page_url))
+            got = strip(actual.extract_articles(actual.parse_html(html), page_url))
+            
+            assert len(want) == 20
+            assert got == want
+
+
+@pytest.mark.parametrize("backend", list(PARSER_BACKENDS))
+def test_extraction_plan_matches_select_one(backend):
+    """测试编译后的提取计划与逐字段select_one结果一致"""
+    selectors = {
+        'title': 'h1, h2, .title',
+        'content': '.summary, p.desc',
+        'link': 'a[href]',
+        'tag': '.meta .tag',  # 后代组合器，退回select_one
+        'missing': '.nothing',
+    }
+    html = (
+        '<div class="item"><a name="anchor">无链接</a>'
+        '<p class="desc">描述</p><span class="title">副标题</span><h2>主标题</h2>'
+        '<a href="/1.html">链接</a><div class="meta"><i class="tag">标签</i></div></div>'
+    )
+    item = get_parser_backend(backend).parse(html).select_one('.item')
+    plan = get_extraction_plan(selectors)
+    
+    found = plan.extract(item)
+    
+    assert set(plan.fallback) == {'tag'}
+    assert plan is get_extraction_plan(dict(selectors))
+    for field, selector in selectors.items():
+        expected = item.select_one(selector)
+        actual = found[field]
+        if expected is None:
+            assert actual is None
+        else:
+            assert actual.get_text(strip=True) == expected.get_text(strip=True)
+    assert found['title'].get_text() == "副标题"
+    assert found['link']['href'] == "/1.html"
+
+
+def test_builtin_list_selectors_compile_to_single_pass():
+    """测试内置爬虫的列表条目选择器都能编译进单次遍历（不退回select_one）"""
+    for crawler in (SinaCrawler("sina", "https://news.sina.com.cn"), TencentCrawler("tencent", "https://news.qq.com")):
+        assert crawler.extraction_plan.fallback == {}
@@ -0,0 +1,36 @@
+"""
+主机限速测试文件
+"""
+import pytest
+from app.crawlers.sina_crawler import SinaCrawler
+from app.crawlers.politeness import TokenBucket, HostRateLimiter
+
+
+class TestHostRateLimiter:
+    """主机级令牌桶限速测试类"""
+    
+    def test_token_bucket_burst_then_rate(self):
+        """测试突发额度用完后按速率排队"""
+        bucket = TokenBucket(rate=2.0, burst=2)
+        now = bucket.updated_at
+        
+        assert bucket.reserve(now) == 0.0
+        assert bucket.reserve(now) == 0.0
+        assert bucket.reserve(now) == pytest.approx(0.5)
+        assert bucket.reserve(now) == pytest.approx(1.0)
+    
+    def test_crawlers_share_host_budget(self):
+        """测试访问同一主机的爬虫共享预算，不同主机互不影响"""
+        limiter = HostRateLimiter(default_rate=1.0, default_burst=1)
+        SinaCrawler("a", "https://news.sina.com.cn/a/", rate_limiter=limiter, rate_limit=1.0, rate_burst=1)
+        SinaCrawler("b", "https://news.sina.com.cn/b/", rate_limiter=limiter)
+        
+        assert limiter.reserve("https://news.sina.com.cn/a/1.html") == 0.0
+        assert limiter.reserve("https://news.sina.com.cn/b/1.html") > 0.0
+        assert limiter.reserve("https://news.qq.com/1.html") == 0.0
+    
+    def test_zero_rate_is_unlimited(self):
+        """测试速率为0时不限速"""
+        limiter = HostRateLimiter()
+        limiter.configure_host("example.com", rate=0)
+        assert all(limiter.reserve("https://example.com/") == 0.0 for _ in range(10))
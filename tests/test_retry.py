@@ -0,0 +1,108 @@
+"""
+重试策略测试文件
+"""
+import asyncio
+import httpx
+import requests
+from unittest.mock import Mock, patch
+from app.crawlers.sina_crawler import SinaCrawler
+from app.crawlers.async_fetcher import AsyncFetcher
+from app.crawlers.retry import RetryPolicy, RetryMetrics
+
+
+class TestRetryPolicy:
+    """重试策略测试类"""
+    
+    @staticmethod
+    def http_error(status, headers=None):
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers or {})
+        return requests.HTTPError(response=response)
+    
+    def test_classification(self):
+        """测试只重试临时性错误"""
+        policy = RetryPolicy(metrics=RetryMetrics())
+        assert policy.classify(self.http_error(503)) == "status_503"
+        assert policy.classify(self.http_error(429)) == "status_429"
+        assert policy.classify(self.http_error(404)) is None
+        assert policy.classify(requests.Timeout()) == "timeout"
+        assert policy.classify(httpx.ConnectError("refused")) == "connection"
+        assert policy.classify(requests.exceptions.InvalidURL()) is None
+    
+    def test_full_jitter_backoff(self):
+        """测试退避上界按指数增长并封顶"""
+        policy = RetryPolicy(max_retries=10, base_delay=1.0, max_delay=5.0,
+                             metrics=RetryMetrics(), rng=lambda low, high: high)
+        assert [policy.backoff(n) for n in range(5)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+    
+    def test_retry_after(self):
+        """测试优先使用Retry-After，过长时放弃"""
+        metrics = RetryMetrics()
+        policy = RetryPolicy(max_retries=3, max_retry_after=60, metrics=metrics)
+        url = "https://news.qq.com/a.html"
+        
+        assert policy.next_delay(url, 0, self.http_error(429, {'Retry-After': '7'})) == 7.0
+        assert policy.next_delay(url, 0, self.http_error(503, {'Retry-After': '3600'})) is None
+        assert policy.next_delay(url, 3, self.http_error(503)) is None
+        
+        stats = metrics.get_stats("news.qq.com")
+        assert stats['retry'] == 1
+        assert stats['gave_up'] == 2
+    
+    def test_get_page_retries_transient_errors_only(self):
+        """测试503退避后重试成功，404不重试"""
+        responses = {
+            "https://news.sina.com.cn/a": [503, 200],
+            "https://news.sina.com.cn/missing": [404, 200],
+        }
+        
+        def fake_get(url, headers=None, **kwargs):
+            response = requests.Response()
+            response.status_code = responses[url].pop(0)
+            response._content = b"ok"
+            return response
+        
+        client = Mock(get=Mock(side_effect=fake_get))
+        metrics = RetryMetrics()
+        crawler = SinaCrawler("s", "https://news.sina.com.cn/", delay=0, http_client=client,
+                              retry_policy=RetryPolicy(max_retries=3, metrics=metrics, rng=lambda low, high: 0.25))
+        
+        with patch('app.crawlers.base_crawler.time.sleep') as sleep:
+            assert crawler.get_page("https://news.sina.com.cn/a").status_code == 200
+            assert crawler.get_page("https://news.sina.com.cn/missing") is None
+        
+        sleep.assert_called_once_with(0.25)
+        assert client.get.call_count == 3
+        stats = metrics.get_stats("news.sina.com.cn")
+        assert stats['success_after_retry'] == 1
+        assert stats['not_retryable'] == 1
+    
+    def test_async_retry_does_not_block_loop(self):
+        """测试异步模式下退避期间其他协程继续运行"""
+        attempts = []
+        
+        def handler(request):
+            attempts.append(request.url)
+            return httpx.Response(503 if len(attempts) == 1 else 200, text="ok")
+        
+        crawler = SinaCrawler("s", "https://news.sina.com.cn/", delay=0,
+                              retry_policy=RetryPolicy(max_retries=2, metrics=RetryMetrics(),
+                                                       rng=lambda low, high: 0.05))
+        ticks = []
+        
+        async def ticker():
+            for _ in range(3):
+                ticks.append(1)
+                await asyncio.sleep(0.01)
+        
+        async def run():
+            async with AsyncFetcher(transport=httpx.MockTransport(handler)) as fetcher:
+                response, _ = await asyncio.gather(
+                    crawler.get_page_async("https://news.sina.com.cn/a", fetcher), ticker()
+                )
+            return response
+        
+        assert asyncio.run(run()).status_code == 200
+        assert len(attempts) == 2
+        assert len(ticks) == 3
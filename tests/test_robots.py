@@ -0,0 +1,84 @@
+"""
+robots协议测试文件
+"""
+import requests
+from unittest.mock import Mock
+from app.crawlers.sina_crawler import SinaCrawler
+from app.crawlers.tencent_crawler import TencentCrawler
+from app.crawlers.politeness import HostRateLimiter
+from app.crawlers.robots import RobotsCache, parse_robots
+
+
+ROBOTS_TXT = """
+User-agent: *
+Disallow: /private/
+Allow: /private/public/
+Disallow: /*.json$
+Crawl-delay: 2
+
+User-agent: NewsEngine
+User-agent: OtherBot
+Disallow: /search
+Allow: /search/about
+"""
+
+
+class TestRobots:
+    """robots.txt缓存测试类"""
+    
+    def test_longest_match_wins(self):
+        """测试最长匹配优先，通配符和结束符"""
+        rules = parse_robots(ROBOTS_TXT, "SomeBot")
+        assert rules.crawl_delay == 2
+        assert not rules.allowed("https://a.com/private/x.html")
+        assert rules.allowed("https://a.com/private/public/x.html")
+        assert not rules.allowed("https://a.com/data/feed.json")
+        assert rules.allowed("https://a.com/data/feed.json?x=1")
+        assert rules.allowed("https://a.com/search")
+    
+    def test_agent_specific_group(self):
+        """测试匹配本爬虫标识的分组优先于 * 分组"""
+        rules = parse_robots(ROBOTS_TXT, "NewsEngine")
+        assert rules.crawl_delay is None
+        assert not rules.allowed("https://a.com/search?q=x")
+        assert rules.allowed("https://a.com/search/about")
+        assert rules.allowed("https://a.com/private/x.html")
+    
+    def test_cached_and_crawl_delay_applied(self):
+        """测试robots.txt只请求一次，Crawl-delay写入主机限速器"""
+        client = Mock(get=Mock(return_value=Mock(status_code=200, content=ROBOTS_TXT.encode())))
+        limiter = HostRateLimiter(default_rate=5.0, default_burst=5)
+        robots = RobotsCache(backend='memory', agent="SomeBot", http_client=client, rate_limiter=limiter)
+        
+        assert not robots.allowed("https://news.qq.com/private/1.html")
+        assert robots.allowed("https://news.qq.com/a/1.html")
+        assert client.get.call_count == 1
+        assert limiter.get_host_rate("news.qq.com") == 0.5
+        
+        # 规则已缓存后新建的爬虫按配置速率configure_host，不能超过Crawl-delay
+        TencentCrawler("t", "https://news.qq.com/", rate_limiter=limiter, robots=robots, rate_limit=10.0, rate_burst=5)
+        assert limiter.get_host_rate("news.qq.com") == 0.5
+        TencentCrawler("t", "https://news.qq.com/", rate_limiter=limiter, robots=robots, rate_limit=0.2)
+        assert limiter.get_host_rate("news.qq.com") == 0.2
+    
+    def test_negative_caching(self):
+        """测试robots.txt无法访问时全部禁止，并缓存失败结果"""
+        client = Mock(get=Mock(side_effect=requests.ConnectionError("down")))
+        robots = RobotsCache(backend='memory', http_client=client)
+        
+        assert not robots.allowed("https://news.qq.com/a/1.html")
+        assert not robots.allowed("https://news.qq.com/a/2.html")
+        assert client.get.call_count == 1
+        assert robots.allowed("https://other.com/a.html", fetch=False)
+    
+    def test_is_valid_link_filters_disallowed(self):
+        """测试extract_links在请求之前过滤掉robots禁止的链接"""
+        client = Mock(get=Mock(return_value=Mock(status_code=200, content=ROBOTS_TXT.encode())))
+        robots = RobotsCache(backend='memory', agent="SomeBot", http_client=client,
+                             rate_limiter=HostRateLimiter())
+        crawler = SinaCrawler("s", "https://news.sina.com.cn/", robots=robots)
+        soup = crawler.parse_html('<a href="/private/1.html">1</a><a href="/a/2.html">2</a>')
+        
+        assert crawler.extract_links(soup, "https://news.sina.com.cn/") == ["https://news.sina.com.cn/a/2.html"]
+        assert crawler.get_page("https://news.sina.com.cn/private/1.html") is None
+        assert crawler.errors[-1]['error'] == 'disallowed by robots.txt'
@@ -0,0 +1,59 @@
+"""
+RSS爬虫测试文件
+"""
+import requests
+from unittest.mock import Mock, patch
+from app.crawlers.base_crawler import RSSFeedCrawler
+from app.crawlers.http_cache import ValidatorCache
+from app.crawlers.frontier import SeenUrlFilter
+
+
+RSS_FEED = """<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0"><channel><title>新浪新闻</title>
+<item><title>标题一</title><link>https://news.sina.com.cn/a.html?utm_source=rss</link>
+<description>摘要一</description><pubDate>Fri, 01 Mar 2024 02:00:00 GMT</pubDate></item>
+<item><title>标题二</title><link>/b.html</link><description>摘要二</description></item>
+</channel></rss>""".encode('utf-8')
+
+
+class TestRSSFeedCrawler:
+    """RSS爬虫测试类"""
+    
+    def test_single_conditional_fetch(self):
+        """测试订阅源只通过共享客户端请求一次，未变化时304跳过解析"""
+        url = "https://news.sina.com.cn/rss.xml"
+        cache = ValidatorCache(backend='memory')
+        seen_headers = []
+        
+        def get(request_url, headers=None, **kwargs):
+            seen_headers.append(headers.get('If-None-Match'))
+            response = requests.Response()
+            response.url = request_url
+            if headers.get('If-None-Match') == '"f1"':
+                response.status_code = 304
+            else:
+                response.status_code = 200
+                response._content = RSS_FEED
+                response.headers.update({'ETag': '"f1"', 'Content-Type': 'application/rss+xml'})
+            return response
+        
+        def run():
+            sunk = []
+            crawler = RSSFeedCrawler("rss", url, delay=0, http_client=Mock(get=Mock(side_effect=get)),
+                                     http_cache=cache, frontier=SeenUrlFilter(backend='memory'))
+            with patch.object(crawler, 'parse_html') as parse_html:
+                result = crawler.crawl(sink=sunk.append)
+                parse_html.assert_not_called()
+            return sunk, result
+        
+        sunk, first = run()
+        _, second = run()
+        
+        assert seen_headers == [None, '"f1"']
+        assert [a['url'] for a in sunk] == ["https://news.sina.com.cn/a.html?utm_source=rss", "https://news.sina.com.cn/b.html"]
+        assert sunk[0]['title'] == "标题一"
+        assert sunk[0]['content'] == "摘要一"
+        assert sunk[0]['publish_time'] == "2024-03-01T10:00:00+08:00"
+        assert first['pages_crawled'] == 1
+        assert second['pages_crawled'] == 0
+        assert second['pages_not_modified'] == 1
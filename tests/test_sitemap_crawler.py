@@ -0,0 +1,180 @@
+"""
+站点地图爬虫测试文件
+"""
+import gzip
+import io
+import requests
+from unittest.mock import Mock
+from app.crawlers.http_cache import ValidatorCache
+from app.crawlers.frontier import SeenUrlFilter
+from app.crawlers.sitemap_crawler import SitemapCrawler, SitemapWatermarks, iter_sitemap_entries
+
+
+def sitemap_index(*children):
+    entries = "".join(f"<sitemap><loc>{loc}</loc><lastmod>{lastmod}</lastmod></sitemap>" for loc, lastmod in children)
+    return f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</sitemapindex>'.encode()
+
+
+def news_sitemap(*entries):
+    urls = "".join(
+        f"<url><loc>{loc}</loc><news:news><news:publication><news:name>新浪新闻</news:name></news:publication>"
+        f"<news:publication_date>{date}</news:publication_date><news:title>{title}</news:title></news:news>"
+        f"<image:image><image:title>图片</image:title></image:image></url>"
+        for loc, date, title in entries
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+        'xmlns:news="http://www.google.com/schemas/sitemap-news/0.9" '
+        f'xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">{urls}</urlset>'
+    ).encode()
+
+
+class TestSitemapCrawler:
+    """站点地图爬虫测试类"""
+    
+    def make_client(self, documents, requested):
+        def get(url, headers=None, stream=False, **kwargs):
+            requested.append(url)
+            response = requests.Response()
+            response.status_code = 200 if url in documents else 404
+            response.raw = io.BytesIO(documents.get(url, b''))
+            response.url = url
+            return response
+        return Mock(get=Mock(side_effect=get))
+    
+    def test_streaming_parser_releases_elements(self):
+        """测试分块增量解析（含gzip）"""
+        body = news_sitemap(*[(f"https://news.sina.com.cn/{i}.html", "2024-03-01T08:00:00+08:00", f"标题{i}")
+                              for i in range(500)])
+        for data in (body, gzip.compress(body)):
+            chunks = (data[i:i + 100] for i in range(0, len(data), 100))
+            entries = list(iter_sitemap_entries(chunks))
+            assert len(entries) == 500
+            assert entries[0] == ('url', {
+                'loc': "https://news.sina.com.cn/0.html", 'name': "新浪新闻",
+                'publication_date': "2024-03-01T08:00:00+08:00", 'title': "标题0",
+            })
+    
+    def test_incremental_crawl_with_watermark(self):
+        """测试第二次爬取只请求有更新的子站点地图，只产出水位线之后的文章"""
+        base = "https://news.sina.com.cn"
+        documents = {
+            f"{base}/sitemap_index.xml": sitemap_index(
+                (f"{base}/news-1.xml", "2024-03-01T10:00:00+08:00"),
+                (f"{base}/news-2.xml.gz", "2024-03-01T09:00:00+08:00"),
+            ),
+            f"{base}/news-1.xml": news_sitemap(
+                (f"{base}/a.html", "2024-03-01T10:00:00+08:00", "甲"),
+                (f"{base}/b.html?tj=rss", "2024-03-01T09:30:00+08:00", "乙"),
+            ),
+            f"{base}/news-2.xml.gz": gzip.compress(news_sitemap(
+                (f"{base}/c.html", "2024-03-01T09:00:00+08:00", "丙"),
+            )),
+        }
+        watermarks = SitemapWatermarks(backend='memory')
+        frontier = SeenUrlFilter(backend='memory')
+        
+        def run():
+            requested, sunk = [], []
+            crawler = SitemapCrawler("sitemap", f"{base}/sitemap_index.xml", delay=0,
+                                     http_client=self.make_client(documents, requested),
+                                     http_cache=ValidatorCache(backend='memory'),
+                                     frontier=frontier, watermarks=watermarks)
+            result = crawler.crawl(sink=sunk.append)
+            return requested, sunk, result
+        
+        requested, sunk, result = run()
+        assert [a['url'] for a in sunk] == [f"{base}/a.html", f"{base}/b.html?tj=rss", f"{base}/c.html"]
+        assert sunk[0]['title'] == "甲"
+        assert sunk[0]['publish_time'] == "2024-03-01T10:00:00+08:00"
+        assert result['pages_crawled'] == 3
+        
+        documents[f"{base}/sitemap_index.xml"] = sitemap_index(
+            (f"{base}/news-1.xml", "2024-03-01T11:00:00+08:00"),
+            (f"{base}/news-2.xml.gz", "2024-03-01T09:00:00+08:00"),
+        )
+        documents[f"{base}/news-1.xml"] = news_sitemap(
+            (f"{base}/d.html", "2024-03-01T11:00:00+08:00", "丁"),
+            (f"{base}/a.html", "2024-03-01T10:00:00+08:00", "甲"),
+        )
+        requested, sunk, result = run()
+        assert requested == [f"{base}/sitemap_index.xml", f"{base}/news-1.xml"]
+        assert [a['url'] for a in sunk] == [f"{base}/d.html"]
+    
+    def test_failed_child_keeps_watermark(self):
+        """测试子站点地图抓取失败时不推进水位线，与水位线同一时刻的新条目不被跳过"""
+        base = "https://news.sina.com.cn"
+        documents = {
+            f"{base}/sitemap_index.xml": sitemap_index(
+                (f"{base}/news-1.xml", "2024-03-01T10:00:00+08:00"),
+                (f"{base}/news-2.xml", "2024-03-01T09:00:00+08:00"),
+            ),
+            f"{base}/news-1.xml": news_sitemap((f"{base}/a.html", "2024-03-01T10:00:00+08:00", "甲")),
+        }
+        watermarks = SitemapWatermarks(backend='memory')
+        frontier = SeenUrlFilter(backend='memory')
+        
+        def run():
+            sunk = []
+            crawler = SitemapCrawler("sitemap", f"{base}/sitemap_index.xml", delay=0,
+                                     http_client=self.make_client(documents, []),
+                                     http_cache=ValidatorCache(backend='memory'),
+                                     frontier=frontier, watermarks=watermarks)
+            crawler.crawl(sink=sunk.append)
+            return [a['url'] for a in sunk]
+        
+        # news-2 抓取失败（404）
+        assert run() == [f"{base}/a.html"]
+        assert watermarks.get("sitemap") is None
+        
+        documents[f"{base}/news-2.xml"] = news_sitemap((f"{base}/c.html", "2024-03-01T09:00:00+08:00", "丙"))
+        assert run() == [f"{base}/c.html"]
+        assert watermarks.get("sitemap").hour == 10
+        
+        documents[f"{base}/news-1.xml"] = news_sitemap(
+            (f"{base}/e.html", "2024-03-01T10:00:00+08:00", "戊"),
+            (f"{base}/a.html", "2024-03-01T10:00:00+08:00", "甲"),
+        )
+        assert run() == [f"{base}/e.html"]
+    
+    def test_unchanged_index_rechecks_children(self):
+        """测试sitemap index返回304时仍按上次记录的子站点地图检查更新"""
+        base = "https://news.sina.com.cn"
+        index_url = f"{base}/sitemap_index.xml"
+        documents = {
+            index_url: sitemap_index((f"{base}/news-1.xml", "2024-03-01T10:00:00+08:00")),
+            f"{base}/news-1.xml": news_sitemap((f"{base}/a.html", "2024-03-01T10:00:00+08:00", "甲")),
+        }
+        http_cache = ValidatorCache(backend='memory')
+        frontier = SeenUrlFilter(backend='memory')
+        watermarks = SitemapWatermarks(backend='memory')
+        
+        def get(url, headers=None, stream=False, **kwargs):
+            response = requests.Response()
+            response.url = url
+            if url == index_url and headers.get('If-None-Match') == '"i1"':
+                response.status_code = 304
+                response.raw = io.BytesIO(b'')
+                return response
+            response.status_code = 200
+            response.raw = io.BytesIO(documents[url])
+            if url == index_url:
+                response.headers['ETag'] = '"i1"'
+            return response
+        
+        def run():
+            sunk = []
+            crawler = SitemapCrawler("sitemap", index_url, delay=0, http_client=Mock(get=Mock(side_effect=get)),
+                                     http_cache=http_cache, frontier=frontier, watermarks=watermarks)
+            result = crawler.crawl(sink=sunk.append)
+            return [a['url'] for a in sunk], result
+        
+        assert run()[0] == [f"{base}/a.html"]
+        
+        documents[f"{base}/news-1.xml"] = news_sitemap(
+            (f"{base}/b.html", "2024-03-01T11:00:00+08:00", "乙"),
+            (f"{base}/a.html", "2024-03-01T10:00:00+08:00", "甲"),
+        )
+        urls, result = run()
+        assert urls == [f"{base}/b.html"]
+        assert result['pages_not_modified'] == 1
@@ -0,0 +1,48 @@
+"""
+URL规范化测试文件
+"""
+import pytest
+from app.crawlers.sina_crawler import SinaCrawler
+from app.crawlers.tencent_crawler import TencentCrawler
+from app.crawlers.url_canon import canonicalize_url, load_url_rules
+
+
+class TestUrlCanonicalization:
+    """URL规范化测试类"""
+    
+    @pytest.mark.parametrize("url,expected", [
+        ("HTTP://News.Sina.com.cn:80/a/1.html?tj=none&b=2&a=1#top",
+         "https://news.sina.com.cn/a/1.html?a=1&b=2"),
+        ("http://new.qq.com/rain/a/2024?ADTAG=rss&utm_source=wx", "https://news.qq.com/rain/a/2024"),
+        ("https://finance.sina.com.cn/x.shtml?from=wap&r=0", "https://finance.sina.com.cn/x.shtml"),
+        ("http://example.com:8080?utm_medium=x&id=%E4%B8%AD", "http://example.com:8080/?id=%E4%B8%AD"),
+        ("javascript:void(0)", "javascript:void(0)"),
+    ])
+    def test_canonicalize_url(self, url, expected):
+        """测试按新闻源规则规范化"""
+        assert canonicalize_url(url) == expected
+    
+    def test_rules_loaded_from_sources_file(self):
+        """测试规则从news_sources.json按域名加载"""
+        rules = load_url_rules('news_sources.json')
+        assert rules['sina.com.cn'].force_https
+        assert not rules['qq.com'].keeps('ADTAG')
+        assert rules['qq.com'].keeps('id')
+    
+    def test_extract_links_dedupes_variants(self):
+        """测试同一文章的不同URL变体只保留一个"""
+        crawler = SinaCrawler("s", "https://news.sina.com.cn/")
+        soup = crawler.parse_html(
+            '<a href="/a/1.html?tj=1">1</a>'
+            '<a href="http://news.sina.com.cn/a/1.html#comments">2</a>'
+            '<a href="/files/x.pdf?from=list">pdf</a>'
+        )
+        assert crawler.extract_links(soup, "https://news.sina.com.cn/") == ["https://news.sina.com.cn/a/1.html?tj=1"]
+    
+    def test_aliased_host_kept_for_fetching(self):
+        """测试域名别名只用于去重键，抓取和保存的URL保持页面上的原始域名"""
+        crawler = TencentCrawler("t", "https://new.qq.com/")
+        soup = crawler.parse_html('<a href="/rain/a/20240301A01.html?ADTAG=x">1</a>')
+        url = crawler.resolve_link(soup.select_one('a'), "https://new.qq.com/")
+        assert url == "https://new.qq.com/rain/a/20240301A01.html?ADTAG=x"
+        assert crawler.article_key({'url': url}) == "https://news.qq.com/rain/a/20240301A01.html"
@@ -0,0 +1,72 @@
+"""
+worker池配置测试文件
+"""
+import importlib.util
+from pathlib import Path
+import pytest
+from unittest.mock import Mock
+from app.celery_app import celery_app
+from app.core.worker_profiles import WorkerProfile, group_queues, resolve_profile
+
+
+def load_start_script():
+    path = Path(__file__).resolve().parent.parent / 'scripts' / 'start_celery_worker.py'
+    spec = importlib.util.spec_from_file_location('start_celery_worker', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestWorkerProfiles:
+    """worker池配置测试类"""
+    
+    def test_queues_grouped_by_platform_profile(self):
+        """测试按队列选择池配置，Windows上prefork退化为solo"""
+        queues = ['default', 'crawler', 'detail', 'processor', 'index']
+        groups = group_queues(queues, platform='linux')
+        assert groups == {'small': ['default', 'index'], 'io': ['crawler', 'detail'], 'cpu': ['processor']}
+        assert resolve_profile(['crawler'], platform='linux').pool == 'threads'
+        assert resolve_profile(['crawler', 'processor'], platform='linux').pool == 'prefork'
+        
+        assert group_queues(queues, platform='win32') == {
+            'solo': ['default', 'processor', 'index'], 'io': ['crawler', 'detail']
+        }
+        assert list(group_queues(queues, override='solo')) == ['solo']
+        assert resolve_profile(['processor'], override='solo').worker_args() == ['--pool=solo', '--concurrency=1']
+    
+    def test_tasks_routed_to_profiled_queues(self):
+        """测试各任务按名称路由到对应队列，并落到对应的池配置"""
+        celery_app.loader.import_default_modules()
+        
+        def route(name):
+            return celery_app.amqp.router.route({}, name)['queue'].name
+        
+        assert route('crawler.start_crawler_task') == 'crawler'
+        assert route('crawler.schedule_crawler_task') == 'crawler'
+        assert route('crawler.fetch_details_task') == 'detail'
+        assert route('processor.process_news_task') == 'processor'
+        assert route('index.index_news_task') == 'index'
+        assert all(route(name) != 'default' for name in celery_app.tasks
+                   if name.split('.')[0] in ('crawler', 'processor', 'index'))
+        
+        assert resolve_profile([route('crawler.start_crawler_task')], platform='linux').name == 'io'
+        assert resolve_profile([route('processor.process_news_task')], platform='linux').name == 'cpu'
+    
+    def test_gevent_pool_started_through_celery_cli(self, monkeypatch):
+        """测试gevent池通过celery命令行启动（在导入应用之前打补丁），其他池在当前进程启动"""
+        script = load_start_script()
+        call = Mock(return_value=0)
+        worker_main = Mock()
+        monkeypatch.setattr(script.subprocess, 'call', call)
+        monkeypatch.setattr(script.celery_app, 'worker_main', worker_main)
+        
+        monkeypatch.setattr(script, 'resolve_profile', lambda queues, name=None: WorkerProfile('io', 'gevent', 100))
+        with pytest.raises(SystemExit):
+            script.run_worker(['crawler'])
+        command = call.call_args.args[0]
+        assert command[1:5] == ['-m', 'celery', '-A', 'app.celery_app'] and '--pool=gevent' in command
+        worker_main.assert_not_called()
+        
+        monkeypatch.setattr(script, 'resolve_profile', lambda queues, name=None: WorkerProfile('io', 'threads', 16))
+        script.run_worker(['crawler'])
+        assert '--pool=threads' in worker_main.call_args.args[0]